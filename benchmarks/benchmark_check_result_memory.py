@@ -0,0 +1,103 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Benchmark of the memory taken by CheckResults
+=============================================
+
+Builds the CheckResults of a large synthetic run - the same number per file as a real run, with the error messages
+built for each file and half of them loaded back from pickles, as from the results store - and reports the peak RSS
+of the process, for CheckResult and for a plain class with the same attributes (the way CheckResult used to be).
+Each of them is measured in a separate process. Run it from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/benchmark_check_result_memory.py --nr_files 100000
+"""
+
+import argparse
+import pickle
+import resource
+import subprocess
+import sys
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT, SEVERITY
+
+
+CHECK_RESULTS_PER_FILE = 30
+
+
+class DictCheckResult:
+
+    def __init__(self, check_name, executed=True, result=RESULT.SUCCESS, severity=SEVERITY.IMPORTANT, error_message=None):
+        self.check_name = check_name
+        self.severity = severity
+        self.error_message = error_message
+        self.executed = executed
+        self.result = result
+
+
+def build_check_results_by_path(check_result_cls, nr_files):
+    check_names = CHECK_NAMES.get_check_names()
+    check_results_by_path = {}
+    for file_nr in range(nr_files):
+        check_results = []
+        for check_nr in range(CHECK_RESULTS_PER_FILE):
+            check_name = check_names[check_nr % len(check_names)]
+            if check_nr % 10 == 0:
+                check_results.append(check_result_cls(check_name, result=RESULT.FAILURE,
+                                                      error_message=['Sample %s not found in Seqscape' % file_nr]))
+            else:
+                check_results.append(check_result_cls(check_name))
+        if file_nr % 2:
+            check_results = pickle.loads(pickle.dumps(check_results))
+        check_results_by_path['/seq/%s/%s.cram' % (file_nr // 1000, file_nr)] = check_results
+    return check_results_by_path
+
+
+def measure(variant, nr_files):
+    check_result_cls = CheckResult if variant == 'CheckResult' else DictCheckResult
+    check_results_by_path = build_check_results_by_path(check_result_cls, nr_files)
+    # ru_maxrss is in kilobytes on Linux:
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(check_results_by_path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak RSS of a run with many CheckResults')
+    parser.add_argument('--nr_files', type=int, default=100000, help='the number of files in the synthetic run')
+    parser.add_argument('--variant', choices=['CheckResult', 'DictCheckResult'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.variant:
+        measure(args.variant, args.nr_files)
+        return
+
+    baseline_rss = int(subprocess.check_output([sys.executable, '-c', 'import resource, mcheck.results.checks_results; '
+                                                'print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)']))
+    peak_rss = {}
+    for variant in ('DictCheckResult', 'CheckResult'):
+        output = subprocess.check_output([sys.executable, __file__, '--variant', variant, '--nr_files', str(args.nr_files)])
+        peak_rss[variant] = int(output.split()[0])
+    print("Files: %s, CheckResults: %s" % (args.nr_files, args.nr_files * CHECK_RESULTS_PER_FILE))
+    for variant, rss in peak_rss.items():
+        print("%-16s peak RSS: %6.0f MB (%6.0f MB above an idle process)" % (variant, rss / 1024, (rss - baseline_rss) / 1024))
+    print("Reduction: %.0f%%" % (100 * (1 - (peak_rss['CheckResult'] - baseline_rss) / (peak_rss['DictCheckResult'] - baseline_rss))))
+
+
+if __name__ == '__main__':
+    main()
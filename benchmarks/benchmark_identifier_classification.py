@@ -0,0 +1,90 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Benchmark of the identifier classification
+==========================================
+
+Classifies many synthetic sample identifiers - names, internal ids and accession numbers - as internal id,
+accession number or name, with EntityIdentifier.guess_identifier_type one by one and with
+EntityIdentifier.separate_identifiers_by_type for the identifiers of each file, and reports the number of
+identifiers classified per second, the best of a few repeats. The repeats classify the same identifiers again,
+as happens when the same ids recur across the files of a study. Run it from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/benchmark_identifier_classification.py --nr_identifiers 100000
+"""
+
+import argparse
+import time
+
+from mcheck.metadata.common.identifiers import EntityIdentifier
+
+
+IDENTIFIERS_PER_FILE = 3
+
+
+def build_identifiers(nr_identifiers):
+    identifiers = []
+    for identifier_nr in range(nr_identifiers):
+        kind = identifier_nr % 3
+        if kind == 0:
+            identifiers.append(str(1000000 + identifier_nr))
+        elif kind == 1:
+            identifiers.append('EGAN%011d' % identifier_nr)
+        else:
+            identifiers.append('SC_WES%s' % identifier_nr)
+    return identifiers
+
+
+def best_time(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of the identifier classification')
+    parser.add_argument('--nr_identifiers', type=int, default=100000, help='the number of identifiers classified')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of times the identifiers are classified')
+    args = parser.parse_args()
+
+    identifiers = build_identifiers(args.nr_identifiers)
+    identifiers_by_file = [identifiers[start:start + IDENTIFIERS_PER_FILE]
+                           for start in range(0, len(identifiers), IDENTIFIERS_PER_FILE)]
+
+    def guess_types():
+        for identifier in identifiers:
+            EntityIdentifier.guess_identifier_type(identifier)
+
+    def separate_by_type():
+        for file_identifiers in identifiers_by_file:
+            EntityIdentifier.separate_identifiers_by_type(file_identifiers)
+
+    print("Identifiers: %s, %s per file" % (args.nr_identifiers, IDENTIFIERS_PER_FILE))
+    for name, function in (('guess_identifier_type', guess_types),
+                           ('separate_identifiers_by_type', separate_by_type)):
+        duration = best_time(function, args.repeat)
+        print("%-29s %10.0f identifiers/s" % (name, args.nr_identifiers / duration))
+
+
+if __name__ == '__main__':
+    main()
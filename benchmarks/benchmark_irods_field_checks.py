@@ -0,0 +1,79 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Benchmark of the iRODS field checks
+===================================
+
+Times the checks of the fields of the iRODS metadata of a file - the replicas, the ACLs, npg_qc and target -
+for many synthetic files, and reports the cost per file, the best of a few repeats. Run it from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/benchmark_irods_field_checks.py --nr_files 100000
+"""
+
+import argparse
+import time
+
+from mcheck.metadata.irods_metadata.acl import IrodsACL
+from mcheck.metadata.irods_metadata.constants import IrodsPermission
+from mcheck.metadata.irods_metadata.file_metadata import IrodsSeqFileMetadata
+from mcheck.metadata.irods_metadata.file_replica import IrodsFileReplica
+
+
+def build_irods_metadata(file_nr):
+    checksum = '%032x' % file_nr
+    replicas = [IrodsFileReplica(checksum=checksum, replica_nr=0), IrodsFileReplica(checksum=checksum, replica_nr=1)]
+    acls = [IrodsACL(access_group='trace', zone='Sanger1', permission=IrodsPermission.READ),
+            IrodsACL(access_group='srpipe', zone='Sanger1', permission=IrodsPermission.OWN),
+            IrodsACL(access_group='rodsBoot', zone='seq', permission=IrodsPermission.OWN),
+            IrodsACL(access_group='irods_metadata-g1', zone='seq', permission=IrodsPermission.OWN),
+            IrodsACL(access_group='psdpipe', zone='Sanger1', permission=IrodsPermission.READ),
+            IrodsACL(access_group='ss_%s' % (file_nr % 3000), zone='seq', permission=IrodsPermission.READ)]
+    return IrodsSeqFileMetadata('/seq/%s/%s_1#1.cram' % (file_nr, file_nr), checksum_in_meta=checksum,
+                                checksum_at_upload=checksum, npg_qc='1', target='1', file_replicas=replicas, acls=acls)
+
+
+def check_fields(irods_metadata):
+    check_results = IrodsSeqFileMetadata.ReplicasChecks.check(irods_metadata.file_replicas)
+    check_results.extend(IrodsSeqFileMetadata.ACLsChecks.check(irods_metadata.acls))
+    check_results.extend(irods_metadata.validate_fields())
+    return check_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost per file of the iRODS field checks')
+    parser.add_argument('--nr_files', type=int, default=100000, help='the number of synthetic files checked')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of times the files are checked')
+    args = parser.parse_args()
+
+    all_irods_metadata = [build_irods_metadata(file_nr) for file_nr in range(args.nr_files)]
+    durations = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        nr_check_results = 0
+        for irods_metadata in all_irods_metadata:
+            nr_check_results += len(check_fields(irods_metadata))
+        durations.append(time.perf_counter() - start)
+    duration = min(durations)
+    print("Files: %s, CheckResults: %s" % (args.nr_files, nr_check_results))
+    print("Field checks: %.2fs in total, %.1f us per file" % (duration, duration * 1000000 / args.nr_files))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Benchmark of the json output
+============================
+
+Times the serialization of a synthetic report to json, through the hgijson encoder for CheckResults
+and through output_formatter.format_output_as_json, and checks that both outputs are the same.
+Run it from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/benchmark_json_output.py --nr_results 1000000
+"""
+
+import argparse
+import json
+import time
+
+from hgijson import MappingJSONEncoderClassBuilder
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.main.output_formatter import format_output_as_json
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT, SEVERITY
+
+
+CHECK_RESULTS_PER_FILE = 20
+
+
+def build_check_results_by_path(nr_results):
+    check_names = [name for name in vars(CHECK_NAMES).values() if isinstance(name, str)]
+    check_results_by_path = {}
+    for file_nr in range(nr_results // CHECK_RESULTS_PER_FILE):
+        check_results = []
+        for check_nr in range(CHECK_RESULTS_PER_FILE):
+            check_name = check_names[check_nr % len(check_names)]
+            if check_nr % 7 == 0:
+                check_results.append(CheckResult(check_name, result=RESULT.FAILURE, severity=SEVERITY.WARNING,
+                                                 error_message=['Sample %s not found in Seqscape' % file_nr]))
+            elif check_nr % 11 == 0:
+                check_results.append(CheckResult(check_name, executed=False, result=None))
+            else:
+                check_results.append(CheckResult(check_name))
+        check_results_by_path['/seq/%s/%s.cram' % (file_nr // 1000, file_nr)] = check_results
+    return check_results_by_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[-2])
+    parser.add_argument('--nr_results', type=int, default=1000000, help='the number of CheckResults in the report')
+    args = parser.parse_args()
+
+    check_results_by_path = build_check_results_by_path(args.nr_results)
+    json_encoder = MappingJSONEncoderClassBuilder(CheckResult, CheckResult.to_json_mapping()).build()
+
+    start = time.perf_counter()
+    hgijson_output = json.dumps(check_results_by_path, cls=json_encoder)
+    hgijson_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    output = format_output_as_json(check_results_by_path)
+    fast_time = time.perf_counter() - start
+
+    print("CheckResults: %s, output: %.1f MB" % (args.nr_results, len(output) / 1e6))
+    print("hgijson encoder:       %.2f s" % hgijson_time)
+    print("format_output_as_json: %.2f s (%.1fx faster)" % (fast_time, hgijson_time / fast_time))
+    print("Same output: %s" % (output == hgijson_output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Benchmark of the results table
+==============================
+
+Builds the CheckResults of a large synthetic run, and times the summary statistics computed by CheckResultsProcessing
+over the dict of lists of CheckResults against the same statistics computed over a CheckResultsTable.
+Run it from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/benchmark_results_table.py --nr_files 100000
+"""
+
+import argparse
+import time
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT
+from mcheck.results.results_processing import CheckResultsProcessing
+from mcheck.results.results_table import CheckResultsTable
+
+
+CHECK_RESULTS_PER_FILE = 30
+
+
+def build_check_results_by_path(nr_files):
+    check_names = CHECK_NAMES.get_check_names()
+    check_results_by_path = {}
+    for file_nr in range(nr_files):
+        check_results = []
+        for check_nr in range(CHECK_RESULTS_PER_FILE):
+            check_name = check_names[check_nr % len(check_names)]
+            if (file_nr + check_nr) % 13 == 0:
+                check_results.append(CheckResult(check_name, result=RESULT.FAILURE,
+                                                 error_message=['Sample %s not found in Seqscape' % file_nr]))
+            else:
+                check_results.append(CheckResult(check_name))
+        check_results_by_path['/seq/%s/%s.cram' % (file_nr // 1000, file_nr)] = check_results
+    return check_results_by_path
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summary statistics over a dict of CheckResults and a CheckResultsTable')
+    parser.add_argument('--nr_files', type=int, default=100000, help='the number of files in the synthetic run')
+    args = parser.parse_args()
+
+    check_results_by_path = build_check_results_by_path(args.nr_files)
+    all_check_results = [check_result for check_results in check_results_by_path.values() for check_result in check_results]
+    table, build_time = timed(CheckResultsTable.from_check_results_by_path, check_results_by_path)
+    print("Files: %s, CheckResults: %s, table built in %.2fs" % (args.nr_files, len(table), build_time))
+
+    stats = [
+        ('failed checks', lambda: CheckResultsProcessing.failed_check_results_stats(check_results_by_path),
+         table.failed_check_results_stats),
+        ('count by result', lambda: {result: len(check_results) for result, check_results in
+                                     CheckResultsProcessing.group_by_result(all_check_results).items()},
+         lambda: table.count_by('result')),
+        ('count by severity', lambda: {severity: len(check_results) for severity, check_results in
+                                       CheckResultsProcessing.group_by_severity(all_check_results).items()},
+         lambda: table.count_by('severity')),
+    ]
+    for name, over_objects, over_table in stats:
+        expected, objects_time = timed(over_objects)
+        actual, table_time = timed(over_table)
+        assert expected == actual, name
+        print("%-18s objects: %8.1f ms, table: %8.1f ms" % (name, objects_time * 1000, table_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
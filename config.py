@@ -17,6 +17,8 @@ this program. If not, see <http://www.gnu.org/licenses/>.
  
 """
 
+import os
+
 RUNNING_LOCATION = 'remote'
 
 #SAMTOOLS_IRODS_PATH = '/software/solexa/bin/samtools_irods'
@@ -30,6 +32,47 @@ SEQSC_PORT 		= 3379
 SEQSC_USER 		= "warehouse_ro"
 SEQSC_DB_NAME 	= "sequencescape_warehouse"
 
+# The maximum number of connections to Seqscape open at any one time:
+SEQSC_CONNECTION_POOL_SIZE = 4
+# The number of seconds after which an idle connection is checked before being reused:
+SEQSC_CONNECTION_HEALTH_CHECK_AFTER = 60
+# The Seqscape entities looked up by id are cached - in memory and, if SEQSC_CACHE_PATH is set, in a SQLite file,
+# so that they are reused by the next runs. The maximum number of ids cached in memory (0 for no caching):
+SEQSC_CACHE_MEMORY_SIZE = 100000
+# The path of the SQLite file, or None for caching only in memory, and the maximum number of ids cached in it:
+SEQSC_CACHE_PATH = None
+SEQSC_CACHE_DISK_SIZE = 1000000
+# The number of seconds after which a cached id is looked up again in Seqscape:
+SEQSC_CACHE_TTL = 7 * 24 * 3600
+# The checks of the sample-study associations are run once per distinct set of samples and studies in a run,
+# and their results reused by all the files with the same samples and studies. The maximum number of sets kept:
+SEQSC_ASSOCIATION_CHECKS_MEMO_SIZE = 10000
+# The samples of the studies and the studies of the samples fetched from Seqscape are cached in memory, keyed by
+# the set of studies or samples they were fetched for. The maximum number of sets cached (0 for no caching):
+SEQSC_ASSOCIATION_CACHE_SIZE = 10000
+
+# The headers of the files in iRODS are cached in this SQLite file (None for no caching), keyed by the file path
+# and the checksums of its replicas, and the maximum number of headers cached in it:
+HEADER_CACHE_PATH = None
+HEADER_CACHE_SIZE = 1000000
+
+# With --incremental, the results of each file are kept in this SQLite file, together with a fingerprint of its
+# iRODS metadata, and reused while the metadata stays the same - for at most RESULTS_STORE_TTL seconds,
+# after which the file is checked again against Seqscape. The path is absolute - by default under the user's
+# cache directory - so that every run uses the same results, wherever it is started from.
+# The maximum number of files whose results are kept:
+RESULTS_STORE_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                  'metadata-check', 'check_results.db')
+RESULTS_STORE_SIZE = 1000000
+RESULTS_STORE_TTL = 7 * 24 * 3600
+
+# The iRODS attributes of each file are checked against an attribute frequency profile, chosen by the target
+# of the file, else by its file type (the file extension), else the general profile. The profiles are given by name:
+# 'general' and 'library_cram' are built in, the others are given here with the path of their config file.
+ATTRIBUTE_FREQUENCY_PROFILE_PATHS = {}
+ATTRIBUTE_FREQUENCY_PROFILES_BY_TARGET = {'library': 'library_cram'}
+ATTRIBUTE_FREQUENCY_PROFILES_BY_FILE_TYPE = {}
+
 
 LUSTRE_HOME = '/lustre/scratch113/teams/hgi/users/ic4/'
 
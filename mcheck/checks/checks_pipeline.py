@@ -0,0 +1,261 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Checks pipeline
+===============
+
+This module runs the checks of each file as a pipeline: the iRODS metadata of a file is fetched and checked
+in one worker pool and, as soon as it is ready, the header metadata and the Seqscape metadata of the same
+file are fetched and checked concurrently in their own worker pools. The comparison of the metadata across
+the 3 sources is done for a file as soon as all 3 are available.
+The CheckResults reported for each file are the same and in the same order as when running
+the checks phase by phase, as in MetadataSelfChecks.
+If a CheckResultsStore is given, the files whose iRODS metadata hasn't changed since they were last checked
+reuse their stored results instead of going through the header and Seqscape stages.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from mcheck.checks.mchecks_by_comparison import FileMetadataComparison
+from mcheck.checks.mchecks_by_type import MetadataSelfChecks
+from mcheck.metadata.irods_metadata.file_metadata import IrodsSeqFileMetadata
+from mcheck.metadata.irods_metadata.irods_meta_provider import iRODSMetadataProvider
+from mcheck.metadata.seqscape_metadata.seqscape_association_checks import SeqscapeAssociationChecks
+from mcheck.results.results_store import CheckResultsStore
+import config
+
+
+FILES_IN_FLIGHT_PER_WORKER = 4
+
+
+class _FileChecks:
+    """
+    This class keeps the metadata and the CheckResults of one file, while its metadata is being fetched
+    from the 3 sources.
+    """
+    def __init__(self):
+        self.fpath = None
+        self.irods_metadata = None
+        self.irods_check_results = []
+        self.header_metadata = None
+        self.header_check_results = []
+        self.header_done = False
+        self.seqscape_metadata = None
+        self.seqscape_check_results = []
+        self.seqscape_done = False
+        self.fingerprint = None
+
+    def is_complete(self):
+        return self.header_done and self.seqscape_done
+
+    def get_header_and_seqscape_check_results(self):
+        check_results = []
+        check_results.extend(self.header_check_results)
+        check_results.extend(self.seqscape_check_results)
+        check_results.extend(FileMetadataComparison.check_file_metadata_across_different_sources(self.irods_metadata,
+                                                                                                  self.header_metadata,
+                                                                                                  self.seqscape_metadata))
+        return check_results
+
+
+class MetadataChecksPipeline:
+
+    def __init__(self, reference=None, nr_workers=1, max_files_in_flight=None, nr_header_workers=None,
+                 header_timeout=None, results_store=None, in_input_order=False):
+        """
+        :param reference: the desired reference, or None if the reference shouldn't be checked
+        :param nr_workers: the number of workers for each source of metadata (iRODS, header, Seqscape)
+        :param max_files_in_flight: the maximum number of files being checked at any one time.
+                                    By default it is a small multiple of nr_workers
+        :param nr_header_workers: the number of headers fetched concurrently, by default nr_workers
+        :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+        :param results_store: a CheckResultsStore for reusing the results of the files that haven't changed
+                              since the last run, and storing those of the others - or None
+        :param in_input_order: True for yielding the results of the files in the order of the input,
+                               False for yielding them as soon as each file is checked
+        """
+        if nr_workers < 1:
+            raise ValueError("The number of workers must be at least 1, and it is: %s" % nr_workers)
+        self.reference = reference
+        self.nr_workers = nr_workers
+        self.nr_header_workers = nr_header_workers if nr_header_workers else nr_workers
+        self.header_timeout = header_timeout
+        self.results_store = results_store
+        self.in_input_order = in_input_order
+        self.association_checks = SeqscapeAssociationChecks(config.SEQSC_ASSOCIATION_CHECKS_MEMO_SIZE)
+        self.max_files_in_flight = max_files_in_flight if max_files_in_flight else \
+            max(self.nr_workers, self.nr_header_workers) * FILES_IN_FLIGHT_PER_WORKER
+
+    def _preprocess_raw_irods_metadata(self, raw_metadata):
+        file_metadata, check_results = MetadataSelfChecks.preprocess_irods_metadata(raw_metadata, self.reference)
+        return raw_metadata.fpath, file_metadata, check_results
+
+    def _fetch_and_preprocess_irods_metadata_by_path(self, fpath):
+        raw_metadata = iRODSMetadataProvider.fetch_raw_file_metadata_by_path(fpath)
+        if raw_metadata is None:
+            return None
+        file_metadata, check_results = MetadataSelfChecks.preprocess_irods_metadata(raw_metadata, self.reference)
+        return fpath, file_metadata, check_results
+
+    def _preprocess_baton_data_object(self, data_object):
+        file_metadata = IrodsSeqFileMetadata.from_baton_wrapper(data_object)
+        return file_metadata.fpath, file_metadata, file_metadata.check_metadata(self.reference)
+
+    def _iter_check_results(self, inputs, irods_stage):
+        """
+        This generator runs the checks for all the inputs, keeping at most max_files_in_flight files in the pipeline.
+        :param inputs: an iterable of inputs for the irods_stage - consumed lazily
+        :param irods_stage: a function taking one input and returning a tuple of:
+                            (fpath, IrodsSeqFileMetadata, list of CheckResults), or None if the file is to be skipped
+        :return: yields tuples of (position of the input, fpath, list of CheckResults), in the order in which
+                 the files are completely checked - or in the order of the input if in_input_order is set, in which
+                 case the files checked before the ones preceding them are held back, and count as in flight
+        :raises: the exception raised by the irods_stage for a file (e.g. if iRODS can't be reached) - the files
+                 still in the pipeline are then dropped, and it is up to the caller to decide how to exit.
+                 An error fetching the header or the Seqscape metadata of a file is reported instead
+                 as a not executed CheckResult of that file.
+        """
+        inputs = enumerate(inputs)
+        inputs_exhausted = False
+        files_in_flight = {}
+        pending = {}
+        # key = position, value = (fpath, list of CheckResults), or None for a skipped file:
+        files_checked = {}
+        next_position = 0
+        with ThreadPoolExecutor(self.nr_workers) as irods_pool, \
+                ThreadPoolExecutor(self.nr_header_workers) as header_pool, \
+                ThreadPoolExecutor(self.nr_workers) as seqscape_pool:
+            try:
+                while True:
+                    while not inputs_exhausted and len(files_in_flight) + len(files_checked) < self.max_files_in_flight:
+                        try:
+                            position, input_item = next(inputs)
+                        except StopIteration:
+                            inputs_exhausted = True
+                        else:
+                            files_in_flight[position] = _FileChecks()
+                            pending[irods_pool.submit(irods_stage, input_item)] = (position, 'irods')
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        position, source = pending.pop(future)
+                        file_checks = files_in_flight[position]
+                        if source == 'irods':
+                            irods_stage_result = future.result()
+                            if irods_stage_result is None:
+                                del files_in_flight[position]
+                                files_checked[position] = None
+                                continue
+                            file_checks.fpath, file_checks.irods_metadata, file_checks.irods_check_results = \
+                                irods_stage_result
+                            if self.results_store is not None:
+                                file_checks.fingerprint = CheckResultsStore.compute_fingerprint(file_checks.irods_metadata,
+                                                                                                self.reference)
+                                stored_check_results = self.results_store.get(file_checks.fpath, file_checks.fingerprint)
+                                if stored_check_results is not None:
+                                    del files_in_flight[position]
+                                    files_checked[position] = (file_checks.fpath,
+                                                               file_checks.irods_check_results + stored_check_results)
+                                    continue
+                            pending[header_pool.submit(MetadataSelfChecks.fetch_and_preprocess_header_metadata_for_file,
+                                                       file_checks.fpath, self.header_timeout,
+                                                       file_checks.irods_metadata.checksum_at_upload)] = (position, 'header')
+                            pending[seqscape_pool.submit(MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata_for_file,
+                                                         file_checks.irods_metadata,
+                                                         self.association_checks)] = (position, 'seqscape')
+                        elif source == 'header':
+                            try:
+                                file_checks.header_metadata, file_checks.header_check_results = future.result()
+                            except Exception as e:
+                                file_checks.header_check_results = \
+                                    [MetadataSelfChecks.build_header_not_fetched_check_result(e)]
+                            file_checks.header_done = True
+                        else:
+                            try:
+                                file_checks.seqscape_metadata, file_checks.seqscape_check_results = future.result()
+                            except Exception as e:
+                                file_checks.seqscape_check_results = \
+                                    [MetadataSelfChecks.build_seqscape_not_fetched_check_result(e)]
+                            file_checks.seqscape_done = True
+                        if file_checks.is_complete():
+                            del files_in_flight[position]
+                            # The results of files whose header or Seqscape metadata couldn't be fetched aren't kept,
+                            # so that they are checked again:
+                            header_and_seqscape_check_results = file_checks.get_header_and_seqscape_check_results()
+                            if self.results_store is not None and file_checks.header_metadata is not None and \
+                                    file_checks.seqscape_metadata is not None:
+                                self.results_store.put(file_checks.fpath, file_checks.fingerprint,
+                                                       header_and_seqscape_check_results)
+                            files_checked[position] = (file_checks.fpath,
+                                                       file_checks.irods_check_results + header_and_seqscape_check_results)
+                    if self.in_input_order:
+                        while next_position in files_checked:
+                            file_checked = files_checked.pop(next_position)
+                            if file_checked is not None:
+                                yield (next_position,) + file_checked
+                            next_position += 1
+                    else:
+                        for position, file_checked in sorted(files_checked.items()):
+                            if file_checked is not None:
+                                yield (position,) + file_checked
+                        files_checked.clear()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def check_raw_irods_metadata(self, raw_metadata_objs):
+        """
+        Runs the checks for files whose raw iRODS metadata has already been fetched.
+        :param raw_metadata_objs: an iterable of IrodsRawFileMetadata
+        :return: yields tuples of (position of the input, fpath, list of CheckResults)
+        """
+        return self._iter_check_results(raw_metadata_objs, self._preprocess_raw_irods_metadata)
+
+    def check_irods_fpaths(self, irods_fpaths):
+        """
+        Runs the checks for files given by path, fetching their iRODS metadata within the pipeline.
+        :param irods_fpaths: an iterable of iRODS file paths
+        :return: yields tuples of (position of the input, fpath, list of CheckResults)
+        """
+        return self._iter_check_results(irods_fpaths, self._fetch_and_preprocess_irods_metadata_by_path)
+
+    def check_baton_data_objects(self, data_objects):
+        """
+        Runs the checks for files given as baton data objects (e.g. parsed from a stream of json data).
+        :param data_objects: an iterable of baton DataObjects
+        :return: yields tuples of (position of the input, fpath, list of CheckResults)
+        """
+        return self._iter_check_results(data_objects, self._preprocess_baton_data_object)
+
+    @staticmethod
+    def collect_check_results(check_results_iterator):
+        """
+        Gathers the results yielded by one of the pipeline's generators into a dict,
+        where the files appear in the order of the input. A file given more than once keeps the results
+        of its last occurrence, at the position of its first one.
+        :param check_results_iterator: iterator of tuples of (position, fpath, list of CheckResults)
+        :return: dict of key = string file path, value = list[CheckResult]
+        """
+        check_results_by_position = sorted(check_results_iterator, key=lambda position_fpath_results: position_fpath_results[0])
+        check_results_by_path = {}
+        for _, fpath, check_results in check_results_by_position:
+            check_results_by_path[fpath] = check_results
+        return check_results_by_path
@@ -26,6 +26,79 @@ from collections import  defaultdict
 
 class FileMetadataComparison:
 
+    @staticmethod
+    def check_file_metadata_across_different_sources(irods_metadata, header_metadata, seqscape_metadata):
+        """
+        This function compares the metadata of a single file, as it comes from the 3 different sources.
+        :param irods_metadata: the irods_metadata of the file
+        :param header_metadata: the header_metadata of the file
+        :param seqscape_metadata: the seqscape_metadata of the file
+        :return: list of CheckResults
+        """
+        ss_vs_h_check_result = CheckResult(check_name=CHECK_NAMES.check_seqscape_ids_compared_to_header_ids, error_message=[])
+        h_vs_ss_check_result = CheckResult(check_name=CHECK_NAMES.check_header_ids_compared_to_seqscape_ids, error_message=[])
+        i_vs_h_check_result = CheckResult(check_name=CHECK_NAMES.check_irods_ids_compared_to_header_ids, error_message=[])
+        h_vs_i_check_result = CheckResult(check_name=CHECK_NAMES.check_header_ids_compared_to_irods_ids, error_message=[])
+        if header_metadata is None or not header_metadata.has_metadata():
+            error_msg = "No header metadata"
+            ss_vs_h_check_result.executed = False
+            h_vs_ss_check_result.executed = False
+            i_vs_h_check_result.executed = False
+            h_vs_i_check_result.executed = False
+
+            i_vs_h_check_result.result = None
+            h_vs_i_check_result.result = None
+            h_vs_ss_check_result.result = None
+            ss_vs_h_check_result.result = None
+
+            ss_vs_h_check_result.error_message.append(error_msg)
+            h_vs_ss_check_result.error_message.append(error_msg)
+            i_vs_h_check_result.error_message.append(error_msg)
+            h_vs_i_check_result.error_message.append(error_msg)
+        else:
+            if seqscape_metadata is None or not seqscape_metadata.has_metadata():
+                error_msg = "No seqscape metadata"
+                ss_vs_h_check_result.executed = False
+                h_vs_ss_check_result.executed = False
+                ss_vs_h_check_result.result = None
+                h_vs_ss_check_result.result = None
+                ss_vs_h_check_result.error_message.append(error_msg)
+                h_vs_ss_check_result.error_message.append(error_msg)
+            else:
+                seqscape_diff_header = seqscape_metadata.difference(header_metadata)
+                header_diff_seqscape = header_metadata.difference(seqscape_metadata)
+                if seqscape_diff_header:
+                    error_msg = "Differences: %s" % seqscape_diff_header
+                    ss_vs_h_check_result.error_message = error_msg
+                    ss_vs_h_check_result.result = RESULT.FAILURE
+                if header_diff_seqscape:
+                    error_msg = "Differences: %s" % header_diff_seqscape
+                    h_vs_ss_check_result.result = RESULT.FAILURE
+                    h_vs_ss_check_result.error_message = error_msg
+
+            if not irods_metadata.has_metadata():
+                error_msg = "No irods metadata"
+                i_vs_h_check_result.executed = False
+                h_vs_i_check_result.executed = False
+                i_vs_h_check_result.result = None
+                h_vs_i_check_result.result = None
+                i_vs_h_check_result.error_message.append(error_msg)
+                h_vs_i_check_result.error_message.append(error_msg)
+            else:
+                irods_diff_header = irods_metadata.difference(header_metadata)
+                header_diff_irods = header_metadata.difference(irods_metadata)
+                if irods_diff_header:
+                    error_msg = "Differences: %s" % irods_diff_header
+                    i_vs_h_check_result.error_message = error_msg
+                    i_vs_h_check_result.result = RESULT.FAILURE
+
+                if header_diff_irods:
+                    error_msg = "Differences between what is in the header and not in iRODS: %s" % header_diff_irods
+                    h_vs_i_check_result.error_message = error_msg
+                    h_vs_i_check_result.result = RESULT.FAILURE
+        return [ss_vs_h_check_result, h_vs_ss_check_result, i_vs_h_check_result, h_vs_i_check_result]
+
+
     @staticmethod
     def check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict, seqsc_metadata_dict, issues_dict):
         """
@@ -41,73 +114,10 @@ class FileMetadataComparison:
         for fpath, irods_metadata in irods_metadata_dict.items():
             header_metadata = header_metadata_dict.get(fpath)
             seqscape_metadata = seqsc_metadata_dict.get(fpath)
-
-            ss_vs_h_check_result = CheckResult(check_name=CHECK_NAMES.check_seqscape_ids_compared_to_header_ids, error_message=[])
-            h_vs_ss_check_result = CheckResult(check_name=CHECK_NAMES.check_header_ids_compared_to_seqscape_ids, error_message=[])
-            i_vs_h_check_result = CheckResult(check_name=CHECK_NAMES.check_irods_ids_compared_to_header_ids, error_message=[])
-            h_vs_i_check_result = CheckResult(check_name=CHECK_NAMES.check_header_ids_compared_to_irods_ids, error_message=[])
-            if not header_metadata.has_metadata():
-                error_msg = "No header metadata"
-                ss_vs_h_check_result.executed = False
-                h_vs_ss_check_result.executed = False
-                i_vs_h_check_result.executed = False
-                h_vs_i_check_result.executed = False
-
-                i_vs_h_check_result.result = None
-                h_vs_i_check_result.result = None
-                h_vs_ss_check_result.result = None
-                ss_vs_h_check_result.result = None
-
-                ss_vs_h_check_result.error_message.append(error_msg)
-                h_vs_ss_check_result.error_message.append(error_msg)
-                i_vs_h_check_result.error_message.append(error_msg)
-                h_vs_i_check_result.error_message.append(error_msg)
-            else:
-                if not seqscape_metadata.has_metadata():
-                    error_msg = "No seqscape metadata"
-                    ss_vs_h_check_result.executed = False
-                    h_vs_ss_check_result.executed = False
-                    ss_vs_h_check_result.result = None
-                    h_vs_ss_check_result.result = None
-                    ss_vs_h_check_result.error_message.append(error_msg)
-                    h_vs_ss_check_result.error_message.append(error_msg)
-                else:
-                    seqscape_diff_header = seqscape_metadata.difference(header_metadata)
-                    header_diff_seqscape = header_metadata.difference(seqscape_metadata)
-                    if seqscape_diff_header:
-                        error_msg = "Differences: %s" % seqscape_diff_header
-                        ss_vs_h_check_result.error_message = error_msg
-                        ss_vs_h_check_result.result = RESULT.FAILURE
-                    if header_diff_seqscape:
-                        error_msg = "Differences: %s" % header_diff_seqscape
-                        h_vs_ss_check_result.result = RESULT.FAILURE
-                        h_vs_ss_check_result.error_message = error_msg
-
-                if not irods_metadata.has_metadata():
-                    error_msg = "No irods metadata"
-                    i_vs_h_check_result.executed = False
-                    h_vs_i_check_result.executed = False
-                    i_vs_h_check_result.result = None
-                    h_vs_i_check_result.result = None
-                    i_vs_h_check_result.error_message.append(error_msg)
-                    h_vs_i_check_result.error_message.append(error_msg)
-                else:
-                    irods_diff_header = irods_metadata.difference(header_metadata)
-                    header_diff_irods = header_metadata.difference(irods_metadata)
-                    if irods_diff_header:
-                        error_msg = "Differences: %s" % irods_diff_header
-                        i_vs_h_check_result.error_message = error_msg
-                        i_vs_h_check_result.result = RESULT.FAILURE
-
-                    if header_diff_irods:
-                        error_msg = "Differences between what is in the header and not in iRODS: %s" % header_diff_irods
-                        h_vs_i_check_result.error_message = error_msg
-                        h_vs_i_check_result.result = RESULT.FAILURE
-
-            issues_dict[fpath].append(ss_vs_h_check_result)
-            issues_dict[fpath].append(h_vs_ss_check_result)
-            issues_dict[fpath].append(i_vs_h_check_result)
-            issues_dict[fpath].append(h_vs_i_check_result)
+            check_results = FileMetadataComparison.check_file_metadata_across_different_sources(irods_metadata,
+                                                                                                 header_metadata,
+                                                                                                 seqscape_metadata)
+            issues_dict[fpath].extend(check_results)
 
 
             #
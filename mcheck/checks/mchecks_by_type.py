@@ -21,12 +21,18 @@ This file has been created on Jun 10, 2016.
 
 import sys
 import os
+import subprocess
 from collections import  defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from mcheck.check_names import CHECK_NAMES
+from mcheck.results.checks_results import CheckResult
 from mcheck.metadata.irods_metadata.irods_meta_provider import iRODSMetadataProvider
 from mcheck.metadata.seqscape_metadata.seqscape_meta_provider import SeqscapeRawMetadataProvider
 from mcheck.metadata.file_header_metadata.header_meta_provider import SAMFileHeaderMetadataProvider
 from mcheck.metadata.seqscape_metadata.seqscape_metadata import SeqscapeMetadata
+from mcheck.metadata.seqscape_metadata.seqscape_association_checks import SeqscapeAssociationChecks
 from mcheck.metadata.irods_metadata.file_metadata import IrodsSeqFileMetadata
+import config
 
 
 class MetadataSelfChecks:
@@ -43,20 +49,28 @@ class MetadataSelfChecks:
         :return: a dict of key: fpath, value: the iRODS metadata for that path
         """
         irods_metadata_by_path = {}
+        all_files_metadata_objs_list = MetadataSelfChecks.fetch_raw_irods_metadata_by_metadata(search_criteria, irods_zone)
+        for raw_metadata in all_files_metadata_objs_list:
+            file_metadata, check_results = MetadataSelfChecks.preprocess_irods_metadata(raw_metadata, reference)
+            irods_metadata_by_path[raw_metadata.fpath] = file_metadata
+            issues_dict[raw_metadata.fpath].extend(check_results)
+        return irods_metadata_by_path
+
+
+    @staticmethod
+    def fetch_raw_irods_metadata_by_metadata(search_criteria, irods_zone):
+        """
+        This function fetches the raw iRODS metadata of all the files matching the search criteria.
+        It exits if the metadata can't be fetched from iRODS.
+        :param search_criteria: a dict formed of key= attr name, val = attr value. The operator is by default =.
+        :param irods_zone: the irods zone where to search for the data matching the criteria given
+        :return: list of IrodsRawFileMetadata
+        """
         try:
-            all_files_metadata_objs_list = iRODSMetadataProvider.retrieve_raw_files_metadata_by_metadata(search_criteria,
-                                                                                                         irods_zone)
+            return iRODSMetadataProvider.retrieve_raw_files_metadata_by_metadata(search_criteria, irods_zone)
         except Exception as e:
             print(e)
             sys.exit(1)
-        else:
-            for raw_metadata in all_files_metadata_objs_list:
-                check_results = []
-                file_metadata = IrodsSeqFileMetadata.from_raw_metadata(raw_metadata)
-                check_results.extend(file_metadata.check_metadata(reference))
-                irods_metadata_by_path[raw_metadata.fpath] = file_metadata
-                issues_dict[raw_metadata.fpath].extend(check_results)
-        return irods_metadata_by_path
 
 
     @staticmethod
@@ -64,54 +78,149 @@ class MetadataSelfChecks:
         """
         This function fetches the irods metadata by file path and preprocesses it.
         It also adds the issues found to the issues_dict given as parameter.
+        The files whose metadata couldn't be fetched are reported and skipped.
         :param irods_fpaths:
         :param issues_dict:
         :param reference:
         :return:
         """
         irods_metadata_dict = defaultdict(list)
-        for fpath in irods_fpaths:
-            try:
-                raw_metadata = iRODSMetadataProvider.fetch_raw_file_metadata_by_path(fpath)
-            except Exception as e:
-                print(e)
-                sys.exit(1)
-            else:
-                check_results = []
-                file_metadata = IrodsSeqFileMetadata.from_raw_metadata(raw_metadata)
-                check_results.extend(file_metadata.check_metadata(reference))
-                irods_metadata_dict[fpath] = file_metadata
-                issues_dict[fpath].extend(check_results)
+        irods_fpaths = list(irods_fpaths)
+        try:
+            raw_metadata_objs = iRODSMetadataProvider.fetch_raw_files_metadata_by_paths(irods_fpaths)
+        except Exception as e:
+            print(e)
+            sys.exit(1)
+        for fpath, raw_metadata in zip(irods_fpaths, raw_metadata_objs):
+            if raw_metadata is None:
+                continue
+            file_metadata, check_results = MetadataSelfChecks.preprocess_irods_metadata(raw_metadata, reference)
+            irods_metadata_dict[fpath] = file_metadata
+            issues_dict[fpath].extend(check_results)
         return irods_metadata_dict
 
 
     @staticmethod
-    def fetch_and_preprocess_header_metadata(irods_fpaths, issues_dict):
+    def preprocess_irods_metadata(raw_metadata, reference):
+        """
+        This function converts the raw iRODS metadata of a file into IrodsSeqFileMetadata and runs the checks on it.
+        :param raw_metadata: IrodsRawFileMetadata
+        :param reference: the desired reference, or None
+        :return: a tuple of (IrodsSeqFileMetadata, list of CheckResults)
+        """
+        file_metadata = IrodsSeqFileMetadata.from_raw_metadata(raw_metadata)
+        return file_metadata, file_metadata.check_metadata(reference)
+
+
+    @staticmethod
+    def build_header_not_fetched_check_result(reason):
+        return CheckResult(check_name=CHECK_NAMES.check_valid_ids, executed=False, result=None,
+                           error_message=["The header couldn't be fetched: %s" % reason])
+
+    @staticmethod
+    def build_seqscape_not_fetched_check_result(reason):
+        return CheckResult(check_name=CHECK_NAMES.check_all_irods_ids_found_in_seqscape, executed=False, result=None,
+                           error_message=["The Seqscape metadata couldn't be fetched: %s" % reason])
+
+    @staticmethod
+    def fetch_and_preprocess_header_metadata_for_file(fpath, timeout=None, checksums=None):
+        """
+        This function fetches the header metadata of a single file and runs the checks on it.
+        :param fpath: the iRODS path of the file
+        :param timeout: the maximum number of seconds for fetching the header, or None for no limit
+        :param checksums: the checksums of the file's replicas, for looking up the header in the header cache
+        :return: a tuple of (SAMFileHeaderMetadata, list of CheckResults), or (None, [a not executed CheckResult])
+                 if the header couldn't be fetched
+        """
+        try:
+            header_metadata = SAMFileHeaderMetadataProvider.fetch_metadata(fpath, irods=True, timeout=timeout,
+                                                                           checksums=checksums)
+        except subprocess.TimeoutExpired:
+            return None, [MetadataSelfChecks.build_header_not_fetched_check_result("timed out after %s seconds" % timeout)]
+        except (OSError, IOError) as e:
+            return None, [MetadataSelfChecks.build_header_not_fetched_check_result(e)]
+        check_results = header_metadata.check_metadata()
+        header_metadata.fix_metadata()
+        return header_metadata, check_results
+
+
+    @staticmethod
+    def fetch_and_preprocess_header_metadata(irods_fpaths, issues_dict, nr_workers=1, timeout=None, checksums_by_fpath=None):
+        """
+        This function fetches and checks the header metadata of all the files, running nr_workers samtools at a time.
+        :param irods_fpaths: an iterable of iRODS file paths
+        :param issues_dict: dict of key = file path, value = list of CheckResults, to which the results are added
+        :param nr_workers: the number of headers fetched concurrently
+        :param timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+        :param checksums_by_fpath: dict of key = file path, value = the checksums of the file's replicas,
+                                   for looking up the headers in the header cache
+        :return: dict of key = file path, value = SAMFileHeaderMetadata, for the files whose header could be fetched
+        """
         header_metadata_dict = {}
-        for fpath in irods_fpaths:
-            try:
-                header_metadata = SAMFileHeaderMetadataProvider.fetch_metadata(fpath, irods=True)
-            except (OSError, IOError) as e:
-                # TODO: log this error so that one knows what went wrong
-                pass
-            else:
-                check_results = header_metadata.check_metadata()
-                header_metadata.fix_metadata()
-                header_metadata_dict[fpath] = header_metadata
+        irods_fpaths = list(irods_fpaths)
+        checksums_by_fpath = checksums_by_fpath or {}
+        with ThreadPoolExecutor(nr_workers) as executor:
+            headers_and_check_results = executor.map(lambda fpath: MetadataSelfChecks.fetch_and_preprocess_header_metadata_for_file(fpath, timeout,
+                                                                                                                                 checksums_by_fpath.get(fpath)),
+                                                     irods_fpaths)
+            for fpath, (header_metadata, check_results) in zip(irods_fpaths, headers_and_check_results):
+                if header_metadata is not None:
+                    header_metadata_dict[fpath] = header_metadata
                 issues_dict[fpath].extend(check_results)
         return header_metadata_dict
 
 
     @staticmethod
-    def fetch_and_preprocess_seqscape_metadata(irods_metadata_by_path_dict, issues_dict):
+    def fetch_and_preprocess_seqscape_metadata_for_file(irods_metadata, association_checks=None):
+        """
+        This function fetches the Seqscape metadata corresponding to the iRODS metadata of a single file
+        and runs the checks on it.
+        :param irods_metadata: IrodsSeqFileMetadata
+        :param association_checks: SeqscapeAssociationChecks shared by the files of a run, or None
+        :return: a tuple of (SeqscapeMetadata, list of CheckResults)
+        """
+        raw_metadata = SeqscapeRawMetadataProvider.fetch_raw_metadata(irods_metadata.samples, irods_metadata.libraries,
+                                                                      irods_metadata.studies)
+        return MetadataSelfChecks.preprocess_seqscape_metadata(raw_metadata, association_checks)
+
+    @staticmethod
+    def preprocess_seqscape_metadata(raw_metadata, association_checks=None):
+        """
+        This function runs the checks on the raw Seqscape metadata of a file and builds the SeqscapeMetadata out of it.
+        :param raw_metadata: SeqscapeRawMetadata
+        :param association_checks: SeqscapeAssociationChecks shared by the files of a run, or None
+        :return: a tuple of (SeqscapeMetadata, list of CheckResults)
+        """
+        check_results = raw_metadata.check_metadata(association_checks)
+        seqsc_metadata = SeqscapeMetadata.from_raw_metadata(raw_metadata)
+        check_results.extend(seqsc_metadata.check_metadata())
+        return seqsc_metadata, check_results
+
+
+    @staticmethod
+    def fetch_and_preprocess_seqscape_metadata(irods_metadata_by_path_dict, issues_dict, batch=False):
+        """
+        This function fetches and checks the Seqscape metadata of all the files.
+        :param irods_metadata_by_path_dict: dict of key = file path, value = IrodsSeqFileMetadata
+        :param issues_dict: dict of key = file path, value = list of CheckResults, to which the results are added
+        :param batch: if True, the identifiers of all the files are looked up together in Seqscape,
+                      with a few bulk queries, instead of querying Seqscape separately for each file
+        :return: dict of key = file path, value = SeqscapeMetadata
+        """
         seqsc_metadata_dict = {}
+        association_checks = SeqscapeAssociationChecks(config.SEQSC_ASSOCIATION_CHECKS_MEMO_SIZE)
+        if batch:
+            ids_by_fpath = {fpath: (irods_metadata.samples, irods_metadata.libraries, irods_metadata.studies)
+                            for fpath, irods_metadata in irods_metadata_by_path_dict.items()}
+            raw_metadata_by_fpath = SeqscapeRawMetadataProvider.fetch_raw_metadata_in_batch(ids_by_fpath)
+            for fpath, raw_metadata in raw_metadata_by_fpath.items():
+                seqsc_metadata, check_results = MetadataSelfChecks.preprocess_seqscape_metadata(raw_metadata, association_checks)
+                issues_dict[fpath].extend(check_results)
+                seqsc_metadata_dict[fpath] = seqsc_metadata
+            return seqsc_metadata_dict
         for fpath, irods_metadata in irods_metadata_by_path_dict.items():
-            raw_metadata = SeqscapeRawMetadataProvider.fetch_raw_metadata(irods_metadata.samples, irods_metadata.libraries,
-                                                                          irods_metadata.studies)
-            check_results = raw_metadata.check_metadata()
-            issues_dict[fpath].extend(check_results)
-            seqsc_metadata = SeqscapeMetadata.from_raw_metadata(raw_metadata)
-            check_results = seqsc_metadata.check_metadata()
+            seqsc_metadata, check_results = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata_for_file(irods_metadata,
+                                                                                                         association_checks)
             issues_dict[fpath].extend(check_results)
             seqsc_metadata_dict[fpath] = seqsc_metadata
         return seqsc_metadata_dict
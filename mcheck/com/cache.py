@@ -0,0 +1,234 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Cache
+=====
+
+This module contains key-value caches with an expiry time (ttl) and a maximum size:
+- LRUCache - kept in memory, evicts the least recently used entries
+- SQLiteCache - kept on disk in a SQLite file, so that it survives across runs, evicts the least recently used entries
+- TieredCache - looks up the keys in memory first, then on disk, and counts the hits and misses.
+The keys are tuples of strings and the values have to be picklable.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+MISSING = object()
+
+
+class LRUCache:
+
+    def __init__(self, max_size, ttl=None):
+        """
+        :param max_size: the maximum number of entries kept
+        :param ttl: the number of seconds after which an entry expires, or None if the entries don't expire
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :return: the value cached for this key, or MISSING if there is none or it has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key, MISSING)
+            if entry is MISSING:
+                return MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, expires_at=None):
+        """
+        :param expires_at: the time at which the entry expires, by default ttl seconds from now
+        """
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache:
+    # Reading an entry doesn't write to the file: the times the entries were last used, and the expired entries
+    # found, are kept in memory and written in the same transaction as the next put, or after this many reads,
+    # or on close:
+    LAST_USED_FLUSH_INTERVAL = 1000
+
+    def __init__(self, path, max_size, ttl=None):
+        """
+        :param path: the path of the SQLite file, created if it doesn't exist (together with its directory)
+        :param max_size: the maximum number of entries kept
+        :param ttl: the number of seconds after which an entry expires, or None if the entries don't expire
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self._expired_keys = set()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache "
+                         "(key TEXT PRIMARY KEY, value BLOB, expires_at REAL, last_used REAL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)")
+        self._db.commit()
+
+    @staticmethod
+    def _serialize_key(key):
+        return '\t'.join(key)
+
+    def get_with_expiry(self, key):
+        """
+        :return: a tuple of (value, expiry time) cached for this key, or (MISSING, None) if there is none or it has expired
+        """
+        serialized_key = self._serialize_key(key)
+        with self._lock:
+            row = self._db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (serialized_key,)).fetchone()
+            if row is None:
+                return MISSING, None
+            value, expires_at = row
+            now = time.time()
+            if expires_at is not None and expires_at <= now:
+                self._expired_keys.add(serialized_key)
+                self._last_used.pop(serialized_key, None)
+                value = MISSING
+            else:
+                self._last_used[serialized_key] = now
+            if len(self._last_used) + len(self._expired_keys) >= self.LAST_USED_FLUSH_INTERVAL:
+                self._write_reads()
+                self._db.commit()
+        if value is MISSING:
+            return MISSING, None
+        return pickle.loads(value), expires_at
+
+    def _write_reads(self):
+        """
+        Writes the changes made by the reads since the last write, without committing them.
+        """
+        if self._last_used:
+            self._db.executemany("UPDATE cache SET last_used = ? WHERE key = ?",
+                                 [(last_used, key) for key, last_used in self._last_used.items()])
+            self._last_used.clear()
+        if self._expired_keys:
+            self._db.executemany("DELETE FROM cache WHERE key = ? AND expires_at <= ?",
+                                 [(key, time.time()) for key in self._expired_keys])
+            self._expired_keys.clear()
+
+    def get(self, key):
+        return self.get_with_expiry(key)[0]
+
+    def put_many(self, items):
+        """
+        :param items: an iterable of tuples of (key, value)
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        rows = [(self._serialize_key(key), pickle.dumps(value), expires_at, now) for key, value in items]
+        with self._lock:
+            self._write_reads()
+            self._db.executemany("INSERT OR REPLACE INTO cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)", rows)
+            nr_entries = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if nr_entries > self.max_size:
+                self._db.execute("DELETE FROM cache WHERE key IN "
+                                 "(SELECT key FROM cache ORDER BY last_used LIMIT ?)", (nr_entries - self.max_size,))
+            self._db.commit()
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def __len__(self):
+        with self._lock:
+            self._write_reads()
+            self._db.commit()
+            return self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._write_reads()
+            self._db.commit()
+            self._db.close()
+
+
+class TieredCache:
+
+    def __init__(self, memory_cache, disk_cache=None):
+        """
+        :param memory_cache: LRUCache
+        :param disk_cache: SQLiteCache, or None for keeping the entries only in memory
+        """
+        self.memory_cache = memory_cache
+        self.disk_cache = disk_cache
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :return: the value cached for this key, or MISSING if it isn't cached in any tier
+        """
+        value = self.memory_cache.get(key)
+        if value is not MISSING:
+            with self._stats_lock:
+                self.memory_hits += 1
+            return value
+        if self.disk_cache is not None:
+            value, expires_at = self.disk_cache.get_with_expiry(key)
+            if value is not MISSING:
+                self.memory_cache.put(key, value, expires_at)
+                with self._stats_lock:
+                    self.disk_hits += 1
+                return value
+        with self._stats_lock:
+            self.misses += 1
+        return MISSING
+
+    def put_many(self, items):
+        """
+        :param items: an iterable of tuples of (key, value)
+        """
+        items = list(items)
+        for key, value in items:
+            self.memory_cache.put(key, value)
+        if self.disk_cache is not None and items:
+            self.disk_cache.put_many(items)
+
+    def get_stats(self):
+        """
+        :return: a dict of the number of memory hits, disk hits and misses
+        """
+        return {'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits, 'misses': self.misses}
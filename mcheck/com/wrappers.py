@@ -25,13 +25,34 @@ import inspect
 
 
 def check_args_not_none(funct):
+    """
+    This function decorator raises ValueError if any of the arguments of the function is None,
+    including the parameters left to a default of None.
+    The signature of the function is looked at once, here, so that a call giving all the parameters positionally
+    only needs a check of its arguments - the other calls are bound to the parameters by inspect.getcallargs.
+    """
+    parameters = list(inspect.signature(funct).parameters.values())
+    nr_positional_parameters = len(parameters)
+    if any(parameter.kind not in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD)
+           for parameter in parameters):
+        nr_positional_parameters = None
+    parameter_names = [parameter.name for parameter in parameters]
+
+    def raise_none_arguments(func_args):
+        msg = "None arguments have been provided for this function: "+str(func_args)
+        raise ValueError(msg)
+
     @functools.wraps(funct)
     def wrapper(*args, **kwargs):
+        if not kwargs and len(args) == nr_positional_parameters:
+            for arg in args:
+                if arg is None:
+                    raise_none_arguments(dict(zip(parameter_names, args)))
+            return funct(*args)
         func_args = inspect.getcallargs(funct, *args, **kwargs)
         none_args = [(arg, val) for arg, val in list(func_args.items()) if val is None]
         if none_args:
-            msg = "None arguments have been provided for this function: "+str(func_args)
-            raise ValueError(msg)
+            raise_none_arguments(func_args)
         return funct(*args, **kwargs)
     return wrapper
 
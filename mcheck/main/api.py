@@ -26,23 +26,104 @@ Since metacheck is checking the files in IRODS, the checks are built around the
 from iRODS and fed into this software, which is:
 - metadata fetched by metacheck, given a file path
 - metadata fetched by metacheck, given some metadata to query by iRODS
-- metadata given as a stream of json data.
+- metadata given as a stream of json data - parsed one data object at a time, so that it never has to fit in memory.
 The result of all 3 check functions is the same: a dictionary of path - list of CheckResults.
+By default the metadata is fetched from each source in turn, for all the files. If nr_workers is given, the metadata
+of each file is fetched from the 3 sources concurrently, by a pool of nr_workers workers for each source,
+and the results are the same as when running the checks phase by phase.
+If batch_seqscape_queries is True, the Seqscape identifiers of all the files are looked up together, with a few
+bulk queries for each type of entity and identifier, instead of querying Seqscape separately for each file.
+If a results_store is given, the files whose iRODS metadata hasn't changed since they were last checked reuse
+the stored results of their header, Seqscape and comparison checks, instead of being checked again.
+Each check function has an iterator counterpart (iter_check_metadata_*), which yields a tuple of
+(path, list of CheckResults) as soon as a file has been completely checked, instead of returning all the results
+at the end of the run.
 """
 
 #from mcheck.main.run_checks import check_metadata_given_as_json_stream, check_metadata_fetched_by_path, check_metadata_fetched_by_metadata
 
 import sys
 from collections import defaultdict
-from mcheck.main.input_parser import convert_json_to_baton_objs
+from mcheck.main.input_parser import iter_baton_data_objects
 from mcheck.checks.mchecks_by_comparison import FileMetadataComparison
 from mcheck.checks.mchecks_by_type import MetadataSelfChecks
+from mcheck.checks.checks_pipeline import MetadataChecksPipeline
 from mcheck.metadata.irods_metadata.file_metadata import IrodsSeqFileMetadata
 from mcheck.metadata.irods_metadata.irods_meta_provider import iRODSMetadataProvider
+from mcheck.results.results_store import CheckResultsStore
+
+
+def _exit_if_no_files_checked(check_results_by_path):
+    if not check_results_by_path:
+        print("No irods metadata found. No checks performed.")
+        sys.exit(1)
+
+
+def _iter_file_check_results(check_results_iterator):
+    # A file given more than once is reported once, as in the dict returned by the check_metadata_* functions:
+    fpaths_checked = set()
+    for _, fpath, check_results in check_results_iterator:
+        if fpath in fpaths_checked:
+            continue
+        fpaths_checked.add(fpath)
+        yield fpath, check_results
+    if not fpaths_checked:
+        print("No irods metadata found. No checks performed.")
+        sys.exit(1)
+
+
+def _get_checksums_by_path(irods_metadata_dict):
+    return {fpath: irods_metadata.checksum_at_upload for fpath, irods_metadata in irods_metadata_dict.items()}
+
+
+def _reuse_stored_check_results(irods_metadata_dict, check_results_by_path, results_store, reference):
+    """
+    Adds to check_results_by_path the stored results of the files whose metadata hasn't changed since the last run.
+    :return: a tuple of (dict of key = file path, value = IrodsSeqFileMetadata, for the files to be checked again,
+                         dict of key = file path, value = the fingerprint of the file's metadata)
+    """
+    irods_metadata_to_check = {}
+    fingerprints = {}
+    for fpath, irods_metadata in irods_metadata_dict.items():
+        fingerprint = CheckResultsStore.compute_fingerprint(irods_metadata, reference)
+        stored_check_results = results_store.get(fpath, fingerprint)
+        if stored_check_results is None:
+            irods_metadata_to_check[fpath] = irods_metadata
+            fingerprints[fpath] = fingerprint
+        else:
+            check_results_by_path[fpath].extend(stored_check_results)
+    return irods_metadata_to_check, fingerprints
+
+
+def _check_header_and_seqscape_metadata(irods_metadata_dict, check_results_by_path, batch_seqscape_queries,
+                                        nr_header_workers, header_timeout, results_store=None, reference=None):
+    """
+    Runs the header and the Seqscape phases and the checks across the 3 sources, for the files already checked in iRODS.
+    If a results_store is given, the files that haven't changed since the last run reuse their stored results instead,
+    and the results of the others are stored.
+    """
+    if results_store is not None:
+        irods_metadata_dict, fingerprints = _reuse_stored_check_results(irods_metadata_dict, check_results_by_path,
+                                                                        results_store, reference)
+        nr_irods_check_results = {fpath: len(check_results_by_path[fpath]) for fpath in irods_metadata_dict}
+    header_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_header_metadata(irods_metadata_dict.keys(), check_results_by_path,
+                                                                                   nr_header_workers or 1, header_timeout,
+                                                                                   _get_checksums_by_path(irods_metadata_dict))
+    seqscape_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata(irods_metadata_dict, check_results_by_path,
+                                                                                       batch_seqscape_queries)
+    FileMetadataComparison.check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict,
+                                                                   seqscape_metadata_dict, check_results_by_path)
+    if results_store is not None:
+        for fpath in irods_metadata_dict:
+            # The results of files whose header couldn't be fetched aren't kept, so that they are checked again:
+            if fpath in header_metadata_dict:
+                results_store.put(fpath, fingerprints[fpath], check_results_by_path[fpath][nr_irods_check_results[fpath]:])
 
 
 def check_metadata_fetched_by_metadata(filter_npg_qc=None, filter_target=None, file_types=None, study_name=None,
-                                       study_acc_nr=None, study_internal_id=None, irods_zone=None, reference=None):
+                                       study_acc_nr=None, study_internal_id=None, irods_zone=None, reference=None,
+                                       nr_workers=None, batch_seqscape_queries=False, nr_header_workers=None,
+                                       header_timeout=None, results_store=None):
     """
     This function fetches the iRODS metadata by querying iRODS by other metadata. It takes as parameters a set of optional
     querying fields and returns a dict where key = file path checked, value = a list of CheckResult objects corresponding
@@ -55,12 +136,27 @@ def check_metadata_fetched_by_metadata(filter_npg_qc=None, filter_target=None, f
     :param study_internal_id: the study internal id that we want to fetch data for
     :param irods_zone: the zone where the query should be run
     :param reference: the genome reference => one wants to check if the data has this reference as metadata
+    :param nr_workers: if given, the checks are run concurrently, with nr_workers workers for each source of metadata
+    :param batch_seqscape_queries: if True, the Seqscape identifiers of all the files are looked up together,
+                                   with a few bulk queries - the checks are then run phase by phase
+    :param nr_header_workers: the number of file headers fetched concurrently - by default 1 when running
+                              phase by phase, nr_workers otherwise
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
     :return: dict of key = string file path, value = list[CheckResult]
     """
     check_results_by_path = defaultdict(list)
     search_criteria = iRODSMetadataProvider.convert_to_irods_fields(filter_npg_qc, filter_target,
                                                                     file_types, study_name,
                                                                     study_acc_nr, study_internal_id)
+    if nr_workers and not batch_seqscape_queries:
+        raw_metadata_objs = MetadataSelfChecks.fetch_raw_irods_metadata_by_metadata(search_criteria, irods_zone)
+        pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                          header_timeout=header_timeout, results_store=results_store)
+        check_results_by_path = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(raw_metadata_objs))
+        _exit_if_no_files_checked(check_results_by_path)
+        return check_results_by_path
     irods_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_irods_metadata_by_metadata(search_criteria,
                                                                                              irods_zone,
                                                                                              check_results_by_path,
@@ -68,14 +164,13 @@ def check_metadata_fetched_by_metadata(filter_npg_qc=None, filter_target=None, f
     if not irods_metadata_dict:
         print("No irods metadata found. No checks performed.")
         sys.exit(1)
-    header_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_header_metadata(irods_metadata_dict.keys(), check_results_by_path)
-    seqscape_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata(irods_metadata_dict, check_results_by_path)
-    FileMetadataComparison.check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict,
-                                                                   seqscape_metadata_dict, check_results_by_path)
+    _check_header_and_seqscape_metadata(irods_metadata_dict, check_results_by_path, batch_seqscape_queries,
+                                        nr_header_workers, header_timeout, results_store, reference)
     return check_results_by_path
 
 
-def check_metadata_fetched_by_path(irods_fpaths, reference=None):
+def check_metadata_fetched_by_path(irods_fpaths, reference=None, nr_workers=None, batch_seqscape_queries=False,
+                                   nr_header_workers=None, header_timeout=None, results_store=None):
     """
     This function fetches the iRODS metadata by file path. It takes as parameter a list of file paths and queries
     iRODS for metadata for each of the paths taken as parameter. It returns a dict where
@@ -83,8 +178,22 @@ def check_metadata_fetched_by_path(irods_fpaths, reference=None):
     :param irods_fpaths: list of strings corresponding to iRODS file paths
     :param reference: string that contains the name of the genome reference =>
             one wants to check if the data has this reference as metadata
+    :param nr_workers: if given, the checks are run concurrently, with nr_workers workers for each source of metadata
+    :param batch_seqscape_queries: if True, the Seqscape identifiers of all the files are looked up together,
+                                   with a few bulk queries - the checks are then run phase by phase
+    :param nr_header_workers: the number of file headers fetched concurrently - by default 1 when running
+                              phase by phase, nr_workers otherwise
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
     :return: dict of key = string file path, value = list[CheckResult]
     """
+    if nr_workers and not batch_seqscape_queries:
+        pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                          header_timeout=header_timeout, results_store=results_store)
+        check_results_by_path = MetadataChecksPipeline.collect_check_results(pipeline.check_irods_fpaths(irods_fpaths))
+        _exit_if_no_files_checked(check_results_by_path)
+        return check_results_by_path
     check_results_by_path = defaultdict(list)
     irods_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_irods_metadata_by_path(irods_fpaths,
                                                                                          check_results_by_path,
@@ -92,33 +201,101 @@ def check_metadata_fetched_by_path(irods_fpaths, reference=None):
     if not irods_metadata_dict:
         print("No irods metadata found. No checks performed.")
         sys.exit(1)
-    header_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_header_metadata(irods_metadata_dict.keys(), check_results_by_path)
-    seqscape_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata(irods_metadata_dict, check_results_by_path)
-    FileMetadataComparison.check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict,
-                                                                   seqscape_metadata_dict, check_results_by_path)
+    _check_header_and_seqscape_metadata(irods_metadata_dict, check_results_by_path, batch_seqscape_queries,
+                                        nr_header_workers, header_timeout, results_store, reference)
     return check_results_by_path
 
 
-def check_metadata_given_as_json_stream(reference=None):
+def check_metadata_given_as_json_stream(reference=None, nr_workers=None, batch_seqscape_queries=False,
+                                        nr_header_workers=None, header_timeout=None, results_store=None):
     """
     This function takes in the iRODS metadata as a stream of json data read from stdin and it uses for checking the files.
     :param reference: string that contains the name of the genome reference =>
                       one wants to check if the data has this reference as metadata
+    :param nr_workers: if given, the checks are run concurrently, with nr_workers workers for each source of metadata
+    :param batch_seqscape_queries: if True, the Seqscape identifiers of all the files are looked up together,
+                                   with a few bulk queries - the checks are then run phase by phase
+    :param nr_header_workers: the number of file headers fetched concurrently - by default 1 when running
+                              phase by phase, nr_workers otherwise
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
     :return: dict of key = string file path, value = list[CheckResult]
     """
     check_results_by_path = defaultdict(list)
-    json_input_data = sys.stdin.read()
-    baton_data_objects_list = convert_json_to_baton_objs(json_input_data)
+    baton_data_objects = iter_baton_data_objects(sys.stdin)
+    if nr_workers and not batch_seqscape_queries:
+        pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                          header_timeout=header_timeout, results_store=results_store)
+        check_results_by_path = MetadataChecksPipeline.collect_check_results(pipeline.check_baton_data_objects(baton_data_objects))
+        _exit_if_no_files_checked(check_results_by_path)
+        return check_results_by_path
     irods_metadata_dict = {}
-    for data_obj in baton_data_objects_list:
+    for data_obj in baton_data_objects:
         meta = IrodsSeqFileMetadata.from_baton_wrapper(data_obj)
         check_results_by_path[meta.fpath].extend(meta.check_metadata(reference))
         irods_metadata_dict[meta.fpath] = meta
     if not irods_metadata_dict:
         print("No irods metadata found. No checks performed.")
         sys.exit(1)
-    header_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_header_metadata(irods_metadata_dict.keys(), check_results_by_path)
-    seqscape_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata(irods_metadata_dict, check_results_by_path)
-    FileMetadataComparison.check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict,
-                                                                   seqscape_metadata_dict, check_results_by_path)
+    _check_header_and_seqscape_metadata(irods_metadata_dict, check_results_by_path, batch_seqscape_queries,
+                                        nr_header_workers, header_timeout, results_store, reference)
     return check_results_by_path
+
+
+def iter_check_metadata_fetched_by_metadata(filter_npg_qc=None, filter_target=None, file_types=None, study_name=None,
+                                            study_acc_nr=None, study_internal_id=None, irods_zone=None, reference=None,
+                                            nr_workers=1, nr_header_workers=None, header_timeout=None,
+                                            results_store=None):
+    """
+    This function is the same as check_metadata_fetched_by_metadata, except that it yields the results of each file
+    as soon as the file and the ones before it have been checked, in the order of the input.
+    :param nr_workers: the number of workers for each source of metadata
+    :param nr_header_workers: the number of file headers fetched concurrently, by default nr_workers
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
+    :return: yields tuples of (string file path, list[CheckResult])
+    """
+    search_criteria = iRODSMetadataProvider.convert_to_irods_fields(filter_npg_qc, filter_target,
+                                                                    file_types, study_name,
+                                                                    study_acc_nr, study_internal_id)
+    raw_metadata_objs = MetadataSelfChecks.fetch_raw_irods_metadata_by_metadata(search_criteria, irods_zone)
+    pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                      header_timeout=header_timeout, results_store=results_store, in_input_order=True)
+    return _iter_file_check_results(pipeline.check_raw_irods_metadata(raw_metadata_objs))
+
+
+def iter_check_metadata_fetched_by_path(irods_fpaths, reference=None, nr_workers=1, nr_header_workers=None,
+                                        header_timeout=None, results_store=None):
+    """
+    This function is the same as check_metadata_fetched_by_path, except that it yields the results of each file
+    as soon as the file and the ones before it have been checked, in the order of the input.
+    :param nr_workers: the number of workers for each source of metadata
+    :param nr_header_workers: the number of file headers fetched concurrently, by default nr_workers
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
+    :return: yields tuples of (string file path, list[CheckResult])
+    """
+    pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                      header_timeout=header_timeout, results_store=results_store, in_input_order=True)
+    return _iter_file_check_results(pipeline.check_irods_fpaths(irods_fpaths))
+
+
+def iter_check_metadata_given_as_json_stream(reference=None, nr_workers=1, nr_header_workers=None, header_timeout=None,
+                                             results_store=None):
+    """
+    This function is the same as check_metadata_given_as_json_stream, except that it yields the results of each file
+    as soon as the file and the ones before it have been checked, in the order of the input.
+    :param nr_workers: the number of workers for each source of metadata
+    :param nr_header_workers: the number of file headers fetched concurrently, by default nr_workers
+    :param header_timeout: the maximum number of seconds for fetching the header of a file, or None for no limit
+    :param results_store: a CheckResultsStore - if given, the files whose metadata hasn't changed since they were
+                          last checked reuse their stored results, and the results of the others are stored
+    :return: yields tuples of (string file path, list[CheckResult])
+    """
+    baton_data_objects = iter_baton_data_objects(sys.stdin)
+    pipeline = MetadataChecksPipeline(reference, nr_workers, nr_header_workers=nr_header_workers,
+                                      header_timeout=header_timeout, results_store=results_store, in_input_order=True)
+    return _iter_file_check_results(pipeline.check_baton_data_objects(baton_data_objects))
@@ -43,10 +43,59 @@ def parse_args():
                             required=False,
                             help='write the output as json',
     )
+    output_grp.add_argument('--output_as_jsonl',
+                            dest='jsonl_output',
+                            action='store_true',
+                            required=False,
+                            help='write the output as JSON Lines, one json object per file',
+    )
+
+    # EXECUTION: how to run the checks?
+    execution_grp = parent_parser.add_argument_group('EXECUTION', 'How to run the checks')
+    execution_grp.add_argument('--nr_workers',
+                               type=int,
+                               required=False,
+                               help='Fetch the metadata of different files from iRODS, file header and Seqscape '
+                                    'concurrently, using this many workers for each source of metadata',
+    )
+    execution_grp.add_argument('--nr_header_workers',
+                               type=int,
+                               required=False,
+                               help='Fetch this many file headers concurrently (by default 1 if --nr_workers is not given, '
+                                    'and as many as --nr_workers otherwise)',
+    )
+    execution_grp.add_argument('--header_timeout',
+                               type=int,
+                               required=False,
+                               help='Stop fetching the header of a file after this many seconds and report the header '
+                                    'checks as not executed (by default there is no limit)',
+    )
+    execution_grp.add_argument('--batch_seqscape_queries',
+                               action='store_true',
+                               required=False,
+                               help='Look up the Seqscape identifiers of all the files together, with a few bulk queries, '
+                                    'instead of querying Seqscape separately for each file. The results are output '
+                                    'at the end of the run',
+    )
+
+    execution_grp.add_argument('--incremental',
+                               action='store_true',
+                               required=False,
+                               help='Keep the results of each file in the results store given in the config, and reuse '
+                                    'them for the files whose iRODS metadata has not changed since they were last checked, '
+                                    'instead of fetching their header and Seqscape metadata again',
+    )
 
     # ADDITIONALS:
     additional_outputs_grp = parent_parser.add_argument_group('INCLUDE IN OUTPUT', 'What to include in the output')
     additional_outputs_grp.add_argument("-v", "--verbosity", action="count", help="increase output verbosity")
+    additional_outputs_grp.add_argument('--summary',
+                                        action='store_true',
+                                        required=False,
+                                        help='print on stderr, at the end of the run, a summary of the check results: '
+                                             'counts by result, severity and executed, and the number of files that '
+                                             'failed or could not execute each check',
+    )
     subparsers = parser.add_subparsers(title='Choose the Strategy for fetching iRODS metadata: in batch, per file or given by the user as input',
                                        description='One subcommand required: fetch_by_path | fetch_by_metadata | given_by_user',
                                        help='Sub-commands',
@@ -112,7 +161,12 @@ def parse_args():
                             required=False,
                             help='This flag stopps the default filter on the target=1 irods metadata attribute',
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    # The bulk Seqscape queries need the identifiers of all the files upfront, so the checks are then run
+    # phase by phase, not by the workers of the pipeline:
+    if args.batch_seqscape_queries and args.nr_workers:
+        parser.error("--batch_seqscape_queries can't be combined with --nr_workers")
+    return args
 
 
 if __name__ == '__main__':
@@ -12,6 +12,10 @@ IRODS_METADATA_REFERENCE_PROPERTY = "reference"
 IRODS_METADATA_TARGET_PROPERTY = "target"
 IRODS_ORIGINAL_REPLICA_NUMBER = 0
 
+JSON_STREAM_READ_SIZE = 65536
+# The characters a json number can continue with:
+_JSON_NUMBER_CHARACTERS = frozenset('0123456789.eE+-')
+
 
 def convert_json_to_baton_objs(data_objects_as_json_string: str) -> List[IrodsSeqFileMetadata]:
     decoded = json.loads(data_objects_as_json_string, cls=DataObjectJSONDecoder)
@@ -20,6 +24,89 @@ def convert_json_to_baton_objs(data_objects_as_json_string: str) -> List[IrodsSe
     return decoded
 
 
+def iter_json_array_items(json_stream, read_size=JSON_STREAM_READ_SIZE):
+    """
+    Parses a json array read from a stream one item at a time, keeping in memory only the item being parsed
+    and what is left of the last chunk read. A json object given instead of an array is yielded as the only item.
+    :param json_stream: a text stream (e.g. sys.stdin) containing a json array
+    :param read_size: the number of characters read from the stream at a time
+    :return: yields the items of the array, each as a json string
+    :raises ValueError: if the stream doesn't contain valid json
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    stream_exhausted = False
+
+    def read_more():
+        nonlocal buffer, position, stream_exhausted
+        chunk = json_stream.read(read_size)
+        if not chunk:
+            stream_exhausted = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or stream_exhausted:
+                return
+            read_more()
+
+    def decode_item():
+        nonlocal position
+        while True:
+            try:
+                _, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if stream_exhausted:
+                    raise ValueError("Invalid json at: %s" % buffer[position:position + 100])
+            else:
+                # A number followed only by characters that can still be part of it (e.g. "1" of "1.") might continue
+                # in the next chunk:
+                number_may_continue = buffer[position] in '-0123456789' and \
+                    all(character in _JSON_NUMBER_CHARACTERS for character in buffer[end:])
+                if not number_may_continue or stream_exhausted:
+                    item = buffer[position:end]
+                    position = end
+                    return item
+            read_more()
+
+    skip_whitespace()
+    if position == len(buffer):
+        return
+    if buffer[position] != '[':
+        yield decode_item()
+        return
+    position += 1
+    skip_whitespace()
+    if buffer[position:position + 1] == ']':
+        return
+    while True:
+        yield decode_item()
+        skip_whitespace()
+        separator = buffer[position:position + 1]
+        position += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise ValueError("Invalid json: expected ',' or ']' between the items of the array, found: %r" % separator)
+        skip_whitespace()
+
+
+def iter_baton_data_objects(json_stream, read_size=JSON_STREAM_READ_SIZE):
+    """
+    Parses the baton data objects given as a json array (or a single json object) in a stream, one at a time.
+    :param json_stream: a text stream (e.g. sys.stdin) containing the baton output
+    :param read_size: the number of characters read from the stream at a time
+    :return: yields DataObjects, in the order of the stream
+    """
+    for data_object_as_json in iter_json_array_items(json_stream, read_size):
+        yield json.loads(data_object_as_json, cls=DataObjectJSONDecoder)
+
+
 def parse_data_objects(data_objects_as_json_string: str) -> List[IrodsSeqFileMetadata]:
     """
     Parses the given data object(s) in the JSON serialised form, defined by baton, into representations that are used
@@ -20,8 +20,27 @@ This file has been created on Jul 27, 2016.
 """
 
 import json
-from mcheck.results.checks_results import RESULT, CheckResult    #, CheckResultJSONEncoder
-from hgijson import MappingJSONEncoderClassBuilder, JsonPropertyMapping, MappingJSONDecoderClassBuilder
+from abc import ABC, abstractmethod
+
+TSV_HEADER = "Fpath\tExecuted\tResult\tErrors\t"
+
+
+def format_file_check_results_as_tsv(fpath, check_results):
+    """
+    This function converts the CheckResults of one file into tab delimited values, one line per CheckResult.
+    :param fpath: str - the file path
+    :param check_results: list[CheckResult]
+    :return: tab delimited values string
+    """
+    fpath = str(fpath)
+    return ''.join(_format_check_result_as_tsv(fpath, issue) for issue in check_results)
+
+
+def _format_check_result_as_tsv(fpath, issue):
+    errors = issue.error_message if (issue.error_message or issue.error_message is None) else None
+    return fpath + '\t' + str(issue.check_name) + '\t' + str(issue.executed) + '\t' + \
+           str(issue.result) + '\t' + str(errors) + '\n'
+
 
 def format_output_as_tsv(check_results_by_path):
     """
@@ -31,16 +50,84 @@ def format_output_as_tsv(check_results_by_path):
     """
     result_str = ''
     if check_results_by_path:
-        result_str += "Fpath\tExecuted\tResult\tErrors\t"
-        for fpath, issues in check_results_by_path.items():
-            for issue in issues:
-                errors = issue.error_message if (issue.error_message or issue.error_message is None) else None
-                result_str = result_str + str(fpath) + '\t' + str(issue.check_name) + '\t' + str(
-                    issue.executed) + '\t' + str(
-                    issue.result) + '\t' + str(errors) + '\n'
+        result_str = TSV_HEADER + ''.join(format_file_check_results_as_tsv(fpath, issues)
+                                          for fpath, issues in check_results_by_path.items())
     return result_str
 
 
+_encode_json_string = json.encoder.encode_basestring_ascii
+_MAX_CHECK_RESULTS_AS_JSON_CACHED = 10000
+_check_results_as_json_without_error_message = {}
+
+
+def _encode_json_value(value):
+    if type(value) is str:
+        return _encode_json_string(value)
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    return json.dumps(value)
+
+
+def format_check_result_as_json(check_result):
+    """
+    This function serializes a CheckResult to json, byte for byte the same as the hgijson encoder built from
+    CheckResult.to_json_mapping() does (the same properties, in the same order, leaving out the optional ones
+    that are None), but without going through hgijson's generic mapping, which is much slower.
+    :param check_result: CheckResult
+    :return: json formatted string
+    """
+    if check_result.error_message is None:
+        # Most CheckResults have no error message and differ only by a few check names and results, so their json
+        # is cached. The types are part of the key, as e.g. True == 1, but they are serialized differently.
+        key = (check_result.check_name, check_result.severity, check_result.executed, type(check_result.executed),
+               check_result.result, type(check_result.result))
+        try:
+            return _check_results_as_json_without_error_message[key]
+        except KeyError:
+            pass
+        except TypeError:
+            return _format_check_result_as_json(check_result)
+        as_json = _format_check_result_as_json(check_result)
+        if len(_check_results_as_json_without_error_message) < _MAX_CHECK_RESULTS_AS_JSON_CACHED:
+            _check_results_as_json_without_error_message[key] = as_json
+        return as_json
+    return _format_check_result_as_json(check_result)
+
+
+def _format_check_result_as_json(check_result):
+    parts = ['{"check_name": ', _encode_json_value(check_result.check_name)]
+    if check_result.severity is not None:
+        parts.append(', "severity": ')
+        parts.append(_encode_json_value(check_result.severity))
+    if check_result.error_message is not None:
+        parts.append(', "error_message": ')
+        parts.append(_encode_json_value(check_result.error_message))
+    if check_result.executed is not None:
+        parts.append(', "executed": ')
+        parts.append(_encode_json_value(check_result.executed))
+    if check_result.result is not None:
+        parts.append(', "result": ')
+        parts.append(_encode_json_value(check_result.result))
+    parts.append('}')
+    return ''.join(parts)
+
+
+def _format_check_results_list_as_json(check_results):
+    return '[' + ', '.join([format_check_result_as_json(check_result) for check_result in check_results]) + ']'
+
+
+def format_file_check_results_as_json(fpath, check_results):
+    """
+    This function formats the CheckResults of one file as a json key - value pair, the same as it appears
+    within the output of format_output_as_json.
+    :param fpath: str - the file path
+    :param check_results: list[CheckResult]
+    :return: json formatted string of: "fpath": [check results]
+    """
+    return _encode_json_value(fpath) + ': ' + _format_check_results_list_as_json(check_results)
+
 
 def format_output_as_json(check_results_by_path):
     """
@@ -48,5 +135,77 @@ def format_output_as_json(check_results_by_path):
     :param check_results_by_path: dict - key = str (filepath), value = list[CheckResult]
     :return: json formatted string
     """
-    CheckResultJSONEncoder = MappingJSONEncoderClassBuilder(CheckResult, CheckResult.to_json_mapping()).build()
-    return json.dumps(check_results_by_path, cls=CheckResultJSONEncoder)
\ No newline at end of file
+    return '{' + ', '.join([format_file_check_results_as_json(fpath, check_results)
+                            for fpath, check_results in check_results_by_path.items()]) + '}'
+
+
+class CheckResultsWriter(ABC):
+    """
+    A writer writes the CheckResults of each file to an output as soon as it is given them, without keeping
+    the report in memory. close() has to be called after the last file, for ending the output.
+    """
+    def __init__(self, output):
+        """
+        :param output: the file to write to
+        """
+        self.output = output
+        self.nr_files_written = 0
+
+    def write_file_check_results(self, fpath, check_results):
+        """
+        :param fpath: str - the file path
+        :param check_results: list[CheckResult]
+        """
+        self._write_file_check_results(fpath, check_results)
+        self.nr_files_written += 1
+        self.output.flush()
+
+    def close(self):
+        self._write_end()
+        self.output.flush()
+
+    @abstractmethod
+    def _write_file_check_results(self, fpath, check_results):
+        pass
+
+    def _write_end(self):
+        pass
+
+
+class TSVCheckResultsWriter(CheckResultsWriter):
+    """
+    Writes tab delimited values, one line per CheckResult - the whole output being the same as format_output_as_tsv's,
+    followed by a new line.
+    """
+    def _write_file_check_results(self, fpath, check_results):
+        if not self.nr_files_written:
+            self.output.write(TSV_HEADER)
+        fpath = str(fpath)
+        for check_result in check_results:
+            self.output.write(_format_check_result_as_tsv(fpath, check_result))
+
+    def _write_end(self):
+        self.output.write('\n')
+
+
+class JSONCheckResultsWriter(CheckResultsWriter):
+    """
+    Writes a json object of key = file path, value = list of CheckResults - the whole output being the same
+    as format_output_as_json's, followed by a new line.
+    """
+    def _write_file_check_results(self, fpath, check_results):
+        self.output.write(', ' if self.nr_files_written else '{')
+        self.output.write(format_file_check_results_as_json(fpath, check_results))
+
+    def _write_end(self):
+        self.output.write('}\n' if self.nr_files_written else '{}\n')
+
+
+class JSONLinesCheckResultsWriter(CheckResultsWriter):
+    """
+    Writes JSON Lines: a json object of {"fpath": file path, "check_results": list of CheckResults} on each line,
+    so that the files of the report can be read independently of each other.
+    """
+    def _write_file_check_results(self, fpath, check_results):
+        self.output.write('{"fpath": ' + _encode_json_value(fpath) + ', "check_results": ' +
+                          _format_check_results_list_as_json(check_results) + '}\n')
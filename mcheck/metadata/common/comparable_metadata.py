@@ -21,6 +21,8 @@ This file has been created on Jun 13, 2016.
 
 
 class ComparableMetadata:
+    ENTITY_TYPES = ('samples', 'studies', 'libraries')
+
     def __init__(self, samples, libraries, studies):
         self.samples = samples
         self.studies = studies
@@ -40,27 +42,93 @@ class ComparableMetadata:
             return True
         return False
 
+    # Setting the ids of any type of entity makes the id index be built again:
+    @property
+    def samples(self):
+        return self._samples
+
+    @samples.setter
+    def samples(self, samples):
+        self._samples = samples
+        self.invalidate_id_index()
+
+    @property
+    def studies(self):
+        return self._studies
+
+    @studies.setter
+    def studies(self, studies):
+        self._studies = studies
+        self.invalidate_id_index()
+
+    @property
+    def libraries(self):
+        return self._libraries
+
+    @libraries.setter
+    def libraries(self, libraries):
+        self._libraries = libraries
+        self.invalidate_id_index()
+
+    def invalidate_id_index(self):
+        """
+        Makes the id index be built again the next time it is needed - to be called after changing the ids
+        of the entities in place.
+        """
+        self._id_index = None
+
+    def get_id_index(self):
+        """
+        The id index is built once, with each id converted to str, so that an id compares equal across sources
+        whether it is an int or a str, and in whichever order the ids are.
+        :return: dict of key = entity type, value = dict of key = id type, value = frozenset of the ids as str,
+                 only for the id types that have ids
+        """
+        id_index = getattr(self, '_id_index', None)
+        if id_index is None:
+            id_index = {}
+            for entity_type in self.ENTITY_TYPES:
+                entities = getattr(self, entity_type) or {}
+                id_index[entity_type] = {id_type: frozenset(str(v) for v in values)
+                                         for id_type, values in entities.items() if values}
+            self._id_index = id_index
+        return id_index
+
     def difference(self, other):
         """
         This method finds the differences between metadata1 and metadata2, given a list of entities of interest.
         Basically does metadata1 - metadata2 (finds all the entities that are present within metadata1, and not within metadata2).
+        Only the id types that have ids in both metadata are compared.
         :param other: ComparableMetadata
         :return: a dict of differences per type of entity.
         """
         if not isinstance(other, ComparableMetadata):
             raise TypeError("Can't compare with a non-ComparableMetadata type")
+        id_index1 = self.get_id_index()     # header
+        id_index2 = other.get_id_index()    # seqsc
         differences = {}
-        for entity_type in ['samples', 'studies', 'libraries']:
-            metadata_entities1 = getattr(self, entity_type)  # header
-            metadata_entities2 = getattr(other, entity_type)  # seqsc
+        for entity_type in self.ENTITY_TYPES:
+            ids2_by_id_type = id_index2[entity_type]
             ent_type_diffs = {}
-            for id_type, values1 in metadata_entities1.items():
-                if values1 and metadata_entities2.get(id_type):
-                    values1 = [str(v) for v in values1]
-                    values2 = [str(v) for v in metadata_entities2.get(id_type)]
-                    if values1 != values2:
-                        ent_type_diffs[id_type] = set(values1).difference(set(values2))
+            for id_type, ids1 in id_index1[entity_type].items():
+                ids2 = ids2_by_id_type.get(id_type)
+                if ids2 is not None:
+                    diff = ids1.difference(ids2)
+                    if diff:
+                        ent_type_diffs[id_type] = set(diff)
             if ent_type_diffs:
                 differences[entity_type] = ent_type_diffs
         return differences
 
+    def symmetric_difference(self, other):
+        """
+        Finds the ids present in only one of the two metadata, for the id types that have ids in both.
+        :param other: ComparableMetadata
+        :return: a dict of differences per type of entity, as given by difference
+        """
+        differences = self.difference(other)
+        for entity_type, ent_type_diffs in other.difference(self).items():
+            for id_type, diff in ent_type_diffs.items():
+                differences.setdefault(entity_type, {}).setdefault(id_type, set()).update(diff)
+        return differences
+
@@ -19,12 +19,17 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 19, 2015.
 """
 
+import functools
 import re
-from typing import List, Dict
+from typing import List, Dict, Iterable
 
 from mcheck.com import wrappers
 
 
+# The maximum number of identifiers whose type is remembered, the same ids recurring across many files:
+IDENTIFIER_TYPES_MEMO_SIZE = 100000
+
+
 class EntityIdentifier(object):
     @classmethod
     @wrappers.check_args_not_none
@@ -80,17 +85,24 @@ class EntityIdentifier(object):
             identifier_type = 'name'
         return identifier_type
 
+    @classmethod
+    @wrappers.check_args_not_none
+    def classify_identifiers(cls, identifiers: Iterable[str]) -> Dict[str, str]:
+        """
+        Classifies a batch of identifiers, looking up first the identifiers already classified,
+        in a memo table of the last IDENTIFIER_TYPES_MEMO_SIZE identifiers classified.
+        :param identifiers: an iterable of identifiers, of any size
+        :return: dict of key = identifier, value = its type: internal_id, accession_number or name
+        """
+        return {identifier: _classify_identifier(identifier) for identifier in identifiers}
+
     @classmethod
     @wrappers.check_args_not_none
     def separate_identifiers_by_type(cls, identifiers: List[str]) -> Dict[str, List[str]]:
         ids, names, accession_nrs = set(), set(), set()
-        for identifier in identifiers:
-            if cls.is_internal_id(identifier):
-                ids.add(identifier)
-            elif cls.is_accession_nr(identifier):
-                accession_nrs.add(identifier)
-            else:
-                names.add(identifier)
+        identifiers_by_type = {'name': names, 'accession_number': accession_nrs, 'internal_id': ids}
+        for identifier, identifier_type in cls.classify_identifiers(identifiers).items():
+            identifiers_by_type[identifier_type].add(identifier)
         return {'name': names,
                 'accession_number': accession_nrs,
                 'internal_id': ids
@@ -115,3 +127,10 @@ class EntityIdentifier(object):
         #     return filtered_entities, problems
 
 
+@functools.lru_cache(maxsize=IDENTIFIER_TYPES_MEMO_SIZE)
+def _classify_identifier(identifier) -> str:
+    if EntityIdentifier.is_internal_id(identifier):
+        return 'internal_id'
+    elif EntityIdentifier.is_accession_nr(identifier):
+        return 'accession_number'
+    return 'name'
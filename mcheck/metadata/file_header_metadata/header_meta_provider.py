@@ -19,19 +19,88 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 16, 2015.
 """
 
+import subprocess
+import threading
+
+import config
 import mcheck.com.utils as common_utils
 from mcheck.metadata.common.identifiers import EntityIdentifier
 from mcheck.metadata.file_header_metadata.header_metadata import SAMFileHeaderMetadata
+from mcheck.metadata.file_header_metadata.header_metadata_cache import HeaderMetadataCache
 
 from sam.header_extractor import IrodsSamFileHeaderExtractor, LustreSamFileHeaderExtractor
 from sam.header_parser import SAMFileHeaderParser, SAMFileRGTagParser
 
 
 class SAMFileHeaderMetadataProvider:
+    _header_cache = None
+    _header_cache_lock = threading.Lock()
+
+    @classmethod
+    def _get_header_cache(cls):
+        """
+        Returns the cache of the headers of the files in iRODS, creating it if needed,
+        or None if HEADER_CACHE_PATH isn't set.
+        """
+        if not config.HEADER_CACHE_PATH:
+            return None
+        with cls._header_cache_lock:
+            if cls._header_cache is None:
+                cls._header_cache = HeaderMetadataCache(config.HEADER_CACHE_PATH, config.HEADER_CACHE_SIZE)
+            return cls._header_cache
+
+    @classmethod
+    def get_header_cache_stats(cls):
+        """
+        :return: a dict of the number of hits and misses of the header cache, or None if it hasn't been used
+        """
+        if cls._header_cache is None:
+            return None
+        return cls._header_cache.get_stats()
+
+    @classmethod
+    def _extract_irods_header_with_timeout(cls, fpath, timeout):
+        """
+        Streams the header of a file from iRODS with samtools, killing samtools if it runs for longer than timeout.
+        IrodsSamFileHeaderExtractor has no timeout, so this is used instead of it only when a timeout is given.
+        :param fpath: the iRODS path of the file
+        :param timeout: the maximum number of seconds samtools is allowed to run for
+        :return: the header as text
+        :raises subprocess.TimeoutExpired: if samtools ran for longer than timeout
+        :raises IOError: if samtools failed to read the header
+        """
+        process = subprocess.run([config.SAMTOOLS_IRODS_PATH, 'view', '-H', 'irods:' + fpath],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=timeout)
+        if process.returncode != 0:
+            raise IOError("samtools couldn't read the header of %s: %s" %
+                          (fpath, process.stderr.decode('utf-8', 'replace').strip()))
+        return process.stdout.decode('utf-8')
+
+    @classmethod
+    def fetch_metadata(cls, fpath, irods=False, timeout=None, checksums=None):
+        """
+        :param fpath: the path of the file
+        :param irods: True if the file is in iRODS, False if it is on lustre
+        :param timeout: the maximum number of seconds for fetching the header of a file in iRODS, or None for no limit
+        :param checksums: the checksums of the replicas of a file in iRODS - if given, the header is looked up
+                          in the header cache first, and cached once fetched
+        :return: SAMFileHeaderMetadata
+        """
+        header_cache = cls._get_header_cache() if irods and checksums else None
+        if header_cache is not None:
+            header_metadata = header_cache.get(fpath, checksums)
+            if header_metadata is not None:
+                return header_metadata
+        header_metadata = cls._fetch_metadata(fpath, irods, timeout)
+        if header_cache is not None:
+            header_cache.put(fpath, checksums, header_metadata)
+        return header_metadata
 
     @classmethod
-    def fetch_metadata(cls, fpath, irods=False):
-        if irods:
+    def _fetch_metadata(cls, fpath, irods, timeout):
+        if irods and timeout:
+            header_as_text = cls._extract_irods_header_with_timeout(fpath, timeout)
+        elif irods:
             header_as_text = IrodsSamFileHeaderExtractor.extract(fpath)
         else:
             header_as_text = LustreSamFileHeaderExtractor.extract(fpath)
@@ -75,6 +75,7 @@ class SAMFileHeaderMetadata(ComparableMetadata):
         for id_type, values in self.libraries.items():
             fixed_values = self._filter_out_invalid_ids(values)
             self.libraries[id_type] = fixed_values
+        self.invalidate_id_index()
         return
 
     def __str__(self):
@@ -0,0 +1,86 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Header metadata cache
+=====================
+
+The content of a file in iRODS doesn't change as long as its replica checksum stays the same, so the header
+metadata parsed from a file is cached on disk, together with the checksums of the file's replicas.
+A cached header is only used if the file has the same checksums as when it was cached - otherwise it is fetched
+again and replaces the cached one. The least recently used headers are evicted when the cache is full.
+"""
+
+import threading
+
+from mcheck.com.cache import SQLiteCache, MISSING
+
+
+class HeaderMetadataCache:
+
+    def __init__(self, path, max_size):
+        """
+        :param path: the path of the SQLite file
+        :param max_size: the maximum number of headers cached
+        """
+        self._cache = SQLiteCache(path, max_size)
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _build_key(fpath):
+        return 'header', fpath
+
+    @staticmethod
+    def _normalize_checksums(checksums):
+        if isinstance(checksums, str):
+            checksums = [checksums]
+        return tuple(sorted(str(checksum) for checksum in checksums))
+
+    def get(self, fpath, checksums):
+        """
+        :param fpath: the iRODS path of the file
+        :param checksums: the checksums of the file's replicas
+        :return: the SAMFileHeaderMetadata cached for this file, or None if it isn't cached for these checksums
+        """
+        cached = self._cache.get(self._build_key(fpath))
+        if cached is not MISSING:
+            cached_checksums, header_metadata = cached
+            if cached_checksums == self._normalize_checksums(checksums):
+                with self._stats_lock:
+                    self.hits += 1
+                return header_metadata
+        with self._stats_lock:
+            self.misses += 1
+        return None
+
+    def put(self, fpath, checksums, header_metadata):
+        """
+        :param fpath: the iRODS path of the file
+        :param checksums: the checksums of the file's replicas
+        :param header_metadata: SAMFileHeaderMetadata, as parsed from the header - before being checked and fixed
+        """
+        self._cache.put(self._build_key(fpath), (self._normalize_checksums(checksums), header_metadata))
+
+    def get_stats(self):
+        """
+        :return: a dict of the number of hits and misses
+        """
+        return {'hits': self.hits, 'misses': self.misses}
@@ -19,9 +19,8 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 30, 2015.
 """
 
-import re
-
 import mcheck.metadata.irods_metadata.constants as irods_consts
+from mcheck.metadata.irods_metadata.field_validators import IrodsFieldValidators
 from mcheck.results.checks_results import CheckResult
 from mcheck.results.constants import SEVERITY, RESULT
 from mcheck.check_names import CHECK_NAMES
@@ -61,32 +60,22 @@ class IrodsACL:
         return self.access_group.startswith(irods_consts.IrodsGroups.PUBLIC.value)
 
     def provides_access_for_ss_group(self):
-        r = re.compile(irods_consts.IrodsGroups.SS_GROUP_REGEX.value)
-        if r.match(self.access_group):
-            return True
-        return False
+        return IrodsFieldValidators.is_ss_group(self.access_group)
 
     def provides_read_permission(self):
-        return irods_consts.IrodsPermission(self.permission) == irods_consts.IrodsPermission.READ
+        return IrodsFieldValidators.get_permission(self.permission) == irods_consts.IrodsPermission.READ
 
     def provides_write_permission(self):
-        return irods_consts.IrodsPermission(self.permission) == irods_consts.IrodsPermission.WRITE
+        return IrodsFieldValidators.get_permission(self.permission) == irods_consts.IrodsPermission.WRITE
 
     def provides_own_permission(self):
-        return irods_consts.IrodsPermission(self.permission) == irods_consts.IrodsPermission.OWN
+        return IrodsFieldValidators.get_permission(self.permission) == irods_consts.IrodsPermission.OWN
 
     @staticmethod
     def _is_permission_valid(permission: str):
         # if permission and not type(permission) in [enum, str]:
         #     raise TypeError("This permission is not a string, it is a %s" % str(type(permission)))
-        try:
-            irods_consts.IrodsPermission(permission)
-        except KeyError:
-            raise TypeError("This permission is not correct: " + str(permission))
-        except ValueError:
-            return False
-        else:
-            return True
+        return IrodsFieldValidators.is_permission_valid(permission)
 
     @staticmethod
     def _is_irods_zone_valid(zone):
@@ -95,12 +84,7 @@ class IrodsACL:
             return True
         if zone and not type(zone) is str:
             raise TypeError("This zone is not a string, it is a: %s " % str(type(zone)))
-        try:
-            irods_consts.IrodsZones(zone)
-        except ValueError:
-            return False
-        else:
-            return True
+        return IrodsFieldValidators.is_zone_valid(zone)
 
     def validate_fields(self):
         check_results = []
@@ -0,0 +1,133 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Attribute frequency profiles
+============================
+
+An attribute frequency profile gives how many times each iRODS attribute should appear in the metadata of a file,
+and is read from a config file with a line of "attribute frequency" for each attribute.
+This module parses each config file once and keeps the parsed profile in memory, so that checking the attributes
+of a file is a comparison of dicts. The config file is parsed again only when its mtime changes - which is
+looked at no more often than every MTIME_CHECK_INTERVAL seconds.
+The profile of a file is chosen by its target, else by its file type, as set in config.py.
+"""
+
+import os
+import threading
+import time
+
+import config
+
+
+class AttributeFrequencyProfiles:
+    CONF_FILES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'conf_files')
+    GENERAL_PROFILE = 'general'
+    BUILT_IN_PROFILE_PATHS = {
+        'general': os.path.join(CONF_FILES_DIR, 'general.conf'),
+        'library_cram': os.path.join(CONF_FILES_DIR, 'library_cram.conf'),
+    }
+    MTIME_CHECK_INTERVAL = 1
+
+    # key = config file path, value = (mtime, time of the last mtime check, dict of attribute frequencies)
+    _parsed_profiles = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def parse_config_file(path):
+        """
+        :param path: the path of a config file, with a line of "attribute frequency" for each attribute
+        :return: dict of key = attribute, value = the number of times it should appear
+        :raises ValueError: if a line doesn't have 2 items, or the frequency isn't an integer
+        """
+        attributes_frequency = {}
+        with open(path) as config_file:
+            for line in config_file:
+                line = line.strip()
+                tokens = line.split()
+                if len(tokens) != 2:
+                    raise ValueError(
+                        "Non standard config file - each line must have 2 items. This line looks like:" + str(line))
+                attribute = tokens[0]
+                if not tokens[1].isdigit():
+                    raise ValueError("The config file doesn't contain integers as frequencies" + str(line))
+                attributes_frequency[attribute] = int(tokens[1])
+        return attributes_frequency
+
+    @classmethod
+    def get_frequencies(cls, path):
+        """
+        :param path: the path of a config file
+        :return: dict of key = attribute, value = the number of times it should appear, as parsed from the file
+                 the last time it changed. The dict is shared, and shouldn't be modified.
+        """
+        now = time.monotonic()
+        parsed = cls._parsed_profiles.get(path)
+        if parsed is not None and now - parsed[1] < cls.MTIME_CHECK_INTERVAL:
+            return parsed[2]
+        with cls._lock:
+            mtime = os.stat(path).st_mtime
+            parsed = cls._parsed_profiles.get(path)
+            if parsed is not None and parsed[0] == mtime:
+                frequencies = parsed[2]
+            else:
+                frequencies = cls.parse_config_file(path)
+            cls._parsed_profiles[path] = (mtime, now, frequencies)
+        return frequencies
+
+    @classmethod
+    def get_profile_path(cls, profile):
+        """
+        :param profile: the name of a profile, built in or given in config.ATTRIBUTE_FREQUENCY_PROFILE_PATHS
+        :return: the path of its config file
+        :raises ValueError: if there is no profile with this name
+        """
+        path = config.ATTRIBUTE_FREQUENCY_PROFILE_PATHS.get(profile) or cls.BUILT_IN_PROFILE_PATHS.get(profile)
+        if not path:
+            raise ValueError("There is no attribute frequency profile called %s" % profile)
+        return path
+
+    @classmethod
+    def choose_profile(cls, avus, fpath=None):
+        """
+        Chooses the profile of a file: the one for its target if there is one, else the one for its file type,
+        else the general profile.
+        :param avus: dict of key = attribute, value = the values of the attribute for the file
+        :param fpath: the path of the file, or None if the file type isn't known
+        :return: the name of the profile
+        """
+        targets = avus.get('target') if avus else None
+        if targets and len(targets) == 1:
+            target = str(next(iter(targets)))
+            if target in config.ATTRIBUTE_FREQUENCY_PROFILES_BY_TARGET:
+                return config.ATTRIBUTE_FREQUENCY_PROFILES_BY_TARGET[target]
+        if fpath:
+            file_type = os.path.splitext(fpath)[1].lstrip('.')
+            if file_type in config.ATTRIBUTE_FREQUENCY_PROFILES_BY_FILE_TYPE:
+                return config.ATTRIBUTE_FREQUENCY_PROFILES_BY_FILE_TYPE[file_type]
+        return cls.GENERAL_PROFILE
+
+    @classmethod
+    def get_frequencies_for_file(cls, avus, fpath=None):
+        """
+        :param avus: dict of key = attribute, value = the values of the attribute for the file
+        :param fpath: the path of the file, or None if the file type isn't known
+        :return: dict of key = attribute, value = the number of times it should appear in the metadata of the file
+        """
+        return cls.get_frequencies(cls.get_profile_path(cls.choose_profile(avus, fpath)))
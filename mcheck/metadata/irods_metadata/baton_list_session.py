@@ -0,0 +1,232 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Baton list session
+==================
+
+This module keeps one baton-list process running and sends it the requests for many data objects,
+instead of starting a new baton process (and authenticating to iRODS) for every file.
+baton-list reads a stream of json objects on stdin and writes a json object on stdout for each of them,
+in the same order - either the data object, or the request with an "error" field if it couldn't be listed.
+The end of each json object in the output is found by scanning each character once, as it is read,
+so that a reply of several MB split across many reads is decoded only once it is complete.
+"""
+
+import codecs
+import json
+import os
+import re
+import subprocess
+import threading
+from collections import deque
+
+
+class _JsonObjectSplitter:
+    """
+    This class splits a stream of json objects (or arrays) into the text of each object, finding where each object
+    ends by tracking the nesting depth and the strings, without decoding it.
+    """
+    _TOKENS = re.compile(r'[\[\]{}"]')
+    # The rest of a string, up to its closing quote, the end of the chunk, or a backslash ending the chunk:
+    _STRING_CONTENT = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+    _NON_WHITESPACE = re.compile(r'\S')
+
+    def __init__(self):
+        self._parts = []
+        self._chunk = ''
+        self._position = 0
+        self._object_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text):
+        """
+        :param text: the next chunk of the stream - to be given only after next_object has returned None
+        """
+        self._chunk = text
+        self._position = 0
+        self._object_start = 0
+
+    def _keep_rest_of_chunk(self):
+        if self._depth:
+            self._parts.append(self._chunk[self._object_start:])
+        self._chunk = ''
+        self._position = 0
+        return None
+
+    def next_object(self):
+        """
+        :return: the text of the next complete json object, or None if more of the stream is needed
+        :raises ValueError: if the stream contains something else than json objects or arrays
+        """
+        chunk = self._chunk
+        while True:
+            if self._escaped:
+                if self._position >= len(chunk):
+                    return self._keep_rest_of_chunk()
+                self._position += 1
+                self._escaped = False
+            if not self._depth:
+                match = self._NON_WHITESPACE.search(chunk, self._position)
+                if match is None:
+                    return self._keep_rest_of_chunk()
+                if match.group() not in '{[':
+                    raise ValueError("Expected a json object, found: %s" % chunk[match.start():match.start() + 100])
+                self._object_start = match.start()
+                self._position = match.end()
+                self._depth = 1
+                continue
+            if self._in_string:
+                self._position = self._STRING_CONTENT.match(chunk, self._position).end()
+                if self._position >= len(chunk):
+                    return self._keep_rest_of_chunk()
+                if chunk[self._position] == '"':
+                    self._in_string = False
+                else:
+                    self._escaped = True
+                self._position += 1
+                continue
+            match = self._TOKENS.search(chunk, self._position)
+            if match is None:
+                return self._keep_rest_of_chunk()
+            token = match.group()
+            self._position = match.end()
+            if token == '"':
+                self._in_string = True
+            elif token in '{[':
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if not self._depth:
+                    self._parts.append(chunk[self._object_start:self._position])
+                    json_object = ''.join(self._parts)
+                    self._parts = []
+                    return json_object
+
+
+class BatonListSession:
+    BATON_LIST_ARGS = ['--acl', '--avu', '--replicate', '--checksum', '--unbuffered']
+    READ_SIZE = 65536
+    STDERR_LINES_KEPT = 100
+
+    def __init__(self, baton_bin_dir):
+        """
+        :param baton_bin_dir: the directory containing the baton binaries
+        """
+        self.baton_list_path = os.path.join(baton_bin_dir, 'baton-list')
+        self._process = None
+        self._stdout_decoder = None
+        self._stdout_splitter = None
+        self._stderr_lines = deque(maxlen=self.STDERR_LINES_KEPT)
+        self._stderr_reader = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        self._process = subprocess.Popen([self.baton_list_path] + self.BATON_LIST_ARGS, stdin=subprocess.PIPE,
+                                         stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._stdout_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._stdout_splitter = _JsonObjectSplitter()
+        self._stderr_lines = deque(maxlen=self.STDERR_LINES_KEPT)
+        # stderr is read all the time, so that baton-list never blocks on writing its logs:
+        self._stderr_reader = threading.Thread(target=self._read_stderr, args=(self._process.stderr, self._stderr_lines),
+                                               daemon=True)
+        self._stderr_reader.start()
+
+    @staticmethod
+    def _read_stderr(stderr, stderr_lines):
+        for line in stderr:
+            stderr_lines.append(line.decode('utf-8', 'replace').strip())
+
+    def _is_running(self):
+        return self._process is not None and self._process.poll() is None
+
+    @staticmethod
+    def _build_request(fpath):
+        collection, data_object = os.path.split(fpath)
+        return {'collection': collection, 'data_object': data_object}
+
+    def _send_requests(self, fpaths):
+        try:
+            for fpath in fpaths:
+                self._process.stdin.write((json.dumps(self._build_request(fpath)) + '\n').encode('utf-8'))
+            self._process.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            # baton-list has exited - this is reported when reading its output
+            pass
+
+    def _read_json_object(self):
+        """
+        Reads from the output of baton-list the next json object, returning it as a string.
+        """
+        while True:
+            json_object = self._stdout_splitter.next_object()
+            if json_object is not None:
+                return json_object
+            data = self._process.stdout.read1(self.READ_SIZE)
+            if not data:
+                self.close()
+                error_message = ' '.join(self._stderr_lines)
+                raise RuntimeError("baton-list exited before listing all the data objects. %s" % error_message)
+            self._stdout_splitter.feed(self._stdout_decoder.decode(data))
+
+    def list_data_objects(self, fpaths):
+        """
+        Lists the data objects given by path, all through the same baton-list process.
+        :param fpaths: an iterable of iRODS file paths
+        :return: a list of tuples of (fpath, the data object as a json string or None, the error message or None),
+                 in the order of fpaths
+        """
+        fpaths = list(fpaths)
+        if not fpaths:
+            return []
+        results = []
+        with self._lock:
+            if not self._is_running():
+                self._start()
+            writer = threading.Thread(target=self._send_requests, args=(fpaths,))
+            writer.start()
+            try:
+                for fpath in fpaths:
+                    json_object = self._read_json_object()
+                    error = json.loads(json_object).get('error')
+                    if error:
+                        error_message = error.get('message', str(error)) if isinstance(error, dict) else str(error)
+                        results.append((fpath, None, error_message))
+                    else:
+                        results.append((fpath, json_object, None))
+            finally:
+                writer.join()
+        return results
+
+    def close(self):
+        """
+        Stops the baton-list process - a new one is started by the next call of list_data_objects.
+        """
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+            self._process.wait()
+            self._stderr_reader.join()
+            self._process.stdout.close()
+            self._process.stderr.close()
+            self._process = None
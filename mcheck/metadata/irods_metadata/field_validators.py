@@ -0,0 +1,105 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Field validators
+================
+
+The fields of the iRODS metadata of every file are validated against the patterns and the values
+in irods_metadata/constants.py. This module compiles all the patterns and builds the lookup tables of the permissions
+and zones once, at import time, so that validating a field is only a match of a compiled pattern
+or a lookup in a dict, instead of compiling the pattern or building the Enum value again for each file.
+"""
+
+import re
+
+from mcheck.metadata.irods_metadata import constants as irods_consts
+
+
+class IrodsFieldValidators:
+    PATTERNS = {
+        'npg_qc': re.compile(irods_consts.NPG_QC_REGEX),
+        'target': re.compile(irods_consts.TARGET_REGEX),
+        'checksum': re.compile(irods_consts.CHECKSUM_REGEX),
+        'ss_group': re.compile(irods_consts.IrodsGroups.SS_GROUP_REGEX.value),
+    }
+
+    # The permissions and zones are looked up both by Enum member and by value, the same as the Enum constructor does:
+    PERMISSIONS = dict([(permission, permission) for permission in irods_consts.IrodsPermission] +
+                       [(permission.value, permission) for permission in irods_consts.IrodsPermission])
+    ZONES = dict([(zone, zone) for zone in irods_consts.IrodsZones] +
+                 [(zone.value, zone) for zone in irods_consts.IrodsZones])
+
+    @classmethod
+    def matches(cls, field, value):
+        """
+        Checks a value against the compiled pattern of a field, the value having to be a string or a number.
+        :param field: the name of the field, one of the keys of PATTERNS
+        :param value: the value of the field
+        :return: True if the value matches the pattern of the field, False otherwise
+        """
+        if not type(value) in [str, int]:
+            return False
+        return cls.PATTERNS[field].match(str(value)) is not None
+
+    @classmethod
+    def is_npg_qc_valid(cls, npg_qc):
+        return cls.matches('npg_qc', npg_qc)
+
+    @classmethod
+    def is_target_valid(cls, target):
+        return cls.matches('target', target)
+
+    @classmethod
+    def is_ss_group(cls, access_group):
+        return cls.PATTERNS['ss_group'].match(access_group) is not None
+
+    @classmethod
+    def is_checksum_valid(cls, checksum):
+        """
+        :param checksum: str
+        :return: True if the checksum is a hexadecimal string, False otherwise
+        """
+        return cls.PATTERNS['checksum'].fullmatch(checksum) is not None
+
+    @classmethod
+    def get_permission(cls, permission):
+        """
+        :param permission: an IrodsPermission or its value
+        :return: the IrodsPermission
+        :raises ValueError: if the permission isn't an IrodsPermission nor the value of one
+        """
+        try:
+            return cls.PERMISSIONS[permission]
+        except (KeyError, TypeError):
+            raise ValueError("%r is not a valid IrodsPermission" % (permission,))
+
+    @classmethod
+    def is_permission_valid(cls, permission):
+        try:
+            return permission in cls.PERMISSIONS
+        except TypeError:
+            return False
+
+    @classmethod
+    def is_zone_valid(cls, zone):
+        try:
+            return zone in cls.ZONES
+        except TypeError:
+            return False
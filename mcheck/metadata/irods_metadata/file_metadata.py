@@ -19,7 +19,6 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Jun 23, 2015.
 """
 
-import re
 import os
 from collections import defaultdict, Iterable
 from typing import List, Dict, Union, Set
@@ -33,6 +32,8 @@ from mcheck.results.checks_results import CheckResult
 from mcheck.com import utils as common_utils
 from mcheck.results.constants import SEVERITY, RESULT
 from mcheck.metadata.irods_metadata.acl import IrodsACL
+from mcheck.metadata.irods_metadata.field_validators import IrodsFieldValidators
+from mcheck.metadata.irods_metadata.attribute_frequency_profiles import AttributeFrequencyProfiles
 from mcheck.metadata.irods_metadata.file_replica import IrodsFileReplica
 from mcheck.check_names import CHECK_NAMES
 
@@ -215,24 +216,10 @@ class IrodsRawFileMetadata(ComparableMetadata):
 
 
     class CompleteMetadataChecks:
-        GENERAL_ATTRIBUTE_FREQUENCY_CONFIG_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                                                               'conf_files/general.conf')
+        GENERAL_ATTRIBUTE_FREQUENCY_CONFIG_FILE = AttributeFrequencyProfiles.BUILT_IN_PROFILE_PATHS['general']
         @classmethod
         def read_and_parse_config_file(cls, path):
-            attributes_frequency = {}
-            config_file = open(path)
-            for line in config_file:
-                line = line.strip()
-                tokens = line.split()
-                if len(tokens) != 2:
-                    raise ValueError(
-                        "Non standard config file - each line must have 2 items. This line looks like:" + str(line))
-                attribute = tokens[0]
-                if not tokens[1].isdigit():
-                    raise ValueError("The config file doesn't contain integers as frequencies" + str(line))
-                freq = int(tokens[1])
-                attributes_frequency[attribute] = freq
-            return attributes_frequency
+            return AttributeFrequencyProfiles.parse_config_file(path)
 
 
         @classmethod
@@ -257,10 +244,19 @@ class IrodsRawFileMetadata(ComparableMetadata):
 
 
         @classmethod
-        def check_attribute_frequencies(cls, avus, config_fpath=None):
-            if not config_fpath:
-                config_fpath = cls.GENERAL_ATTRIBUTE_FREQUENCY_CONFIG_FILE
-            general_attribute_frequencies = cls.read_and_parse_config_file(config_fpath)
+        def check_attribute_frequencies(cls, avus, config_fpath=None, fpath=None):
+            """
+            Checks that each attribute appears in the avus as many times as the attribute frequency profile says.
+            :param avus: dict of key = attribute, value = the values of the attribute
+            :param config_fpath: the config file of the profile, by default the profile is chosen for the file
+                                 by AttributeFrequencyProfiles
+            :param fpath: the path of the file, for choosing the profile by file type
+            :return: CheckResult
+            """
+            if config_fpath:
+                general_attribute_frequencies = AttributeFrequencyProfiles.get_frequencies(config_fpath)
+            else:
+                general_attribute_frequencies = AttributeFrequencyProfiles.get_frequencies_for_file(avus, fpath)
             crt_attribute_frequencies = cls.build_freq_dict_from_avus_list(avus)
             attr_freq_check_result = cls.check_attributes_have_the_right_frequency(general_attribute_frequencies, crt_attribute_frequencies)
             return attr_freq_check_result
@@ -270,7 +266,7 @@ class IrodsRawFileMetadata(ComparableMetadata):
         check_results = []
         check_results.extend(self.ACLsChecks.check(self.acls))
         check_results.extend(self.ReplicasChecks.check(self.file_replicas))
-        check_results.append(self.CompleteMetadataChecks.check_attribute_frequencies(self.avus))
+        check_results.append(self.CompleteMetadataChecks.check_attribute_frequencies(self.avus, fpath=self.fpath))
         if avu_counts:
             check_results.append(self.check_attribute_count(avu_counts))
         return check_results
@@ -381,18 +377,12 @@ class IrodsSeqFileMetadata(IrodsRawFileMetadata):
 
     @staticmethod
     def _is_npg_qc_valid(npg_qc):
-        if not type(npg_qc) in [str, int]:
-            return False
-        r = re.compile(irods_consts.NPG_QC_REGEX)
-        return True if r.match(str(npg_qc)) else False
+        return IrodsFieldValidators.is_npg_qc_valid(npg_qc)
 
 
     @staticmethod
     def _is_target_valid(target):
-        if not type(target) in [str, int]:
-            return False
-        r = re.compile(irods_consts.TARGET_REGEX)
-        return True if r.match(str(target)) else False
+        return IrodsFieldValidators.is_target_valid(target)
 
 
     def check_npg_qc_field(self):
@@ -507,19 +497,6 @@ class IrodsSeqFileMetadata(IrodsRawFileMetadata):
         return check_result
 
 
-    class CompleteMetadataChecks(IrodsRawFileMetadata.CompleteMetadataChecks):
-
-        LIBRARY_ATTRIBUTE_FREQUENCY_CONFIG_FILE = os.path.join(os.path.dirname(os.path.realpath(__file__)),
-                                                               'conf_files/library_cram.conf')
-        @classmethod
-        def check_attribute_frequencies(cls, avus, config_file=None):
-            if 'target' in avus and len(avus['target']) == 1 and avus['target'] == 'library':
-                res = super().check_attribute_frequencies(avus, cls.LIBRARY_ATTRIBUTE_FREQUENCY_CONFIG_FILE)
-            else:
-                res = super().check_attribute_frequencies(avus)
-            return res
-
-
     def check_metadata(self, desired_reference: str=None) -> List[CheckResult]:
         check_results = []
         check_results.extend(super().check_metadata())
@@ -19,12 +19,9 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 30, 2015.
 """
 
-import re
-
-import mcheck.metadata.irods_metadata.constants as irods_consts
+from mcheck.metadata.irods_metadata.field_validators import IrodsFieldValidators
 from mcheck.results.checks_results import CheckResult
 from mcheck.results.constants import SEVERITY, RESULT
-from mcheck.com import utils
 from mcheck.check_names import CHECK_NAMES
 
 
@@ -55,7 +52,7 @@ class IrodsFileReplica:
             return False
         if not type(checksum) is str:
             raise TypeError("WRONG TYPE: the checksum must be a string, and is: " + str(type(checksum)))
-        return utils.is_hexadecimal_string(checksum)
+        return IrodsFieldValidators.is_checksum_valid(checksum)
 
     def validate_fields(self):
         check_results = []
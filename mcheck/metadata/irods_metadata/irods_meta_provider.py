@@ -20,14 +20,24 @@ This file has been created on Nov 16, 2015.
 """
 
 from mcheck.metadata.irods_metadata.file_metadata import IrodsRawFileMetadata
+from mcheck.metadata.irods_metadata.baton_list_session import BatonListSession
 
+import atexit
+import json
+import queue
+import sys
+import threading
 import config
 from baton.api import connect_to_irods_with_baton
 from baton.models import SearchCriterion
+from baton._baton.json import DataObjectJSONDecoder
 from typing import List, Tuple
 
 
 class iRODSMetadataProvider:
+    _idle_baton_list_sessions = queue.LifoQueue()
+    _baton_list_sessions = []
+    _baton_list_sessions_lock = threading.Lock()
 
     @classmethod
     def convert_to_irods_fields(cls, filter_by_npg_qc=None, filter_by_target=None, filter_by_file_types=None,
@@ -49,20 +59,59 @@ class iRODSMetadataProvider:
 
 
     @classmethod
-    def fetch_raw_file_metadata_by_path(cls, fpath):
+    def _list_data_objects(cls, fpaths):
+        """
+        Lists the data objects through one of the idle baton-list sessions, starting a new one if none is idle,
+        so that there are only as many baton-list processes as concurrent workers.
+        """
+        try:
+            baton_list_session = cls._idle_baton_list_sessions.get_nowait()
+        except queue.Empty:
+            baton_list_session = BatonListSession(config.BATON_BIN)
+            with cls._baton_list_sessions_lock:
+                cls._baton_list_sessions.append(baton_list_session)
+        try:
+            return baton_list_session.list_data_objects(fpaths)
+        finally:
+            cls._idle_baton_list_sessions.put(baton_list_session)
+
+    @classmethod
+    def close_baton_list_sessions(cls):
+        with cls._baton_list_sessions_lock:
+            for baton_list_session in cls._baton_list_sessions:
+                baton_list_session.close()
+
+
+    @classmethod
+    def fetch_raw_files_metadata_by_paths(cls, fpaths: List[str]) -> List[IrodsRawFileMetadata]:
+        """
+        This method fetches the metadata of the files given by path, sending all the requests to the same
+        baton-list process. The paths that can't be listed (e.g. they don't exist in iRODS) are reported on stderr,
+        without stopping the others from being fetched.
+        :param fpaths: a list of iRODS file paths
+        :return: a list of IrodsRawFileMetadata in the order of fpaths, with None for the paths that couldn't be listed
+        """
         try:
-            connection = connect_to_irods_with_baton(config.BATON_BIN)#, skip_baton_binaries_validation=True)
-            data_object = connection.data_object.get_by_path(fpath)
+            data_objects_listed = cls._list_data_objects(fpaths)
         except Exception as e:
             if str(e).find('KRB_ERROR_ACQUIRING_CREDS') != -1:
                 raise OSError("ERROR: you need to log into iRODS and aquire the KERBEROS credentials.") from None
             else:
                 raise e from None
-        else:
-            if data_object:
-                raw_metadata = IrodsRawFileMetadata.from_baton_wrapper(data_object)
-                return raw_metadata
-            return None
+        raw_metadata_objs = []
+        for fpath, data_object_as_json, error_message in data_objects_listed:
+            if data_object_as_json is None:
+                print("ERROR: couldn't fetch the iRODS metadata of %s: %s" % (fpath, error_message), file=sys.stderr)
+                raw_metadata_objs.append(None)
+            else:
+                data_object = json.loads(data_object_as_json, cls=DataObjectJSONDecoder)
+                raw_metadata_objs.append(IrodsRawFileMetadata.from_baton_wrapper(data_object))
+        return raw_metadata_objs
+
+
+    @classmethod
+    def fetch_raw_file_metadata_by_path(cls, fpath):
+        return cls.fetch_raw_files_metadata_by_paths([fpath])[0]
 
 
     @classmethod
@@ -84,3 +133,5 @@ class iRODSMetadataProvider:
         raw_meta_objects = [IrodsRawFileMetadata.from_baton_wrapper(data_obj) for data_obj in list_of_data_objs_and_metadata]
         return raw_meta_objects
 
+
+atexit.register(iRODSMetadataProvider.close_baton_list_sessions)
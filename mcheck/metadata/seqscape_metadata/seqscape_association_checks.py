@@ -0,0 +1,60 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Seqscape association checks
+===========================
+
+The checks of the sample-study associations in Seqscape compare the samples and studies of a file with all
+the samples of its studies and all the studies of its samples - thousands of entities for a large study.
+All the files of the same samples and studies get the same results, so within a run these checks are done
+once for each distinct set of samples and studies, and their results are copied to every file that has them.
+"""
+
+from mcheck.com.cache import LRUCache, MISSING
+from mcheck.results.checks_results import CheckResult
+
+
+class SeqscapeAssociationChecks:
+
+    def __init__(self, max_size):
+        """
+        :param max_size: the maximum number of sets of samples and studies whose check results are kept
+        """
+        self._check_results = LRUCache(max_size)
+
+    @staticmethod
+    def _copy_check_results(check_results):
+        return [CheckResult(check_name=check_result.check_name, executed=check_result.executed,
+                            result=check_result.result, severity=check_result.severity,
+                            error_message=check_result.error_message) for check_result in check_results]
+
+    def check_associations(self, raw_metadata):
+        """
+        Runs the association checks of the raw metadata, or reuses their results if they have already been
+        run for the same samples and studies.
+        :param raw_metadata: SeqscapeRawMetadata
+        :return: list of CheckResults
+        """
+        key = raw_metadata.get_associations_key()
+        check_results = self._check_results.get(key)
+        if check_results is MISSING:
+            check_results = raw_metadata.check_associations()
+            self._check_results.put(key, check_results)
+        return self._copy_check_results(check_results)
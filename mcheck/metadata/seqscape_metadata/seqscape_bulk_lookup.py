@@ -0,0 +1,170 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Seqscape bulk lookup
+====================
+
+This module allows looking up in Seqscape the identifiers of many files at once.
+The identifiers of all the files are registered upfront and the first time an entity is looked up by a type of id,
+all the registered ids of that type are fetched with a few bulk queries (of at most BULK_QUERY_CHUNK_SIZE ids each).
+The lookups done afterwards for each file are answered from the entities fetched in bulk - except for the ids
+that the database matched without being exactly the same string (e.g. a name in a different case), which are
+looked up again for the file, so that the results are the same as when querying Seqscape separately for each file.
+SeqscapeBulkLookup can be used in place of a Seqscape connection - any query that hasn't been fetched in bulk
+(e.g. the queries by association) is passed on to the actual connection.
+"""
+
+import threading
+from collections import defaultdict
+from operator import itemgetter
+
+
+BULK_QUERY_CHUNK_SIZE = 1000
+
+
+class _EntityBulkLookup:
+    """
+    This class answers the get_by_* queries for one type of entity (e.g. sample) from the entities fetched in bulk.
+    """
+    # the type of query (as in get_by_<query_type>) -> the entity attribute the query is done by
+    ID_ATTRIBUTES = {'name': 'name', 'id': 'internal_id', 'accession_number': 'accession_number'}
+
+    def __init__(self, entity_connection):
+        self._entity_connection = entity_connection
+        self._ids_to_fetch = defaultdict(dict)
+        self._entities_by_id = {}
+        self._lock = threading.Lock()
+
+    def add_ids(self, query_type: str, ids) -> None:
+        """
+        Registers the ids to be fetched in bulk the next time the entity is looked up by query_type.
+        :param query_type: one of the keys of ID_ATTRIBUTES
+        :param ids: an iterable of ids
+        """
+        with self._lock:
+            for id in ids:
+                self._ids_to_fetch[query_type][str(id)] = id
+            self._entities_by_id.pop(query_type, None)
+
+    def _fetch_in_bulk(self, query_type: str):
+        """
+        Fetches all the ids registered for query_type, chunk by chunk.
+        The database can match an id that isn't exactly the same string as the id of the entity found
+        (e.g. a name in a different case), so when a chunk returns such entities, its ids that got no exact match
+        can't be told apart from the ids not found - those are returned as ids to look up one file at a time.
+        :return: a tuple of (dict of key = id, value = list of (position, entity), set of ids to look up directly)
+        """
+        query = getattr(self._entity_connection, 'get_by_' + query_type)
+        id_attribute = self.ID_ATTRIBUTES[query_type]
+        ids = sorted(self._ids_to_fetch[query_type])
+        entities_by_id = defaultdict(list)
+        ids_not_matched = set()
+        position = 0
+        for chunk_start in range(0, len(ids), BULK_QUERY_CHUNK_SIZE):
+            chunk = ids[chunk_start:chunk_start + BULK_QUERY_CHUNK_SIZE]
+            entities = query([self._ids_to_fetch[query_type][id] for id in chunk])
+            if not entities:
+                continue
+            if type(entities) is not list:
+                entities = [entities]
+            chunk_ids = set(chunk)
+            some_entities_not_matched = False
+            for entity in entities:
+                entity_id = str(getattr(entity, id_attribute))
+                if entity_id in chunk_ids:
+                    entities_by_id[entity_id].append((position, entity))
+                    position += 1
+                else:
+                    some_entities_not_matched = True
+            if some_entities_not_matched:
+                ids_not_matched.update(id for id in chunk if id not in entities_by_id)
+        return entities_by_id, ids_not_matched
+
+    def _get_entities_by_id(self, query_type: str):
+        with self._lock:
+            if query_type not in self._entities_by_id:
+                self._entities_by_id[query_type] = self._fetch_in_bulk(query_type)
+            return self._entities_by_id[query_type]
+
+    def _get_by(self, query_type: str, ids):
+        ids = set(str(id) for id in ids)
+        if not ids.issubset(self._ids_to_fetch[query_type]):
+            return getattr(self._entity_connection, 'get_by_' + query_type)(list(ids))
+        entities_by_id, ids_not_matched = self._get_entities_by_id(query_type)
+        if not ids_not_matched.isdisjoint(ids):
+            return getattr(self._entity_connection, 'get_by_' + query_type)(
+                [self._ids_to_fetch[query_type][id] for id in sorted(ids)])
+        entities_found = [position_and_entity for id in ids for position_and_entity in entities_by_id.get(id, [])]
+        return [entity for _, entity in sorted(entities_found, key=itemgetter(0))]
+
+    def get_by_name(self, names):
+        return self._get_by('name', names)
+
+    def get_by_id(self, ids):
+        return self._get_by('id', ids)
+
+    def get_by_accession_number(self, accession_numbers):
+        return self._get_by('accession_number', accession_numbers)
+
+    def __getattr__(self, name):
+        return getattr(self._entity_connection, name)
+
+
+class SeqscapeBulkLookup:
+    """
+    This class wraps a Seqscape connection and answers the queries by ids from the entities fetched in bulk
+    for all the ids registered with add_ids.
+    """
+    # the type of id in the metadata -> the type of query (as in get_by_<query_type>)
+    QUERY_TYPES = {'name': 'name', 'internal_id': 'id', 'accession_number': 'accession_number'}
+
+    def __init__(self, ss_connection):
+        self._ss_connection = ss_connection
+        self.sample = _EntityBulkLookup(ss_connection.sample)
+        self.study = _EntityBulkLookup(ss_connection.study)
+        self.library = _EntityBulkLookup(ss_connection.library)
+        self.well = _EntityBulkLookup(ss_connection.well)
+        self.multiplexed_library = _EntityBulkLookup(ss_connection.multiplexed_library)
+
+    @classmethod
+    def _add_ids_by_id_type(cls, entity_lookups, ids_by_id_type) -> None:
+        if not ids_by_id_type:
+            return
+        for id_type, ids in ids_by_id_type.items():
+            query_type = cls.QUERY_TYPES.get(id_type)
+            if query_type and ids:
+                for entity_lookup in entity_lookups:
+                    entity_lookup.add_ids(query_type, ids)
+
+    def add_ids(self, samples, libraries, studies) -> None:
+        """
+        Registers the ids of a file, to be fetched in bulk together with the ids of all the other files.
+        :param samples: a dict containing: key = name of the identifier type, value = set of identifier values
+        :param libraries: same
+        :param studies: same
+        """
+        self._add_ids_by_id_type([self.sample], samples)
+        self._add_ids_by_id_type([self.study], studies)
+        self._add_ids_by_id_type([self.library], libraries)
+        # The library ids can also be well or multiplexed library ids, each of them is looked up as such if not found as a library:
+        self._add_ids_by_id_type([self.well, self.multiplexed_library], {'internal_id': (libraries or {}).get('internal_id')})
+
+    def __getattr__(self, name):
+        return getattr(self._ss_connection, name)
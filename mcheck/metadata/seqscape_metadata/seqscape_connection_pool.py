@@ -0,0 +1,148 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Seqscape connection pool
+========================
+
+This module keeps the connections to Seqscape open and reuses them across files.
+At most size connections are open at any one time, each of them used by one worker at a time.
+A connection that has been idle for a while is checked with a cheap query before being reused, and
+if a query fails because of the connection, the connection is closed and the query is run once more on a new one.
+Any other error of a query is raised as it is, and the connection is reused.
+"""
+
+import queue
+import threading
+import time
+
+try:
+    # sqlalchemy is installed with the sequencescape package, it wraps the errors of the database driver:
+    from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+    CONNECTION_ERRORS = (ConnectionError, DisconnectionError, InterfaceError, OperationalError)
+except ImportError:
+    CONNECTION_ERRORS = (ConnectionError,)
+
+
+# The internal id used for checking a connection - the query is cheap whether or not a study has this id:
+HEALTH_CHECK_STUDY_ID = '0'
+
+# Returned by run_if_available when all the connections are in use:
+NO_CONNECTION_AVAILABLE = object()
+
+
+class SeqscapeConnectionPool:
+
+    def __init__(self, connect, size, health_check_after=0):
+        """
+        :param connect: a function returning a new connection to Seqscape
+        :param size: the maximum number of connections open at any one time
+        :param health_check_after: the number of seconds after which an idle connection is checked before being reused
+        """
+        if size < 1:
+            raise ValueError("The size of the connection pool must be at least 1, and it is: %s" % size)
+        self._connect = connect
+        self.size = size
+        self.health_check_after = health_check_after
+        self._idle_connections = queue.LifoQueue()
+        self._connection_slots = threading.BoundedSemaphore(size)
+
+    @staticmethod
+    def _is_healthy(connection):
+        try:
+            connection.study.get_by_id([HEALTH_CHECK_STUDY_ID])
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close(connection):
+        """
+        Closes a connection that is dropped from the pool, if it can be closed - errors are ignored,
+        as the connection is usually broken already.
+        """
+        close = getattr(connection, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _release(self, connection):
+        self._idle_connections.put((connection, time.monotonic()))
+
+    def _get_idle_connection(self):
+        while True:
+            try:
+                connection, last_used = self._idle_connections.get_nowait()
+            except queue.Empty:
+                return None
+            if time.monotonic() - last_used < self.health_check_after or self._is_healthy(connection):
+                return connection
+            self._close(connection)
+
+    def _run_with_connection(self, connection, function, args, kwargs):
+        try:
+            return function(connection, *args, **kwargs)
+        except CONNECTION_ERRORS:
+            self._close(connection)
+            raise
+        except Exception:
+            # The function failed on its own, the connection can still be used:
+            self._release(connection)
+            raise
+
+    def _run(self, function, args, kwargs):
+        connection = self._get_idle_connection()
+        if connection is None:
+            connection = self._connect()
+        try:
+            result = self._run_with_connection(connection, function, args, kwargs)
+        except CONNECTION_ERRORS:
+            connection = self._connect()
+            result = self._run_with_connection(connection, function, args, kwargs)
+        self._release(connection)
+        return result
+
+    def run(self, function, *args, **kwargs):
+        """
+        Runs the function given as parameter with a connection from the pool, waiting for one if all are in use.
+        If the function fails because of the connection, the connection is closed and the function is run
+        once more, with a new connection. Any other error of the function is raised as it is.
+        :param function: a function taking a Seqscape connection as first parameter
+        :param args: the other parameters of the function
+        :return: whatever the function returns
+        """
+        with self._connection_slots:
+            return self._run(function, args, kwargs)
+
+    def run_if_available(self, function, *args, **kwargs):
+        """
+        Runs the function given as parameter as run does, but only if a connection of the pool is free,
+        without waiting for one otherwise - so it can be called while holding a connection of the pool.
+        :param function: a function taking a Seqscape connection as first parameter
+        :param args: the other parameters of the function
+        :return: whatever the function returns, or NO_CONNECTION_AVAILABLE if all the connections are in use
+        """
+        if not self._connection_slots.acquire(blocking=False):
+            return NO_CONNECTION_AVAILABLE
+        try:
+            return self._run(function, args, kwargs)
+        finally:
+            self._connection_slots.release()
@@ -0,0 +1,109 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Seqscape entity cache
+=====================
+
+This module puts a cache in front of the Seqscape queries by ids. The entities found for each id are cached
+under the key (entity type, id type, id value) - including when no entity is found for that id, and only the ids
+that aren't cached are queried from Seqscape.
+The database can match an id that isn't exactly the same string as the id of the entity found (e.g. a name
+in a different case), so when a query returns such entities, its ids that got no exact match aren't cached
+as not found - they are queried again the next time.
+SeqscapeCachingLookup can be used in place of a Seqscape connection - any query that isn't by ids
+(e.g. the queries by association) is passed on to the actual connection.
+"""
+
+from collections import defaultdict
+
+from mcheck.com.cache import MISSING
+
+
+class _EntityCachingLookup:
+    """
+    This class answers the get_by_* queries for one type of entity (e.g. sample) from the cache,
+    querying Seqscape only for the ids that aren't cached.
+    """
+    # the type of query (as in get_by_<query_type>) -> the entity attribute the query is done by
+    ID_ATTRIBUTES = {'name': 'name', 'id': 'internal_id', 'accession_number': 'accession_number'}
+
+    def __init__(self, entity_type, entity_connection, cache):
+        self._entity_type = entity_type
+        self._entity_connection = entity_connection
+        self._cache = cache
+
+    def _get_by(self, query_type: str, ids):
+        entities = []
+        ids_not_cached = []
+        for id in ids:
+            cached_entities = self._cache.get((self._entity_type, query_type, str(id)))
+            if cached_entities is MISSING:
+                ids_not_cached.append(id)
+            else:
+                entities.extend(cached_entities)
+        if ids_not_cached:
+            entities_fetched = getattr(self._entity_connection, 'get_by_' + query_type)(ids_not_cached)
+            if entities_fetched and type(entities_fetched) is not list:
+                entities_fetched = [entities_fetched]
+            ids_queried = set(str(id) for id in ids_not_cached)
+            entities_by_id = defaultdict(list)
+            some_entities_not_matched = False
+            for entity in entities_fetched or []:
+                entity_id = str(getattr(entity, self.ID_ATTRIBUTES[query_type]))
+                if entity_id in ids_queried:
+                    entities_by_id[entity_id].append(entity)
+                else:
+                    some_entities_not_matched = True
+            self._cache.put_many(((self._entity_type, query_type, id), entities_by_id.get(id, []))
+                                 for id in ids_queried
+                                 if id in entities_by_id or not some_entities_not_matched)
+            entities.extend(entities_fetched or [])
+        return entities
+
+    def get_by_name(self, names):
+        return self._get_by('name', names)
+
+    def get_by_id(self, ids):
+        return self._get_by('id', ids)
+
+    def get_by_accession_number(self, accession_numbers):
+        return self._get_by('accession_number', accession_numbers)
+
+    def __getattr__(self, name):
+        return getattr(self._entity_connection, name)
+
+
+class SeqscapeCachingLookup:
+    """
+    This class wraps a Seqscape connection and answers the queries by ids from the cache given as parameter.
+    """
+    ENTITY_TYPES = ['sample', 'study', 'library', 'well', 'multiplexed_library']
+
+    def __init__(self, ss_connection, cache):
+        """
+        :param ss_connection: the connection to Seqscape
+        :param cache: a cache of key = (entity type, id type, id value), value = list of entities - e.g. TieredCache
+        """
+        self._ss_connection = ss_connection
+        for entity_type in self.ENTITY_TYPES:
+            setattr(self, entity_type, _EntityCachingLookup(entity_type, getattr(ss_connection, entity_type), cache))
+
+    def __getattr__(self, name):
+        return getattr(self._ss_connection, name)
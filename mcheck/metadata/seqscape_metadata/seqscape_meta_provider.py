@@ -19,17 +19,105 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 16, 2015.
 """
 
+import threading
 import typing
+from concurrent.futures import ThreadPoolExecutor
 from sequencescape import connect_to_sequencescape, Sample, Study, Library
 from mcheck.metadata.seqscape_metadata.seqscape_metadata import SeqscapeRawMetadata, SeqscapeEntityQueryAndResults
+from mcheck.metadata.seqscape_metadata.seqscape_bulk_lookup import SeqscapeBulkLookup
+from mcheck.metadata.seqscape_metadata.seqscape_connection_pool import SeqscapeConnectionPool, NO_CONNECTION_AVAILABLE
+from mcheck.metadata.seqscape_metadata.seqscape_entity_cache import SeqscapeCachingLookup
+from mcheck.com.cache import LRUCache, SQLiteCache, TieredCache, MISSING
 import config
 
 
 class SeqscapeRawMetadataProvider:
+    _connection_pool = None
+    _connection_pool_lock = threading.Lock()
+    _lookup_executor = None
+    _lookup_executor_lock = threading.Lock()
+    _entity_cache = None
+    _entity_cache_lock = threading.Lock()
+    _association_cache = None
+    _association_cache_lock = threading.Lock()
+
     @classmethod
     def _get_connection(cls, host, port, db_name, user):
         return connect_to_sequencescape("mysql://" + user + ":@" + host + ":" + str(port) + "/" + db_name)
 
+    @classmethod
+    def _get_connection_pool(cls) -> SeqscapeConnectionPool:
+        """
+        Returns the pool of connections to Seqscape shared by all the workers of this process, creating it if needed.
+        """
+        with cls._connection_pool_lock:
+            if cls._connection_pool is None:
+                cls._connection_pool = SeqscapeConnectionPool(lambda: cls._get_connection(config.SEQSC_HOST,
+                                                                                          config.SEQSC_PORT,
+                                                                                          config.SEQSC_DB_NAME,
+                                                                                          config.SEQSC_USER),
+                                                              config.SEQSC_CONNECTION_POOL_SIZE,
+                                                              config.SEQSC_CONNECTION_HEALTH_CHECK_AFTER)
+            return cls._connection_pool
+
+    @classmethod
+    def _get_lookup_executor(cls) -> ThreadPoolExecutor:
+        """
+        Returns the threads running the lookups done at the same time as the ones of a worker, on other
+        connections of the pool - shared by all the workers of this process, created if needed.
+        """
+        with cls._lookup_executor_lock:
+            if cls._lookup_executor is None:
+                cls._lookup_executor = ThreadPoolExecutor(config.SEQSC_CONNECTION_POOL_SIZE)
+            return cls._lookup_executor
+
+    @classmethod
+    def _get_entity_cache(cls):
+        """
+        Returns the cache of Seqscape entities shared by all the workers of this process, creating it if needed,
+        or None if caching is switched off.
+        """
+        if not config.SEQSC_CACHE_MEMORY_SIZE:
+            return None
+        with cls._entity_cache_lock:
+            if cls._entity_cache is None:
+                disk_cache = None
+                if config.SEQSC_CACHE_PATH:
+                    disk_cache = SQLiteCache(config.SEQSC_CACHE_PATH, config.SEQSC_CACHE_DISK_SIZE, config.SEQSC_CACHE_TTL)
+                cls._entity_cache = TieredCache(LRUCache(config.SEQSC_CACHE_MEMORY_SIZE, config.SEQSC_CACHE_TTL),
+                                                disk_cache)
+            return cls._entity_cache
+
+    @classmethod
+    def _get_association_cache(cls):
+        """
+        Returns the cache of the samples of studies and the studies of samples shared by all the workers
+        of this process, creating it if needed, or None if caching is switched off.
+        """
+        if not config.SEQSC_ASSOCIATION_CACHE_SIZE:
+            return None
+        with cls._association_cache_lock:
+            if cls._association_cache is None:
+                cls._association_cache = LRUCache(config.SEQSC_ASSOCIATION_CACHE_SIZE, config.SEQSC_CACHE_TTL)
+            return cls._association_cache
+
+    @classmethod
+    def _get_cached_connection(cls, ss_connection):
+        entity_cache = cls._get_entity_cache()
+        if entity_cache is None:
+            return ss_connection
+        return SeqscapeCachingLookup(ss_connection, entity_cache)
+
+    @classmethod
+    def get_entity_cache_stats(cls):
+        """
+        :return: a dict of the number of memory hits, disk hits and misses of the Seqscape entity cache,
+                 or None if nothing has been cached
+        """
+        if cls._entity_cache is None:
+            return None
+        return cls._entity_cache.get_stats()
+
     @classmethod
     def _fetch_samples(cls, ss_connection, sample_names: typing.Set[str], sample_ids: typing.Set[str],
                        sample_accession_nrs: typing.Set[str]):
@@ -121,7 +209,51 @@ class SeqscapeRawMetadataProvider:
 
 
     @classmethod
-    def _fetch_libraries(cls, ss_connection, library_names: typing.Set[str], library_ids: typing.Set[str]):
+    def _get_by_id(cls, ss_connection, entity_type: str, ids: typing.List[str]):
+        return getattr(cls._get_cached_connection(ss_connection), entity_type).get_by_id(ids)
+
+    @classmethod
+    def _fetch_libraries_by_id(cls, ss_connection, library_ids: typing.List[str], connection_pool=None) -> typing.List:
+        """
+        The library ids in iRODS can be ids of libraries, wells or multiplexed libraries. Each id is taken as
+        a library if found as such, otherwise as a well, otherwise as a multiplexed library.
+        If a connection pool is given, the ids are looked up as wells and as multiplexed libraries on other
+        connections of the pool - if any is free - at the same time as they are looked up as libraries
+        on ss_connection. Otherwise the ids not found in a table are looked up in the next one, one table at a time.
+        :param connection_pool: SeqscapeConnectionPool or None
+        :return: the list of entities found
+        """
+        entity_types = ('library', 'well', 'multiplexed_library')
+        ids_not_found = {str(library_id): library_id for library_id in library_ids}
+        lookups = {}
+        if connection_pool is not None:
+            executor = cls._get_lookup_executor()
+            for entity_type in entity_types[1:]:
+                lookups[entity_type] = executor.submit(connection_pool.run_if_available, cls._get_by_id,
+                                                       entity_type, list(ids_not_found.values()))
+        libraries = []
+        ids_found = set()
+        for entity_type in entity_types:
+            if not ids_not_found:
+                break
+            entities = lookups[entity_type].result() if entity_type in lookups else NO_CONNECTION_AVAILABLE
+            if entities is NO_CONNECTION_AVAILABLE:
+                entities = getattr(ss_connection, entity_type).get_by_id(list(ids_not_found.values()))
+            if not entities:
+                continue
+            if type(entities) is not list:
+                entities = [entities]
+            # The entities of the ids found in a previous table are left out:
+            entities = [entity for entity in entities if str(entity.internal_id) not in ids_found]
+            libraries.extend(entities)
+            for entity in entities:
+                ids_found.add(str(entity.internal_id))
+                ids_not_found.pop(str(entity.internal_id), None)
+        return libraries
+
+    @classmethod
+    def _fetch_libraries(cls, ss_connection, library_names: typing.Set[str], library_ids: typing.Set[str],
+                         connection_pool=None):
         if library_names and type(library_names) is not set:
             raise ValueError("Library_names parameter should be a list and it is a %s" % str(type(library_names)))
         if library_ids and type(library_ids) is not set:
@@ -131,12 +263,7 @@ class SeqscapeRawMetadataProvider:
         library_ids = list(library_ids)
         libraries_fetched_by_id = None
         if library_ids:
-            libraries_by_id = ss_connection.library.get_by_id(library_ids)
-            if not libraries_by_id:
-                libraries_by_id = ss_connection.well.get_by_id(library_ids)
-            if not libraries_by_id:
-                libraries_by_id = ss_connection.multiplexed_library.get_by_id(library_ids)
-
+            libraries_by_id = cls._fetch_libraries_by_id(ss_connection, library_ids, connection_pool)
             if libraries_by_id:
                 libraries_fetched_by_id = SeqscapeEntityQueryAndResults(libraries_by_id,
                                                                   query_ids=library_ids,
@@ -155,8 +282,25 @@ class SeqscapeRawMetadataProvider:
         return libraries_fetched_by_name, libraries_fetched_by_id
 
     @classmethod
-    def _fetch_samples_for_studies(cls, ss_connection, studies: typing.Set[str]):
-        studies = list(studies)
+    def _fetch_by_association(cls, query_entity_type: str, fetched_entity_type: str, entities, fetch):
+        """
+        Fetches the entities associated with the ones given, or reuses them if they have already been fetched
+        for the same entities - keyed by their internal ids.
+        :param fetch: the function doing the actual query, called with the list of entities
+        :return: SeqscapeEntityQueryAndResults or None if nothing was found
+        """
+        association_cache = cls._get_association_cache()
+        if association_cache is None:
+            return fetch(list(entities))
+        key = (query_entity_type, fetched_entity_type, frozenset(str(entity.internal_id) for entity in entities))
+        entities_fetched = association_cache.get(key)
+        if entities_fetched is MISSING:
+            entities_fetched = fetch(list(entities))
+            association_cache.put(key, entities_fetched)
+        return entities_fetched
+
+    @classmethod
+    def _query_samples_for_studies(cls, ss_connection, studies: typing.List):
         samples = ss_connection.sample.get_associated_with_study(studies)
         if samples:
             samples_fetched = SeqscapeEntityQueryAndResults(samples, query_ids=studies, query_id_type='whole study', query_entity_type='study', fetched_entity_type='sample')
@@ -164,14 +308,23 @@ class SeqscapeRawMetadataProvider:
         return None
 
     @classmethod
-    def _fetch_studies_for_samples(cls, ss_connection, samples: typing.Set[str]):
-        samples = list(samples)
+    def _query_studies_for_samples(cls, ss_connection, samples: typing.List):
         studies = ss_connection.study.get_associated_with_sample(samples)
         if studies:
             studies_fetched = SeqscapeEntityQueryAndResults(studies, query_ids=samples, query_id_type='whole sample', query_entity_type='sample', fetched_entity_type='study')
             return studies_fetched
         return None
 
+    @classmethod
+    def _fetch_samples_for_studies(cls, ss_connection, studies: typing.Set[str]):
+        return cls._fetch_by_association('study', 'sample', studies,
+                                         lambda studies: cls._query_samples_for_studies(ss_connection, studies))
+
+    @classmethod
+    def _fetch_studies_for_samples(cls, ss_connection, samples: typing.Set[str]):
+        return cls._fetch_by_association('sample', 'study', samples,
+                                         lambda samples: cls._query_studies_for_samples(ss_connection, samples))
+
     @classmethod
     def fetch_raw_metadata(cls, samples: typing.Mapping, libraries: typing.Mapping, studies: typing.Mapping) -> SeqscapeRawMetadata:
         """
@@ -181,9 +334,41 @@ class SeqscapeRawMetadataProvider:
         :param studies: same
         :return:
         """
+        connection_pool = cls._get_connection_pool()
+        return connection_pool.run(lambda ss_connection: cls._fetch_raw_metadata(cls._get_cached_connection(ss_connection),
+                                                                                 samples, libraries, studies,
+                                                                                 connection_pool))
+
+    @classmethod
+    def fetch_raw_metadata_in_batch(cls, ids_by_fpath: typing.Mapping) -> typing.Dict[str, SeqscapeRawMetadata]:
+        """
+        This method fetches the raw metadata for many files at once. The identifiers of all the files are
+        looked up with a few bulk queries for each type of entity and identifier, and the results are then
+        put together for each file - the same as fetch_raw_metadata would return for it.
+        :param ids_by_fpath: a dict of key = file path, value = a tuple of (samples, libraries, studies),
+                             each of them a dict as the parameters of fetch_raw_metadata
+        :return: a dict of key = file path, value = SeqscapeRawMetadata
+        """
+        return cls._get_connection_pool().run(cls._fetch_raw_metadata_in_batch, ids_by_fpath)
+
+    @classmethod
+    def _fetch_raw_metadata_in_batch(cls, ss_connection, ids_by_fpath: typing.Mapping) -> typing.Dict[str, SeqscapeRawMetadata]:
+        bulk_lookup = SeqscapeBulkLookup(cls._get_cached_connection(ss_connection))
+        for samples, libraries, studies in ids_by_fpath.values():
+            bulk_lookup.add_ids(samples, libraries, studies)
+        raw_metadata_by_fpath = {}
+        for fpath, (samples, libraries, studies) in ids_by_fpath.items():
+            raw_metadata_by_fpath[fpath] = cls._fetch_raw_metadata(bulk_lookup, samples, libraries, studies)
+        return raw_metadata_by_fpath
+
+    @classmethod
+    def _fetch_raw_metadata(cls, ss_connection, samples: typing.Mapping, libraries: typing.Mapping,
+                            studies: typing.Mapping, connection_pool=None) -> SeqscapeRawMetadata:
+        """
+        :param connection_pool: the SeqscapeConnectionPool that ss_connection comes from, for looking up the library
+                                ids in different tables at the same time, or None for looking them up on ss_connection
+        """
         raw_meta = SeqscapeRawMetadata()
-        ss_connection = cls._get_connection(config.SEQSC_HOST, config.SEQSC_PORT, config.SEQSC_DB_NAME,
-                                            config.SEQSC_USER)
         if samples:
             samples_fetched_by_names, samples_fetched_by_ids, samples_fetched_by_accession_nrs = \
                 cls._fetch_samples(ss_connection, samples.get('name'), samples.get('internal_id'), samples.get('accession_number'))
@@ -191,6 +376,7 @@ class SeqscapeRawMetadataProvider:
             raw_meta.add_fetched_entities(samples_fetched_by_accession_nrs)
             raw_meta.add_fetched_entities(samples_fetched_by_ids)
 
+            raw_meta.register_entity_type('sample')
             samples_set = raw_meta.get_entities_without_duplicates_by_entity_type('sample')
             studies_for_samples = cls._fetch_studies_for_samples(ss_connection, samples_set)
             raw_meta.add_fetched_entities_by_association(studies_for_samples)
@@ -203,13 +389,14 @@ class SeqscapeRawMetadataProvider:
             raw_meta.add_fetched_entities(studies_fetched_by_names)
 
             # Getting the sample-study associations:
+            raw_meta.register_entity_type('study')
             studies_set = raw_meta.get_entities_without_duplicates_by_entity_type('study')
             samples_for_study = cls._fetch_samples_for_studies(ss_connection, studies_set)
             raw_meta.add_fetched_entities_by_association(samples_for_study)
 
         if libraries:
             libraries_fetched_by_names, libraries_fetched_by_ids = \
-                cls._fetch_libraries(ss_connection, libraries.get('name'), libraries.get('internal_id'))
+                cls._fetch_libraries(ss_connection, libraries.get('name'), libraries.get('internal_id'), connection_pool)
             raw_meta.add_fetched_entities(libraries_fetched_by_names)
             raw_meta.add_fetched_entities(libraries_fetched_by_ids)
         return raw_meta
\ No newline at end of file
@@ -20,8 +20,7 @@ This file has been created on Nov 09, 2015.
 """
 
 from collections import defaultdict
-import collections
-from typing import List, Dict, Union, Set
+from typing import List, Dict, Union, Set, FrozenSet, Tuple
 
 from sequencescape import NamedModel, Sample, Study, Library
 from mcheck.results.checks_results import CheckResult
@@ -49,30 +48,65 @@ class SeqscapeEntityQueryAndResults:
         self.query_id_type = query_id_type
         self.query_entity_type = query_entity_type
         self.fetched_entity_type = fetched_entity_type
+        self._entities_fetched_set = None
+        self._entities_by_query_id = None
 
-    def _find_missing_ids(self) -> List:
-        ids_found = [str(getattr(ent, self.query_id_type)) for ent in self.entities_fetched]
-        ids_missing = list(set(self.query_ids).difference(set(ids_found)))
-        return ids_missing
+    def get_entities_fetched_as_set(self) -> FrozenSet[NamedModel]:
+        """
+        :return: the entities fetched, as a frozenset built the first time it is needed - the results of the
+                 queries by association are shared by all the files of the same samples or studies
+        """
+        if self._entities_fetched_set is None:
+            self._entities_fetched_set = frozenset(self.entities_fetched)
+        return self._entities_fetched_set
 
-    def _find_duplicated_ids(self) -> List:
-        ids_found = [str(getattr(ent, self.query_id_type)) for ent in self.entities_fetched]
-        ids_duplicated = [item for item, count in collections.Counter(ids_found).items() if count > 1]
-        return ids_duplicated
+    def _get_entities_by_query_id(self) -> Dict[str, List[NamedModel]]:
+        """
+        :return: a dict of key = id of type query_id_type (as str), value = list of the entities fetched with that id,
+                 in the order they were fetched - built the first time it is needed
+        """
+        if self._entities_by_query_id is None:
+            entities_by_query_id = defaultdict(list)
+            for entity in self.entities_fetched:
+                entities_by_query_id[str(getattr(entity, self.query_id_type))].append(entity)
+            self._entities_by_query_id = dict(entities_by_query_id)
+        return self._entities_by_query_id
+
+    def _find_missing_ids(self, entities_by_id: Dict[str, Dict[NamedModel, None]]=None) -> List:
+        """
+        :param entities_by_id: the entities of fetched_entity_type indexed by their query_id_type id, if already
+                               built by the SeqscapeRawMetadata holding these results, or None
+        :return: the ids queried that weren't found, in the order they were queried
+        """
+        if entities_by_id is None:
+            entities_by_id = self._get_entities_by_query_id()
+        return [id for id in dict.fromkeys(self.query_ids) if id not in entities_by_id]
+
+    def _find_duplicated_ids(self, entities_by_id: Dict[str, Dict[NamedModel, None]]=None) -> List:
+        """
+        :param entities_by_id: the entities of fetched_entity_type indexed by their query_id_type id, if already
+                               built by the SeqscapeRawMetadata holding these results, or None
+        :return: the ids that more than one entity was found for
+        """
+        if entities_by_id is None:
+            return [id for id, entities in self._get_entities_by_query_id().items() if len(entities) > 1]
+        return [id for id in dict.fromkeys(self.query_ids) if len(entities_by_id.get(id, ())) > 1]
 
-    def check_all_ids_were_found(self) -> List:
-        ids_missing = self._find_missing_ids()
+    def check_all_ids_were_found(self, entities_by_id: Dict[str, Dict[NamedModel, None]]=None) -> List:
+        ids_missing = self._find_missing_ids(entities_by_id)
         check_result = CheckResult(check_name=CHECK_NAMES.check_all_irods_ids_found_in_seqscape)
         if ids_missing:
             check_result.error_message="The following ids weren't found in SequencescapeDB: %s " % ids_missing
             check_result.result = RESULT.FAILURE
         return check_result
 
-    def check_no_duplicates_found(self) -> List:
+    def check_no_duplicates_found(self, entities_by_id: Dict[str, Dict[NamedModel, None]]=None) -> List:
         check_result = CheckResult(check_name=CHECK_NAMES.check_for_duplicated_ids_within_seqscape)
-        ids_dupl = self._find_duplicated_ids()
+        ids_dupl = self._find_duplicated_ids(entities_by_id)
         if ids_dupl:
-            entities_dupl = [ent for ent in self.entities_fetched if getattr(ent, self.query_id_type) in ids_dupl]
+            if entities_by_id is None:
+                entities_by_id = self._get_entities_by_query_id()
+            entities_dupl = [ent for id in ids_dupl for ent in entities_by_id[id]]
             check_result.error_message="The following ids: %s are duplicated - entities: %s" % (ids_dupl, entities_dupl)
             check_result.result = RESULT.FAILURE
         return check_result
@@ -99,17 +133,39 @@ class SeqscapeRawMetadata(object):
     """
     This class holds the metadata fetched from sequencescapeDB before being tested for sanity on its own.
     """
+    ID_TYPES = ('name', 'internal_id', 'accession_number')
 
     def __init__(self):
         """
         Constructor - initializez the internal field keeping all the entities by entity type.
         _entities_dict_by_type = { 'sample' : [SeqscapeEntitiesFetchedByIdType(), SeqscapeEntitiesFetchedByIdType(),..]}
         _entities_fetched_by_association = {('sample', 'study'): [SeqscapeEntitiesFetchedBasedOnIds(), ..]}
+        The entities are also indexed as they are added, so that they can be looked up without going
+        through all the query results:
+        _query_results_by_type = {'sample': {SeqscapeEntityQueryAndResults(): None, ..}} - without duplicates
+        _entities_by_type = {'sample': {Sample(): None, ..}} - without duplicates, in the order they were fetched
+        _entities_by_id = {('sample', 'name'): {'sam1': {Sample(): None}, ..}} - by (type, id_type, id value)
+        _entities_by_association = {('sample', 'study'): frozenset of studies} - built when first looked up
         :return:
         """
         self._entities_dict_by_type = defaultdict(list)
         self._entities_fetched_by_association = defaultdict(
             list)  # key: tuple(entity_queried_type, entity_fetched_type)
+        self._query_results_by_type = defaultdict(dict)
+        self._entities_by_type = defaultdict(dict)
+        self._entities_by_id = defaultdict(dict)
+        self._entities_by_association = {}
+
+    def _index_query_results(self, entity_type: str, query_results: SeqscapeEntityQueryAndResults) -> None:
+        self._query_results_by_type[entity_type][query_results] = None
+        entities_by_type = self._entities_by_type[entity_type]
+        entities_by_id_types = [(id_type, self._entities_by_id[(entity_type, id_type)]) for id_type in self.ID_TYPES]
+        for entity in query_results.entities_fetched:
+            entities_by_type[entity] = None
+            for id_type, entities_by_id in entities_by_id_types:
+                id_value = getattr(entity, id_type, None)
+                if id_value is not None:
+                    entities_by_id.setdefault(str(id_value), {})[entity] = None
 
     def add_fetched_entities(self, query_results: SeqscapeEntityQueryAndResults):
         """
@@ -120,11 +176,14 @@ class SeqscapeRawMetadata(object):
         if query_results:
             entity_type = query_results.fetched_entity_type
             self._entities_dict_by_type[entity_type].append(query_results)
+            self._index_query_results(entity_type, query_results)
 
     def add_all_fetched_entities(self, query_results: List[SeqscapeEntityQueryAndResults]):
         if query_results:
             entity_type = query_results[0].fetched_entity_type
             self._entities_dict_by_type[entity_type].extend(query_results)
+            for query_result in query_results:
+                self._index_query_results(entity_type, query_result)
 
     def add_fetched_entities_by_association(self, query_results: SeqscapeEntityQueryAndResults) -> None:
         """
@@ -137,21 +196,28 @@ class SeqscapeRawMetadata(object):
         if query_results:
             entity_type = (query_results.query_entity_type, query_results.fetched_entity_type)
             self._entities_fetched_by_association[entity_type].append(query_results)
+            self._entities_by_association.pop(entity_type, None)
+
+    def register_entity_type(self, entity_type: str) -> None:
+        """
+        Registers an entity type as looked up, with no query results if none were added - the entity types
+        registered are the ones checked by check_metadata, e.g. the studies are checked if they were looked up,
+        even if none was found.
+        :param entity_type: the type of entity - e.g. 'study'
+        """
+        self._entities_dict_by_type.setdefault(entity_type, [])
 
     def get_fetched_entities_by_type(self, entity_type: str):
-        return list(set(self._entities_dict_by_type[entity_type]))
+        return list(self._query_results_by_type.get(entity_type, ()))
 
     def get_entities_by_type(self, entity_type: str):
-        results = set()
-        for entities in self._entities_dict_by_type[entity_type]:
-            results = results.union(entities.entities_fetched)
-        return list(results)
-
+        return list(self._entities_by_type.get(entity_type, ()))
 
     def get_entities_without_duplicates_by_entity_type(self, entity_type: str) -> Set[NamedModel]:
-        entities_by_type = self.get_entities_by_type(entity_type)
-        all_entities = set(entities_by_type)
-        return all_entities
+        return set(self._entities_by_type.get(entity_type, ()))
+
+    def get_entities_by_id(self, entity_type: str, id_type: str, id_value) -> List[NamedModel]:
+        return list(self._entities_by_id.get((entity_type, id_type), {}).get(str(id_value), ()))
 
 
     def get_all_fetched_entity_types(self) -> List[str]:
@@ -173,6 +239,18 @@ class SeqscapeRawMetadata(object):
     def get_all_fetched_entities_by_association_by_type(self, query_entity_type, fetched_entity_type):
         return self._entities_fetched_by_association[(query_entity_type, fetched_entity_type)]
 
+    def _get_entities_by_association(self, query_entity_type: str, fetched_entity_type: str) -> FrozenSet[NamedModel]:
+        entity_type = (query_entity_type, fetched_entity_type)
+        entities = self._entities_by_association.get(entity_type)
+        if entities is None:
+            query_results = self._entities_fetched_by_association.get(entity_type, ())
+            if len(query_results) == 1:
+                entities = query_results[0].get_entities_fetched_as_set()
+            else:
+                entities = frozenset().union(*[query_result.get_entities_fetched_as_set() for query_result in query_results])
+            self._entities_by_association[entity_type] = entities
+        return entities
+
     def get_all_entities_by_association_by_type(self, query_entity_type: str, fetched_entity_type:str) -> List[
         SeqscapeEntityQueryAndResults]:
         """
@@ -181,11 +259,7 @@ class SeqscapeRawMetadata(object):
         :param fetched_entity_type:
         :return:
         """
-        query_results = self._entities_fetched_by_association[(query_entity_type, fetched_entity_type)]
-        res = []
-        for v in query_results:
-            res.extend(v.entities_fetched)
-        return res
+        return list(self._get_entities_by_association(query_entity_type, fetched_entity_type))
 
 
     @classmethod
@@ -195,12 +269,13 @@ class SeqscapeRawMetadata(object):
         for i in range(1, len(query_results)):
             entities_1 = query_results[i - 1]
             entities_2 = query_results[i]
-            if not (set(entities_1.entities_fetched).issubset(set(entities_2.entities_fetched)) or
-                        set(entities_2.entities_fetched).issubset(set(entities_1.entities_fetched))):
+            entities_set_1 = entities_1.get_entities_fetched_as_set()
+            entities_set_2 = entities_2.get_entities_fetched_as_set()
+            if not (entities_set_1.issubset(entities_set_2) or entities_set_2.issubset(entities_set_1)):
                 id_type_1 = entities_1.query_id_type
                 id_type_2 = entities_2.query_id_type
-                diff_1 = set(entities_1.entities_fetched).difference(set(entities_2.entities_fetched))
-                diff_2 = set(entities_2.entities_fetched).difference(set(entities_1.entities_fetched))
+                diff_1 = entities_set_1.difference(entities_set_2)
+                diff_2 = entities_set_2.difference(entities_set_1)
                 error_message = ""
                 if diff_1:
                     error_message = "Extra %s found when querying by %s compared to %s: %s." % (
@@ -216,11 +291,22 @@ class SeqscapeRawMetadata(object):
         return check_result
 
     @classmethod
-    def _check_entities_fetched(cls, query_results: List[SeqscapeEntityQueryAndResults]) -> None:
+    def _check_entities_fetched(cls, query_results: List[SeqscapeEntityQueryAndResults],
+                                entities_by_id: Dict[Tuple[str, str], Dict[str, Dict[NamedModel, None]]]=None) -> None:
+        """
+        :param query_results: the query results to check for missing and duplicated ids
+        :param entities_by_id: the index of the entities by (type, id_type) and id value, or None
+                               for each query result to index its own entities
+        :return: list of CheckResults
+        """
         problems = []
         for entity_fetched in query_results:
-            problems.append(entity_fetched.check_all_ids_were_found())
-            problems.append(entity_fetched.check_no_duplicates_found())
+            entities_by_query_id = None
+            if entities_by_id is not None and entity_fetched.query_id_type in cls.ID_TYPES:
+                entities_by_query_id = entities_by_id.get((entity_fetched.fetched_entity_type,
+                                                           entity_fetched.query_id_type), {})
+            problems.append(entity_fetched.check_all_ids_were_found(entities_by_query_id))
+            problems.append(entity_fetched.check_no_duplicates_found(entities_by_query_id))
         return problems
 
     def check_studies_fetched_by_samples(self):
@@ -235,8 +321,8 @@ class SeqscapeRawMetadata(object):
             # check_results.append(check_for_samples_in_more_studies)
             check_results.append(same_study_for_samples_check)
             return check_results
-        studies_by_samples_set = set(self.get_all_entities_by_association_by_type('sample', 'study'))
-        studies_set = set(self.get_entities_by_type('study'))
+        studies_by_samples_set = self._get_entities_by_association('sample', 'study')
+        studies_set = self.get_entities_without_duplicates_by_entity_type('study')
 
         studies_set_names = [study.name for study in studies_set]
         studies_by_samples_set_names = [study.name for study in studies_by_samples_set]
@@ -274,8 +360,8 @@ class SeqscapeRawMetadata(object):
             check_result.executed = False
             check_result.result = None
             return check_result
-        samples_by_studies_set = set(self.get_all_entities_by_association_by_type('study', 'sample'))
-        samples_set = set(self.get_entities_by_type('sample'))
+        samples_by_studies_set = self._get_entities_by_association('study', 'sample')
+        samples_set = self.get_entities_without_duplicates_by_entity_type('sample')
         if not samples_set.issubset(samples_by_studies_set):
             diff_samples_wrong_study = samples_set.difference(samples_by_studies_set)
             error_msg = "Some samples don't appear under study(s): %s in Sequencescape, " \
@@ -288,20 +374,41 @@ class SeqscapeRawMetadata(object):
         return check_result
 
 
-    def check_metadata(self) -> List:
+    def check_associations(self) -> List:
+        """
+        Checks the samples and studies against the studies of the samples and the samples of the studies in Seqscape.
+        :return: list of CheckResults
+        """
+        check_results = self.check_studies_fetched_by_samples()
+        check_results.append(self.check_samples_fetched_by_studies())
+        return check_results
+
+    def get_associations_key(self):
+        """
+        The entities associated with the samples and studies are fetched by the samples and studies themselves,
+        so the results of check_associations only depend on them.
+        :return: a hashable key for the samples and studies of this metadata - their internal ids
+        """
+        return frozenset(self._entities_by_id.get(('sample', 'internal_id'), ())), \
+               frozenset(self._entities_by_id.get(('study', 'internal_id'), ()))
+
+    def check_metadata(self, association_checks=None) -> List:
         """
         Checks the raw metadata and throws exceptions if any problem is found
-        :param raw_metadata:
+        :param association_checks: SeqscapeAssociationChecks for reusing the results of the association checks
+                                   of other files with the same samples and studies, or None
         :return:
         """
         check_results = []
         entity_types = self.get_all_fetched_entity_types()
         for ent_type in entity_types:
             entities_fetched = self.get_fetched_entities_by_type(ent_type)
-            check_results.extend(self._check_entities_fetched(entities_fetched))
+            check_results.extend(self._check_entities_fetched(entities_fetched, self._entities_by_id))
             check_results.append(self._check_by_comparison_entities_fetched_by_different_id_types(entities_fetched))
-        check_results.extend(self.check_studies_fetched_by_samples())
-        check_results.append(self.check_samples_fetched_by_studies())
+        if association_checks is None:
+            check_results.extend(self.check_associations())
+        else:
+            check_results.extend(association_checks.check_associations(self))
         return check_results
 
 
@@ -399,6 +506,7 @@ class SeqscapeMetadata(ComparableMetadata):
         :return:
         """
         self._samples = samples
+        self.invalidate_id_index()
 
     def get_sample_ids_by_id_type(self, id_type: str):
         return self._group_entity_ids_by_id_type(self._samples).get(id_type)
@@ -417,6 +525,7 @@ class SeqscapeMetadata(ComparableMetadata):
 
     def set_library_objects(self, libraries):
         self._libraries = libraries
+        self.invalidate_id_index()
 
     def get_library_ids_by_id_type(self, id_type: str) -> List:
         return self._group_entity_ids_by_id_type(self._libraries).get(id_type)
@@ -435,9 +544,7 @@ class SeqscapeMetadata(ComparableMetadata):
 
     def set_study_objects(self, studies):
         self._studies = studies
-
-    def set_study_objects(self, studies):
-        self._studies = studies
+        self.invalidate_id_index()
 
     def get_study_ids_by_id_type(self, id_type) -> List:
         return self._group_entity_ids_by_id_type(self._studies).get(id_type)
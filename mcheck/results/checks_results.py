@@ -19,18 +19,30 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Nov 27, 2015.
 """
 
+import sys
+
 from hgijson import JsonPropertyMapping
 from mcheck.results.constants import SEVERITY, RESULT
 
 
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
 class CheckResult:
+    # A run creates millions of CheckResults, so they have no __dict__, and the strings they share
+    # (check names, severities and results) are interned - also when they are unpickled:
+    __slots__ = ('check_name', 'severity', 'error_message', 'executed', 'result')
 
     def __init__(self, check_name, executed=True, result=RESULT.SUCCESS, severity=SEVERITY.IMPORTANT, error_message=None):
-        self.check_name = check_name
-        self.severity = severity
+        self.check_name = _intern(check_name)
+        self.severity = _intern(severity)
         self.error_message = error_message
         self.executed = executed
-        self.result = result        # Can be: FAILURE, SUCCESSFUL, NONE - if the test wasn't executed
+        self.result = _intern(result)        # Can be: FAILURE, SUCCESSFUL, NONE - if the test wasn't executed
+
+    def __reduce__(self):
+        return CheckResult, (self.check_name, self.executed, self.result, self.severity, self.error_message)
 
     def __str__(self):
         msg = "Check name: " + str(self.check_name) + ", severity = " + str(self.severity) + ", "
@@ -43,7 +55,15 @@ class CheckResult:
         return self.__str__()
 
     def __hash__(self):
-        return hash(str(self))
+        error_message = self.error_message
+        if isinstance(error_message, list):
+            error_message = tuple(error_message)
+        elif isinstance(error_message, set):
+            error_message = frozenset(error_message)
+        try:
+            return hash((self.check_name, self.severity, self.executed, self.result, error_message))
+        except TypeError:
+            return hash((self.check_name, self.severity, self.executed, self.result, str(error_message)))
 
     def __eq__(self, other):
         if not type(other) == type(self):
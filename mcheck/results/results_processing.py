@@ -21,6 +21,7 @@ This file has been created on May 26, 2016.
 
 from mcheck.results.checks_results import RESULT, SEVERITY
 from mcheck.results.checks_results import CheckResult
+from mcheck.results.results_table import CheckResultsTable
 from collections import defaultdict, Counter
 
 class CheckResultsProcessing:
@@ -64,6 +65,13 @@ class CheckResultsProcessing:
 
     @staticmethod
     def failed_check_results_stats(checks_by_fpath):
+        """
+        Counts the files that failed each check.
+        :param checks_by_fpath: dict of key = file path, value = list of CheckResults, or a CheckResultsTable
+        :return: Counter of key = check name, value = the number of files that failed this check
+        """
+        if isinstance(checks_by_fpath, CheckResultsTable):
+            return checks_by_fpath.failed_check_results_stats()
         nr_files_per_failed_check = Counter()
         for fpath, check_results in checks_by_fpath.items():
             failed_checks_names = set()
@@ -75,10 +83,89 @@ class CheckResultsProcessing:
                 nr_files_per_failed_check[failed_check_name] += 1
         return nr_files_per_failed_check
 
+    @staticmethod
+    def not_executed_check_results_stats(checks_by_fpath):
+        """
+        Counts the files for which each check couldn't be executed.
+        :param checks_by_fpath: dict of key = file path, value = list of CheckResults
+        :return: Counter of key = check name, value = the number of files for which this check wasn't executed
+        """
+        return CheckResultsProcessing.summarize(checks_by_fpath).nr_files_per_not_executed_check
 
+    @staticmethod
+    def summarize(checks_by_fpath):
+        """
+        Computes all the statistics of the CheckResults in one pass over them.
+        :param checks_by_fpath: dict of key = file path, value = list of CheckResults
+        :return: CheckResultsSummary
+        """
+        summary = CheckResultsSummary()
+        for fpath, check_results in checks_by_fpath.items():
+            summary.add_file_check_results(fpath, check_results)
+        return summary
+
+
+class CheckResultsSummary:
+    """
+    Counts the CheckResults by executed flag, severity and result, the files that failed or couldn't execute
+    each check and the failures of each check by severity, updating all the counts in one pass over the CheckResults
+    of each file - so that the results can be summarized as they come, without keeping them.
+    """
+    def __init__(self):
+        self.nr_files = 0
+        self.nr_check_results = 0
+        self.nr_check_results_by_executed = Counter()
+        self.nr_check_results_by_severity = Counter()
+        self.nr_check_results_by_result = Counter()
+        self.nr_files_per_failed_check = Counter()
+        self.nr_files_per_not_executed_check = Counter()
+        self.nr_failures_per_check_and_severity = Counter()
+
+    def add_file_check_results(self, fpath, check_results):
+        """
+        :param fpath: the file path
+        :param check_results: list of CheckResults
+        """
+        failed_checks_names = set()
+        not_executed_checks_names = set()
+        for check in check_results:
+            self.nr_check_results_by_executed[check.executed] += 1
+            self.nr_check_results_by_severity[check.severity] += 1
+            self.nr_check_results_by_result[check.result] += 1
+            if check.result == RESULT.FAILURE:
+                failed_checks_names.add(check.check_name)
+                self.nr_failures_per_check_and_severity[(check.check_name, check.severity)] += 1
+            if not check.executed:
+                not_executed_checks_names.add(check.check_name)
+        self.nr_files_per_failed_check.update(failed_checks_names)
+        self.nr_files_per_not_executed_check.update(not_executed_checks_names)
+        self.nr_check_results += len(check_results)
+        self.nr_files += 1
+
+    def format_summary(self):
+        """
+        :return: the summary as text, for a human reader
+        """
+        lines = ["Summary of %s check results on %s files:" % (self.nr_check_results, self.nr_files),
+                 "Check results by result: %s" % self._format_counts(self.nr_check_results_by_result),
+                 "Check results by severity: %s" % self._format_counts(self.nr_check_results_by_severity),
+                 "Check results by executed: %s" % self._format_counts(self.nr_check_results_by_executed)]
+        if self.nr_files_per_failed_check:
+            lines.append("Failed checks:")
+            for check_name, nr_files in self.nr_files_per_failed_check.most_common():
+                failures_by_severity = Counter({severity: nr_failures for (failed_check_name, severity), nr_failures
+                                                in self.nr_failures_per_check_and_severity.items()
+                                                if failed_check_name == check_name})
+                lines.append("\t%s: %s files (failures by severity: %s)" %
+                             (check_name, nr_files, self._format_counts(failures_by_severity)))
+        if self.nr_files_per_not_executed_check:
+            lines.append("Checks not executed:")
+            for check_name, nr_files in self.nr_files_per_not_executed_check.most_common():
+                lines.append("\t%s: %s files" % (check_name, nr_files))
+        return '\n'.join(lines) + '\n'
 
-
-    def not_executed_check_results_stats(self):
-        pass
+    @staticmethod
+    def _format_counts(counts):
+        return ', '.join("%s: %s" % (value, count) for value, count in counts.most_common())
 
 
@@ -0,0 +1,99 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Results store
+=============
+
+This module keeps the CheckResults of each file from one run to the next, for re-checking only the files
+whose metadata has changed. Each file's results are stored together with a fingerprint of the iRODS metadata
+they were obtained from (AVUs, ACLs and replica checksums) and of the desired reference. On the next run, a file
+with the same fingerprint reuses the stored results of the header, Seqscape and comparison checks instead of
+fetching its header and its Seqscape metadata again.
+Seqscape doesn't record a version of its entities, so the stored results expire after a ttl instead, after which
+the file is checked again against the current Seqscape metadata.
+"""
+
+import hashlib
+import threading
+
+from mcheck.com.cache import SQLiteCache, MISSING
+
+
+class CheckResultsStore:
+
+    def __init__(self, path, max_size, ttl=None):
+        """
+        :param path: the path of the SQLite file, created if it doesn't exist
+        :param max_size: the maximum number of files whose results are stored
+        :param ttl: the number of seconds after which the results of a file are discarded, or None to keep them
+        """
+        self._cache = SQLiteCache(path, max_size, ttl)
+        self.nr_reused = 0
+        self.nr_checked = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _build_key(fpath):
+        return 'results', fpath
+
+    @staticmethod
+    def compute_fingerprint(irods_metadata, reference=None):
+        """
+        :param irods_metadata: IrodsRawFileMetadata (or IrodsSeqFileMetadata) of the file
+        :param reference: the desired reference the file is checked against, or None
+        :return: a string that changes whenever the metadata the file is checked with changes
+        """
+        avus = sorted((str(attribute), sorted(str(value) for value in values))
+                      for attribute, values in irods_metadata.avus.items())
+        acls = sorted((str(acl.access_group), str(acl.zone), str(acl.permission)) for acl in irods_metadata.acls)
+        replicas = sorted((str(replica.replica_nr), str(replica.checksum)) for replica in irods_metadata.file_replicas)
+        return hashlib.sha1(repr((avus, acls, replicas, reference)).encode('utf-8')).hexdigest()
+
+    def get(self, fpath, fingerprint):
+        """
+        :param fpath: the path of the file
+        :param fingerprint: the fingerprint of the file's current metadata
+        :return: the list of CheckResults stored for this file, or None if there are none for this fingerprint
+        """
+        stored = self._cache.get(self._build_key(fpath))
+        if stored is not MISSING and stored[0] == fingerprint:
+            with self._stats_lock:
+                self.nr_reused += 1
+            return stored[1]
+        with self._stats_lock:
+            self.nr_checked += 1
+        return None
+
+    def put(self, fpath, fingerprint, check_results):
+        """
+        :param fpath: the path of the file
+        :param fingerprint: the fingerprint of the metadata the file has been checked with
+        :param check_results: the list of CheckResults to store
+        """
+        self._cache.put(self._build_key(fpath), (fingerprint, list(check_results)))
+
+    def get_stats(self):
+        """
+        :return: a dict of the number of files whose stored results were reused and of the files checked again
+        """
+        return {'reused': self.nr_reused, 'checked': self.nr_checked}
+
+    def close(self):
+        self._cache.close()
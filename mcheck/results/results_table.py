@@ -0,0 +1,209 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+
+Results table
+=============
+
+This module keeps the CheckResults of a large run in columns instead of in a dict of lists of objects:
+a column for each of the file path, check name, severity, result and executed flag of all the CheckResults,
+where each value is stored as a small integer code, and a side table with the error messages of the CheckResults
+that have one. The check name, severity, result and executed columns hold one byte per CheckResult, so they are
+counted and filtered by the bytes methods implemented in C (count, translate), instead of by a python loop
+over millions of objects - without depending on numpy. The files that failed each check are also counted as
+the files are added, so that these counts don't need going through all the rows again.
+"""
+
+from array import array
+from collections import Counter, defaultdict
+from itertools import compress
+
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT
+
+
+class _CodeTable:
+    """
+    Gives each distinct value a small integer code, in the order in which the values are first seen.
+    As in a dict, equal values (e.g. True and 1) share the same code.
+    """
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def encode_all(self, values):
+        codes = self._codes
+        try:
+            return [codes[value] for value in values]
+        except KeyError:
+            return [self.encode(value) for value in values]
+
+    def get_code(self, value):
+        """
+        :return: the code of the value, or None if the value hasn't been encoded
+        """
+        return self._codes.get(value)
+
+
+class CheckResultsTable:
+    COLUMNS = ('fpath', 'check_name', 'severity', 'result', 'executed')
+    MAX_BYTE_CODES = 256
+
+    def __init__(self):
+        self._code_tables = {column: _CodeTable() for column in self.COLUMNS}
+        self._columns = {column: bytearray() for column in self.COLUMNS}
+        self._columns['fpath'] = array('l')
+        self.error_messages = {}
+        self._failed_checks = set()
+        self._nr_files_per_failed_check_code = Counter()
+
+    @classmethod
+    def from_check_results_by_path(cls, check_results_by_path):
+        """
+        :param check_results_by_path: dict of key = file path, value = list of CheckResults
+        :return: CheckResultsTable
+        """
+        table = cls()
+        for fpath, check_results in check_results_by_path.items():
+            table.add_file_check_results(fpath, check_results)
+        return table
+
+    def _encode_column(self, column, values):
+        code_table = self._code_tables[column]
+        codes = code_table.encode_all(values)
+        if len(code_table.values) > self.MAX_BYTE_CODES and isinstance(self._columns[column], bytearray):
+            # Too many distinct values for one byte each - the column can still be counted, though more slowly:
+            self._columns[column] = array('l', list(self._columns[column]))
+        self._columns[column].extend(codes)
+        return codes
+
+    def add_file_check_results(self, fpath, check_results):
+        """
+        Appends the CheckResults of a file to the table.
+        :param fpath: the file path
+        :param check_results: list of CheckResults
+        """
+        row = len(self)
+        for check_result in check_results:
+            if check_result.error_message is not None:
+                self.error_messages[row] = check_result.error_message
+            row += 1
+        path_code = self._code_tables['fpath'].encode(fpath)
+        self._columns['fpath'].extend([path_code] * len(check_results))
+        check_name_codes = self._encode_column('check_name', [check_result.check_name for check_result in check_results])
+        self._encode_column('severity', [check_result.severity for check_result in check_results])
+        result_codes = self._encode_column('result', [check_result.result for check_result in check_results])
+        self._encode_column('executed', [check_result.executed for check_result in check_results])
+        failure_code = self._code_tables['result'].get_code(RESULT.FAILURE)
+        if failure_code is not None and failure_code in result_codes:
+            failed_checks = {(path_code, check_name_code)
+                             for check_name_code, result_code in zip(check_name_codes, result_codes)
+                             if result_code == failure_code}
+            # A file added more than once is counted once for each check it failed:
+            failed_checks -= self._failed_checks
+            self._failed_checks.update(failed_checks)
+            self._nr_files_per_failed_check_code.update(check_name_code for _, check_name_code in failed_checks)
+
+    def __len__(self):
+        return len(self._columns['fpath'])
+
+    def get_check_result(self, row):
+        """
+        :param row: the number of the row, in the order in which the CheckResults were added
+        :return: the CheckResult in this row, rebuilt from the columns
+        """
+        return CheckResult(check_name=self._get_value('check_name', row), executed=self._get_value('executed', row),
+                           result=self._get_value('result', row), severity=self._get_value('severity', row),
+                           error_message=self.error_messages.get(row))
+
+    def get_fpath(self, row):
+        return self._get_value('fpath', row)
+
+    def _get_value(self, column, row):
+        return self._code_tables[column].values[self._columns[column][row]]
+
+    def to_check_results_by_path(self):
+        """
+        :return: dict of key = file path, value = list of CheckResults, the files being in the order in which
+                 they were first added
+        """
+        check_results_by_path = defaultdict(list)
+        fpaths = self._code_tables['fpath'].values
+        for row, path_code in enumerate(self._columns['fpath']):
+            check_results_by_path[fpaths[path_code]].append(self.get_check_result(row))
+        return check_results_by_path
+
+    def count_by(self, column):
+        """
+        Counts the CheckResults by the value they have in a column.
+        :param column: one of COLUMNS
+        :return: Counter of key = value, value = the number of CheckResults having it
+        """
+        counts = Counter()
+        for code, value in enumerate(self._code_tables[column].values):
+            count = self._columns[column].count(code)
+            if count:
+                counts[value] = count
+        return counts
+
+    def select_rows(self, column, value):
+        """
+        :param column: one of COLUMNS
+        :param value: the value the rows should have in this column
+        :return: an iterator over the numbers of the rows that have this value, in order
+        """
+        code = self._code_tables[column].get_code(value)
+        if code is None:
+            return iter(())
+        codes = self._columns[column]
+        if isinstance(codes, bytearray):
+            mask = codes.translate(bytes(1 if other_code == code else 0 for other_code in range(self.MAX_BYTE_CODES)))
+        else:
+            mask = map(code.__eq__, codes)
+        return compress(range(len(codes)), mask)
+
+    def group_by(self, column):
+        """
+        Groups the rows by the value they have in a column.
+        :param column: one of COLUMNS
+        :return: dict of key = value, value = list of the numbers of the rows having it
+        """
+        groups = {}
+        for value in self._code_tables[column].values:
+            rows = list(self.select_rows(column, value))
+            if rows:
+                groups[value] = rows
+        return groups
+
+    def failed_check_results_stats(self):
+        """
+        The same as CheckResultsProcessing.failed_check_results_stats, counted as the files were added.
+        :return: Counter of key = check name, value = the number of files that failed this check
+        """
+        check_names = self._code_tables['check_name'].values
+        return Counter({check_names[check_name_code]: nr_files
+                        for check_name_code, nr_files in self._nr_files_per_failed_check_code.items()})
@@ -0,0 +1,192 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import os
+import tempfile
+import time
+import threading
+import unittest
+from collections import defaultdict
+from unittest.mock import patch, Mock
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.checks.checks_pipeline import MetadataChecksPipeline
+from mcheck.checks.mchecks_by_comparison import FileMetadataComparison
+from mcheck.checks.mchecks_by_type import MetadataSelfChecks
+from mcheck.metadata.file_header_metadata.header_metadata import SAMFileHeaderMetadata
+from mcheck.metadata.irods_metadata.file_metadata import IrodsRawFileMetadata, IrodsSeqFileMetadata
+from mcheck.metadata.irods_metadata.irods_meta_provider import iRODSMetadataProvider
+from mcheck.metadata.seqscape_metadata.seqscape_metadata import SeqscapeMetadata
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT
+from mcheck.results.results_store import CheckResultsStore
+
+
+def fake_preprocess_irods_metadata(raw_metadata, reference):
+    irods_metadata = IrodsSeqFileMetadata(raw_metadata.fpath, samples={'name': {raw_metadata.fpath}},
+                                          libraries={}, studies={}, avus=raw_metadata.avus)
+    return irods_metadata, [CheckResult(check_name=CHECK_NAMES.check_npg_qc_field, error_message=raw_metadata.fpath)]
+
+
+def fake_fetch_header_metadata(fpath, timeout=None, checksums=None):
+    time.sleep(0.001 * (hash(fpath) % 5))
+    header_metadata = SAMFileHeaderMetadata(fpath, samples={'name': {fpath}}, libraries={}, studies={})
+    return header_metadata, [CheckResult(check_name=CHECK_NAMES.check_valid_ids, error_message=fpath)]
+
+
+def fake_fetch_seqscape_metadata(irods_metadata, association_checks=None):
+    time.sleep(0.001 * (hash(irods_metadata.fpath) % 3))
+    seqscape_metadata = SeqscapeMetadata(samples={'name': {'other'}}, libraries={}, studies={})
+    return seqscape_metadata, [CheckResult(check_name=CHECK_NAMES.check_all_id_types_present, result=RESULT.FAILURE)]
+
+
+@patch.object(MetadataSelfChecks, 'fetch_and_preprocess_seqscape_metadata_for_file', fake_fetch_seqscape_metadata)
+@patch.object(MetadataSelfChecks, 'fetch_and_preprocess_header_metadata_for_file', fake_fetch_header_metadata)
+@patch.object(MetadataSelfChecks, 'preprocess_irods_metadata', fake_preprocess_irods_metadata)
+class MetadataChecksPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.raw_metadata_objs = [IrodsRawFileMetadata('/seq/%s.cram' % i) for i in range(30)]
+
+    def _check_phase_by_phase(self):
+        issues_dict = defaultdict(list)
+        irods_metadata_dict = {}
+        for raw_metadata in self.raw_metadata_objs:
+            irods_metadata, check_results = MetadataSelfChecks.preprocess_irods_metadata(raw_metadata, None)
+            irods_metadata_dict[raw_metadata.fpath] = irods_metadata
+            issues_dict[raw_metadata.fpath].extend(check_results)
+        header_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_header_metadata(irods_metadata_dict.keys(), issues_dict)
+        seqscape_metadata_dict = MetadataSelfChecks.fetch_and_preprocess_seqscape_metadata(irods_metadata_dict, issues_dict)
+        FileMetadataComparison.check_metadata_across_different_sources(irods_metadata_dict, header_metadata_dict,
+                                                                       seqscape_metadata_dict, issues_dict)
+        return issues_dict
+
+    def test_results_same_as_phase_by_phase(self):
+        pipeline = MetadataChecksPipeline(nr_workers=4)
+        result = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(self.raw_metadata_objs))
+        expected = self._check_phase_by_phase()
+        self.assertEqual(list(result.keys()), list(expected.keys()))
+        self.assertDictEqual(result, expected)
+
+    def test_all_files_yielded_once(self):
+        pipeline = MetadataChecksPipeline(nr_workers=3)
+        positions = [position for position, _, _ in pipeline.check_raw_irods_metadata(self.raw_metadata_objs)]
+        self.assertListEqual(sorted(positions), list(range(len(self.raw_metadata_objs))))
+
+    def test_files_yielded_in_input_order(self):
+        pipeline = MetadataChecksPipeline(nr_workers=4, max_files_in_flight=5, in_input_order=True)
+        fpaths = [raw_metadata.fpath for raw_metadata in self.raw_metadata_objs]
+        raw_metadata_by_path = {raw_metadata.fpath: raw_metadata for raw_metadata in self.raw_metadata_objs[1::3]}
+        with patch.object(iRODSMetadataProvider, 'fetch_raw_file_metadata_by_path', raw_metadata_by_path.get):
+            results = list(pipeline.check_irods_fpaths(fpaths))
+        self.assertListEqual([fpath for _, fpath, _ in results], fpaths[1::3])
+        self.assertListEqual([position for position, _, _ in results], list(range(1, len(fpaths), 3)))
+
+    def test_inputs_consumed_lazily(self):
+        consumed = []
+        lock = threading.Lock()
+
+        def inputs():
+            for raw_metadata in self.raw_metadata_objs:
+                with lock:
+                    consumed.append(raw_metadata)
+                yield raw_metadata
+
+        pipeline = MetadataChecksPipeline(nr_workers=2, max_files_in_flight=3)
+        results = pipeline.check_raw_irods_metadata(inputs())
+        next(results)
+        self.assertLessEqual(len(consumed), 4)
+        results.close()
+
+    def test_no_inputs(self):
+        pipeline = MetadataChecksPipeline(nr_workers=2)
+        result = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata([]))
+        self.assertDictEqual(result, {})
+
+    def test_files_not_found_skipped(self):
+        pipeline = MetadataChecksPipeline(nr_workers=2)
+        fpaths = [raw_metadata.fpath for raw_metadata in self.raw_metadata_objs]
+        raw_metadata_by_path = {raw_metadata.fpath: raw_metadata for raw_metadata in self.raw_metadata_objs[::2]}
+        with patch.object(iRODSMetadataProvider, 'fetch_raw_file_metadata_by_path', raw_metadata_by_path.get):
+            result = MetadataChecksPipeline.collect_check_results(pipeline.check_irods_fpaths(fpaths))
+        self.assertListEqual(list(result.keys()), fpaths[::2])
+
+    def test_irods_error_raised_to_the_caller(self):
+        pipeline = MetadataChecksPipeline(nr_workers=2)
+        fpaths = [raw_metadata.fpath for raw_metadata in self.raw_metadata_objs]
+        with patch.object(iRODSMetadataProvider, 'fetch_raw_file_metadata_by_path',
+                          Mock(side_effect=IOError("iRODS can't be reached"))):
+            with self.assertRaises(IOError):
+                list(pipeline.check_irods_fpaths(fpaths))
+
+    def test_file_given_twice_reported_once(self):
+        pipeline = MetadataChecksPipeline(nr_workers=3)
+        raw_metadata_objs = self.raw_metadata_objs[:3] + self.raw_metadata_objs[:1]
+        result = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(raw_metadata_objs))
+        expected = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(raw_metadata_objs[:3]))
+        self.assertListEqual(list(result.keys()), [raw_metadata.fpath for raw_metadata in raw_metadata_objs[:3]])
+        self.assertDictEqual(result, expected)
+
+    def test_header_and_seqscape_errors_reported_per_file(self):
+        def fetch_header_metadata(fpath, timeout=None, checksums=None):
+            if fpath == '/seq/1.cram':
+                raise ValueError("Unparsable header")
+            return fake_fetch_header_metadata(fpath, timeout, checksums)
+
+        def fetch_seqscape_metadata(irods_metadata, association_checks=None):
+            if irods_metadata.fpath == '/seq/2.cram':
+                raise ConnectionError("Seqscape can't be reached")
+            return fake_fetch_seqscape_metadata(irods_metadata, association_checks)
+
+        pipeline = MetadataChecksPipeline(nr_workers=2)
+        with patch.object(MetadataSelfChecks, 'fetch_and_preprocess_header_metadata_for_file', fetch_header_metadata), \
+                patch.object(MetadataSelfChecks, 'fetch_and_preprocess_seqscape_metadata_for_file', fetch_seqscape_metadata):
+            result = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(self.raw_metadata_objs))
+        self.assertEqual(len(result), len(self.raw_metadata_objs))
+        for fpath, check_name, error in [('/seq/1.cram', CHECK_NAMES.check_valid_ids, "Unparsable header"),
+                                         ('/seq/2.cram', CHECK_NAMES.check_all_irods_ids_found_in_seqscape,
+                                          "Seqscape can't be reached")]:
+            not_executed = [check_result for check_result in result[fpath]
+                            if check_result.check_name == check_name and not check_result.executed]
+            self.assertEqual(len(not_executed), 1)
+            self.assertIn(error, not_executed[0].error_message[0])
+
+    def test_wrong_nr_of_workers(self):
+        self.assertRaises(ValueError, MetadataChecksPipeline, None, 0)
+
+    def test_incremental_run_reuses_results_of_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results_store = CheckResultsStore(os.path.join(tmp_dir, 'results.db'), 100)
+            pipeline = MetadataChecksPipeline(nr_workers=4, results_store=results_store)
+            first = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(self.raw_metadata_objs))
+            self.raw_metadata_objs[3].avus = {'sample': {'changed'}}
+            fetch_header_metadata = Mock(side_effect=fake_fetch_header_metadata)
+            with patch.object(MetadataSelfChecks, 'fetch_and_preprocess_header_metadata_for_file', fetch_header_metadata):
+                second = MetadataChecksPipeline.collect_check_results(pipeline.check_raw_irods_metadata(self.raw_metadata_objs))
+            results_store.close()
+        self.assertDictEqual(second, first)
+        self.assertEqual(fetch_header_metadata.call_count, 1)
+        self.assertEqual(fetch_header_metadata.call_args[0][0], '/seq/3.cram')
+        self.assertDictEqual(results_store.get_stats(), {'reused': 29, 'checked': 31})
+
+
+if __name__ == "__main__":
+    unittest.main()
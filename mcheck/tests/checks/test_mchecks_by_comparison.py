@@ -49,6 +49,16 @@ class FileMetadataComparisonTest(unittest.TestCase):
         self.assertSetEqual(results, {RESULT.SUCCESS})
 
 
+    def test_mdata_from_diff_srcs_when_no_header(self):
+        irods_metadata = IrodsSeqFileMetadata('/seq/123.bam', samples={'name': set(['S1'])}, libraries={}, studies={})
+        seqscape_metadata = SeqscapeMetadata(samples={'name': set(['S1'])}, libraries={}, studies={})
+        check_results = FileMetadataComparison.check_file_metadata_across_different_sources(irods_metadata, None,
+                                                                                             seqscape_metadata)
+        self.assertEqual(4, len(check_results))
+        self.assertSetEqual({c.executed for c in check_results}, {False})
+        self.assertSetEqual({c.result for c in check_results}, {None})
+
+
     def test_mdata_from_diff_srcs_when_different_id_types(self):
         irods_metadata = IrodsSeqFileMetadata('/seq/123.bam',
                                               samples={'name': set(['S1']), 'accession_number': set(['EGA1']),
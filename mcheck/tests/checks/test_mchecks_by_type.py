@@ -0,0 +1,73 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import subprocess
+import unittest
+from collections import defaultdict
+from unittest import mock
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.checks.mchecks_by_type import MetadataSelfChecks
+from mcheck.metadata.file_header_metadata.header_meta_provider import SAMFileHeaderMetadataProvider
+from mcheck.metadata.file_header_metadata.header_metadata import SAMFileHeaderMetadata
+
+
+def fake_fetch_metadata(fpath, irods=False, timeout=None, checksums=None):
+    if fpath.startswith('/hung'):
+        raise subprocess.TimeoutExpired('samtools', timeout)
+    if fpath.startswith('/missing'):
+        raise IOError("samtools couldn't read the header of %s" % fpath)
+    return SAMFileHeaderMetadata(fpath, samples={'name': {fpath}}, libraries={'name': {fpath}})
+
+
+@mock.patch.object(SAMFileHeaderMetadataProvider, 'fetch_metadata', fake_fetch_metadata)
+class FetchAndPreprocessHeaderMetadataTest(unittest.TestCase):
+
+    def test_header_timed_out(self):
+        header_metadata, check_results = MetadataSelfChecks.fetch_and_preprocess_header_metadata_for_file('/hung/1.cram', 5)
+        self.assertIsNone(header_metadata)
+        self.assertEqual(len(check_results), 1)
+        self.assertEqual(check_results[0].check_name, CHECK_NAMES.check_valid_ids)
+        self.assertFalse(check_results[0].executed)
+        self.assertIsNone(check_results[0].result)
+        self.assertIn('timed out after 5 seconds', check_results[0].error_message[0])
+
+    def test_header_not_readable(self):
+        header_metadata, check_results = MetadataSelfChecks.fetch_and_preprocess_header_metadata_for_file('/missing/1.cram')
+        self.assertIsNone(header_metadata)
+        self.assertFalse(check_results[0].executed)
+        self.assertIn("couldn't read the header", check_results[0].error_message[0])
+
+    def test_concurrent_fetching_same_as_serial(self):
+        fpaths = ['/seq/%s.cram' % i for i in range(20)] + ['/hung/1.cram', '/missing/1.cram']
+        serial_issues = defaultdict(list)
+        serial_headers = MetadataSelfChecks.fetch_and_preprocess_header_metadata(fpaths, serial_issues)
+        concurrent_issues = defaultdict(list)
+        concurrent_headers = MetadataSelfChecks.fetch_and_preprocess_header_metadata(iter(fpaths), concurrent_issues,
+                                                                                   nr_workers=4, timeout=5)
+        self.assertListEqual(list(concurrent_headers.keys()), list(serial_headers.keys()))
+        self.assertListEqual(list(concurrent_headers.keys()), fpaths[:20])
+        self.assertListEqual(list(concurrent_issues.keys()), fpaths)
+        self.assertEqual(concurrent_issues['/seq/3.cram'], serial_issues['/seq/3.cram'])
+
+
+if __name__ == "__main__":
+    unittest.main()
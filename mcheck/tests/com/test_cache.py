@@ -0,0 +1,176 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mcheck.com import cache
+from mcheck.com.cache import LRUCache, SQLiteCache, TieredCache, MISSING
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_missing(self):
+        self.assertIs(LRUCache(2).get(('sample', 'name', 's1')), MISSING)
+
+    def test_put_get(self):
+        lru_cache = LRUCache(2)
+        lru_cache.put(('sample', 'name', 's1'), [])
+        self.assertEqual(lru_cache.get(('sample', 'name', 's1')), [])
+
+    def test_least_recently_used_evicted(self):
+        lru_cache = LRUCache(2)
+        lru_cache.put(('a',), 1)
+        lru_cache.put(('b',), 2)
+        lru_cache.get(('a',))
+        lru_cache.put(('c',), 3)
+        self.assertEqual(lru_cache.get(('a',)), 1)
+        self.assertIs(lru_cache.get(('b',)), MISSING)
+        self.assertEqual(len(lru_cache), 2)
+
+    def test_expired(self):
+        lru_cache = LRUCache(2, ttl=10)
+        with mock.patch.object(cache.time, 'time', return_value=1000):
+            lru_cache.put(('a',), 1)
+        with mock.patch.object(cache.time, 'time', return_value=1009):
+            self.assertEqual(lru_cache.get(('a',)), 1)
+        with mock.patch.object(cache.time, 'time', return_value=1010):
+            self.assertIs(lru_cache.get(('a',)), MISSING)
+
+
+class TestSQLiteCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache.db')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_directory_created(self):
+        path = os.path.join(self.tmp_dir.name, 'metadata-check', 'cache.db')
+        SQLiteCache(path, 10).put(('a',), 1)
+        self.assertTrue(os.path.isfile(path))
+
+    def test_persisted_across_instances(self):
+        disk_cache = SQLiteCache(self.path, 10)
+        disk_cache.put(('sample', 'name', 's1'), ['entity'])
+        disk_cache.close()
+        self.assertEqual(SQLiteCache(self.path, 10).get(('sample', 'name', 's1')), ['entity'])
+
+    def test_least_recently_used_evicted(self):
+        disk_cache = SQLiteCache(self.path, 2)
+        with mock.patch.object(cache.time, 'time', return_value=1000):
+            disk_cache.put_many([(('a',), 1), (('b',), 2)])
+        with mock.patch.object(cache.time, 'time', return_value=1001):
+            disk_cache.get(('a',))
+        with mock.patch.object(cache.time, 'time', return_value=1002):
+            disk_cache.put(('c',), 3)
+        self.assertEqual(disk_cache.get(('a',)), 1)
+        self.assertIs(disk_cache.get(('b',)), MISSING)
+        self.assertEqual(len(disk_cache), 2)
+
+    def test_reads_not_written_until_put_or_close(self):
+        disk_cache = SQLiteCache(self.path, 10)
+        with mock.patch.object(cache.time, 'time', return_value=1000):
+            disk_cache.put(('a',), 1)
+        with mock.patch.object(cache.time, 'time', return_value=1001):
+            disk_cache.get(('a',))
+        with mock.patch.object(disk_cache, '_db', wraps=disk_cache._db) as db:
+            for _ in range(10):
+                disk_cache.get(('a',))
+            self.assertEqual(db.commit.call_count, 0)
+        self.assertEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1000)
+        disk_cache.close()
+        self.assertNotEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1000)
+
+    def test_reads_written_after_flush_interval(self):
+        disk_cache = SQLiteCache(self.path, 10)
+        disk_cache.put(('a',), 1)
+        with mock.patch.object(SQLiteCache, 'LAST_USED_FLUSH_INTERVAL', 1), \
+                mock.patch.object(cache.time, 'time', return_value=1001):
+            disk_cache.get(('a',))
+        self.assertEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1001)
+
+    def test_reads_not_written_until_put_or_close(self):
+        disk_cache = SQLiteCache(self.path, 10)
+        with mock.patch.object(cache.time, 'time', return_value=1000):
+            disk_cache.put(('a',), 1)
+        with mock.patch.object(cache.time, 'time', return_value=1001):
+            disk_cache.get(('a',))
+        with mock.patch.object(disk_cache, '_db', wraps=disk_cache._db) as db:
+            for _ in range(10):
+                disk_cache.get(('a',))
+            self.assertEqual(db.commit.call_count, 0)
+        self.assertEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1000)
+        disk_cache.close()
+        self.assertNotEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1000)
+
+    def test_reads_written_after_flush_interval(self):
+        disk_cache = SQLiteCache(self.path, 10)
+        disk_cache.put(('a',), 1)
+        with mock.patch.object(SQLiteCache, 'LAST_USED_FLUSH_INTERVAL', 1), \
+                mock.patch.object(cache.time, 'time', return_value=1001):
+            disk_cache.get(('a',))
+        self.assertEqual(SQLiteCache(self.path, 10)._db.execute("SELECT last_used FROM cache").fetchone()[0], 1001)
+
+    def test_expired(self):
+        disk_cache = SQLiteCache(self.path, 10, ttl=10)
+        with mock.patch.object(cache.time, 'time', return_value=1000):
+            disk_cache.put(('a',), 1)
+        with mock.patch.object(cache.time, 'time', return_value=1010):
+            self.assertIs(disk_cache.get(('a',)), MISSING)
+        self.assertEqual(len(disk_cache), 0)
+
+
+class TestTieredCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'cache.db')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stats(self):
+        tiered_cache = TieredCache(LRUCache(10), SQLiteCache(self.path, 10))
+        self.assertIs(tiered_cache.get(('a',)), MISSING)
+        tiered_cache.put_many([(('a',), 1)])
+        self.assertEqual(tiered_cache.get(('a',)), 1)
+        self.assertDictEqual(tiered_cache.get_stats(), {'memory_hits': 1, 'disk_hits': 0, 'misses': 1})
+
+    def test_disk_hit_promoted_to_memory(self):
+        SQLiteCache(self.path, 10).put(('a',), 1)
+        tiered_cache = TieredCache(LRUCache(10), SQLiteCache(self.path, 10))
+        self.assertEqual(tiered_cache.get(('a',)), 1)
+        self.assertEqual(tiered_cache.get(('a',)), 1)
+        self.assertDictEqual(tiered_cache.get_stats(), {'memory_hits': 1, 'disk_hits': 1, 'misses': 0})
+
+    def test_memory_only(self):
+        tiered_cache = TieredCache(LRUCache(10))
+        tiered_cache.put_many([(('a',), 1)])
+        self.assertEqual(tiered_cache.get(('a',)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
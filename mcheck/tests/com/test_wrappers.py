@@ -0,0 +1,80 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import unittest
+
+from mcheck.com import wrappers
+
+
+@wrappers.check_args_not_none
+def concatenate(first, second, separator=None):
+    return first + (separator or '') + second
+
+
+@wrappers.check_args_not_none
+def concatenate_all(*strings):
+    return ''.join(strings)
+
+
+class Identifier:
+
+    @classmethod
+    @wrappers.check_args_not_none
+    def is_digit(cls, field):
+        return field.isdigit()
+
+
+class TestCheckArgsNotNone(unittest.TestCase):
+
+    def test_all_arguments_given_positionally(self):
+        self.assertEqual(concatenate('a', 'b', '-'), 'a-b')
+        self.assertTrue(Identifier.is_digit('123'))
+
+    def test_none_argument_given_positionally(self):
+        with self.assertRaises(ValueError) as context:
+            concatenate('a', None, '-')
+        self.assertIn("'second': None", str(context.exception))
+        self.assertRaises(ValueError, Identifier.is_digit, None)
+
+    def test_none_argument_given_by_keyword(self):
+        self.assertRaises(ValueError, concatenate, 'a', second=None, separator='-')
+        self.assertEqual(concatenate('a', second='b', separator='-'), 'a-b')
+
+    def test_parameter_left_to_none_default(self):
+        self.assertRaises(ValueError, concatenate, 'a', 'b')
+
+    def test_variable_arguments(self):
+        self.assertEqual(concatenate_all('a', 'b'), 'ab')
+        self.assertEqual(concatenate_all(), '')
+
+    def test_wrong_number_of_arguments(self):
+        self.assertRaises(TypeError, concatenate, 'a', 'b', '-', '+')
+
+    def test_arguments_compared_by_identity(self):
+        class EqualsNone:
+            def __eq__(self, other):
+                return other is None
+        self.assertEqual(Identifier.is_digit.__name__, 'is_digit')
+        self.assertRaises(AttributeError, Identifier.is_digit, EqualsNone())
+
+
+if __name__ == "__main__":
+    unittest.main()
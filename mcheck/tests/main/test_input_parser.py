@@ -1,3 +1,4 @@
+import io
 import json
 import unittest
 
@@ -6,7 +7,7 @@ from baton.collections import IrodsMetadata
 from baton.models import DataObject, DataObjectReplica
 from mcheck.main.input_parser import convert_data_object, IRODS_METADATA_LIBRARY_ID_PROPERTY, \
     IRODS_METADATA_LEGACY_LIBRARY_ID_PROPERTY, IRODS_METADATA_TARGET_PROPERTY, IRODS_METADATA_REFERENCE_PROPERTY, \
-    parse_data_objects
+    parse_data_objects, iter_json_array_items, iter_baton_data_objects
 
 
 class ParseDataObjects(unittest.TestCase):
@@ -86,5 +87,58 @@ class TestConvertDataObject(unittest.TestCase):
         self.assertCountEqual(converted.libraries, libraries)
 
 
+
+class TestIterJsonArrayItems(unittest.TestCase):
+    """
+    Tests for `iter_json_array_items`.
+    """
+    def setUp(self):
+        self.items = [{"collection": "/seq/%s" % i, "data_object": "%s.cram" % i,
+                       "avus": [{"attribute": "sample", "value": "s[%s], {}" % i}]} for i in range(20)]
+
+    def _parse(self, json_string, read_size):
+        return [json.loads(item) for item in iter_json_array_items(io.StringIO(json_string), read_size)]
+
+    def test_items_split_across_reads(self):
+        json_string = json.dumps(self.items, indent=2)
+        for read_size in (1, 7, 64, len(json_string) + 1):
+            self.assertListEqual(self._parse(json_string, read_size), self.items)
+
+    def test_numbers_split_across_reads(self):
+        self.assertListEqual(self._parse(' [12345, 6789 ] ', 3), [12345, 6789])
+
+    def test_scalar_items_split_across_reads(self):
+        items = [1.5, -2e-3, 10, "a", True, None, [1.25, {"b": 3E+2}]]
+        json_string = json.dumps(items)
+        for read_size in (1, 2, 3, 5):
+            self.assertListEqual(self._parse(json_string, read_size), items)
+            self.assertListEqual(self._parse(json.dumps(items, indent=1), read_size), items)
+        self.assertListEqual(self._parse('1.5', 1), [1.5])
+
+    def test_single_object(self):
+        self.assertListEqual(self._parse(json.dumps(self.items[0]), 5), [self.items[0]])
+
+    def test_empty_input(self):
+        self.assertListEqual(self._parse('  ', 5), [])
+        self.assertListEqual(self._parse(' [ ] ', 5), [])
+
+    def test_truncated_input(self):
+        json_string = json.dumps(self.items)[:-20]
+        self.assertRaises(ValueError, self._parse, json_string, 16)
+
+    def test_missing_separator(self):
+        self.assertRaises(ValueError, self._parse, '[{"a": 1} {"a": 2}]', 4)
+
+    def test_items_parsed_lazily(self):
+        stream = io.StringIO(json.dumps(self.items))
+        items = iter_json_array_items(stream, 100)
+        next(items)
+        self.assertLess(stream.tell(), 300)
+
+    def test_baton_data_objects(self):
+        data_objects_as_json_string = json.dumps([DataObject("/path_1"), DataObject("/path_2")], cls=DataObjectJSONEncoder)
+        data_objects = list(iter_baton_data_objects(io.StringIO(data_objects_as_json_string), 10))
+        self.assertListEqual([data_object.path for data_object in data_objects], ["/path_1", "/path_2"])
+
 if __name__ == "__main__":
     unittest.main()
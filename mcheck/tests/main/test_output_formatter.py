@@ -0,0 +1,64 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import json
+import unittest
+
+from hgijson import MappingJSONEncoderClassBuilder
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.main.output_formatter import format_check_result_as_json, format_output_as_json
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT, SEVERITY
+
+
+class TestFormatAsJson(unittest.TestCase):
+    """
+    The json output has to be the same as the one of the hgijson encoder for CheckResults.
+    """
+    def setUp(self):
+        self.json_encoder = MappingJSONEncoderClassBuilder(CheckResult, CheckResult.to_json_mapping()).build()
+        self.check_results = [
+            CheckResult(CHECK_NAMES.check_valid_ids),
+            CheckResult(CHECK_NAMES.check_valid_ids, result=RESULT.FAILURE, severity=SEVERITY.WARNING,
+                        error_message=['Invalid "sample" ids: sé\t1', 'other']),
+            CheckResult(CHECK_NAMES.check_npg_qc_field, executed=False, result=None, error_message=''),
+            CheckResult(CHECK_NAMES.check_target_field, severity=None, error_message="File has 1 replicas"),
+            CheckResult(None, executed=None, result=None, severity=None),
+            CheckResult(CHECK_NAMES.check_target_field, executed=1, result=0),
+            CheckResult(CHECK_NAMES.check_target_field, executed=True, result=False),
+        ]
+
+    def test_check_results_same_as_hgijson(self):
+        for check_result in self.check_results:
+            self.assertEqual(format_check_result_as_json(check_result), json.dumps(check_result, cls=self.json_encoder))
+
+    def test_output_same_as_hgijson(self):
+        check_results_by_path = {'/seq/1.cram': self.check_results, '/seq/"2".cram': [], '/seq/é3.cram': self.check_results[:1]}
+        self.assertEqual(format_output_as_json(check_results_by_path),
+                         json.dumps(check_results_by_path, cls=self.json_encoder))
+
+    def test_no_results(self):
+        self.assertEqual(format_output_as_json({}), '{}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,12 +19,18 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Jun 13, 2016.
 """
 
+import io
+import json
 import unittest
+from unittest import mock
 
 from mcheck.check_names import CHECK_NAMES
-from run_checks import decide_exit_status
+from mcheck.main import arg_parser
+from mcheck.main.output_formatter import format_output_as_json, format_output_as_tsv
+from run_checks import decide_exit_status, print_check_results
 from mcheck.results.checks_results import CheckResult
 from mcheck.results.constants import RESULT
+from mcheck.results.results_processing import CheckResultsProcessing, CheckResultsSummary
 
 class TestRunChecks(unittest.TestCase):
 
@@ -42,7 +48,67 @@ class TestRunChecks(unittest.TestCase):
         self.assertEqual(decide_exit_status(results), 0)
 
 
-
-
-
-
+class TestParseArgs(unittest.TestCase):
+
+    def test_batch_seqscape_queries_with_nr_workers_rejected(self):
+        argv = ['run_checks.py', 'fetch_by_path', '/seq/1.cram', '--batch_seqscape_queries', '--nr_workers', '4']
+        with mock.patch('sys.argv', argv), mock.patch('sys.stderr', io.StringIO()):
+            self.assertRaises(SystemExit, arg_parser.parse_args)
+
+    def test_batch_seqscape_queries_alone(self):
+        argv = ['run_checks.py', 'fetch_by_path', '/seq/1.cram', '--batch_seqscape_queries']
+        with mock.patch('sys.argv', argv):
+            self.assertTrue(arg_parser.parse_args().batch_seqscape_queries)
+
+
+class TestPrintCheckResults(unittest.TestCase):
+
+    def setUp(self):
+        self.results = {'/seq/1.cram': [CheckResult(CHECK_NAMES.check_all_id_types_present),
+                                        CheckResult(CHECK_NAMES.check_valid_ids, result=RESULT.FAILURE, error_message=['err'])],
+                        '/seq/2.cram': [CheckResult(CHECK_NAMES.check_npg_qc_field, executed=False, result=None)]}
+
+    def test_print_as_tsv_same_as_whole_output(self):
+        output = io.StringIO()
+        print_check_results(iter(self.results.items()), json_output=False, output=output)
+        self.assertEqual(output.getvalue(), format_output_as_tsv(self.results) + '\n')
+
+    def test_print_as_json_same_as_whole_output(self):
+        output = io.StringIO()
+        print_check_results(iter(self.results.items()), json_output=True, output=output)
+        self.assertEqual(output.getvalue(), format_output_as_json(self.results) + '\n')
+
+    def test_print_as_json_lines(self):
+        output = io.StringIO()
+        print_check_results(iter(self.results.items()), jsonl_output=True, output=output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        whole_output = json.loads(format_output_as_json(self.results))
+        for line in lines:
+            file_check_results = json.loads(line)
+            self.assertEqual(file_check_results['check_results'], whole_output[file_check_results['fpath']])
+
+    def test_print_no_results(self):
+        for json_output, expected in ((False, '\n'), (True, '{}\n')):
+            output = io.StringIO()
+            print_check_results(iter([]), json_output=json_output, output=output)
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_print_as_json_valid_when_stopped_by_an_error(self):
+        def check_results_iterator():
+            yield '/seq/1.cram', self.results['/seq/1.cram']
+            raise IOError("iRODS can't be reached")
+
+        output = io.StringIO()
+        with self.assertRaises(IOError):
+            print_check_results(check_results_iterator(), json_output=True, output=output)
+        self.assertListEqual(list(json.loads(output.getvalue()).keys()), ['/seq/1.cram'])
+
+    def test_print_returns_exit_status(self):
+        exit_status = print_check_results(iter(self.results.items()), output=io.StringIO())
+        self.assertEqual(exit_status, decide_exit_status(self.results))
+
+    def test_print_updates_summary(self):
+        summary = CheckResultsSummary()
+        print_check_results(iter(self.results.items()), output=io.StringIO(), summary=summary)
+        self.assertEqual(summary.format_summary(), CheckResultsProcessing.summarize(self.results).format_summary())
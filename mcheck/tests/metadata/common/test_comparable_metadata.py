@@ -150,3 +150,35 @@ class ComparableMetadataTests(unittest.TestCase):
                                               libraries={}, studies={})
         self.assertRaises(TypeError, irods_metadata.difference, [1,2,3])
 
+
+    def test_difference_when_same_ids_in_different_order(self):
+        header_metadata = SAMFileHeaderMetadata('/seq/123.bam', samples={'name': ['S1', 'S2']}, libraries={}, studies={})
+        seqscape_metadata = SeqscapeMetadata(samples={'name': ['S2', 'S1']}, libraries={}, studies={})
+        self.assertDictEqual(header_metadata.difference(seqscape_metadata), {})
+
+    def test_difference_when_int_and_str_ids(self):
+        header_metadata = SAMFileHeaderMetadata('/seq/123.bam', samples={}, libraries={'internal_id': {'123', '456'}},
+                                                studies={})
+        seqscape_metadata = SeqscapeMetadata(samples={}, libraries={'internal_id': [123]}, studies={})
+        self.assertDictEqual(header_metadata.difference(seqscape_metadata), {'libraries': {'internal_id': {'456'}}})
+        self.assertDictEqual(seqscape_metadata.difference(header_metadata), {})
+
+    def test_symmetric_difference(self):
+        header_metadata = SAMFileHeaderMetadata('/seq/123.bam', samples={'name': {'S1', 'S2'}}, libraries={}, studies={})
+        seqscape_metadata = SeqscapeMetadata(samples={'name': {'S2', 'S3'}}, libraries={}, studies={})
+        self.assertDictEqual(header_metadata.symmetric_difference(seqscape_metadata), {'samples': {'name': {'S1', 'S3'}}})
+
+    def test_id_index_built_once(self):
+        header_metadata = SAMFileHeaderMetadata('/seq/123.bam', samples={'name': {'S1', 1}}, libraries={}, studies={})
+        id_index = header_metadata.get_id_index()
+        self.assertDictEqual(id_index, {'samples': {'name': frozenset(['S1', '1'])}, 'studies': {}, 'libraries': {}})
+        self.assertIs(header_metadata.get_id_index(), id_index)
+
+    def test_id_index_rebuilt_when_ids_change(self):
+        header_metadata = SAMFileHeaderMetadata('/seq/123.bam', samples={'name': {'S1', 'N/A'}}, libraries={}, studies={})
+        seqscape_metadata = SeqscapeMetadata(samples={'name': {'S1'}}, libraries={}, studies={})
+        self.assertDictEqual(header_metadata.difference(seqscape_metadata), {'samples': {'name': {'N/A'}}})
+        header_metadata.fix_metadata()
+        self.assertDictEqual(header_metadata.difference(seqscape_metadata), {})
+        seqscape_metadata.samples = {'name': {'S2'}}
+        self.assertDictEqual(header_metadata.difference(seqscape_metadata), {'samples': {'name': {'S1'}}})
@@ -140,6 +140,22 @@ class TestEntityIdentifier(unittest.TestCase):
         ids_dict = identifiers.EntityIdentifier.separate_identifiers_by_type(ids)
         self.assertDictEqual({'internal_id': set(['123']), 'name': set(['MYNAME']), 'accession_number': set(['ERP123'])}, ids_dict)
 
+    def test_classify_identifiers(self):
+        ids = ['123', 'MYNAME', 'ERP123', 123, '123', 'EGAN0001']
+        ids_types = identifiers.EntityIdentifier.classify_identifiers(iter(ids))
+        self.assertDictEqual(ids_types, {'123': 'internal_id', 'MYNAME': 'name', 'ERP123': 'accession_number',
+                                         123: 'internal_id', 'EGAN0001': 'accession_number'})
+
+    def test_classify_identifiers_remembers_types(self):
+        identifiers._classify_identifier.cache_clear()
+        identifiers.EntityIdentifier.classify_identifiers(['sam1', 'sam2'])
+        identifiers.EntityIdentifier.classify_identifiers(['sam2', '3'])
+        self.assertEqual(identifiers._classify_identifier.cache_info().hits, 1)
+
+    def test_separate_identifiers_by_type_with_none_identifier(self):
+        self.assertRaises(ValueError, identifiers.EntityIdentifier.separate_identifiers_by_type, ['123', None])
+        self.assertRaises(ValueError, identifiers.EntityIdentifier.separate_identifiers_by_type, None)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
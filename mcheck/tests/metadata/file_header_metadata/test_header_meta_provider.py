@@ -19,7 +19,15 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Apr 12, 2016.
 """
 
+import os
+import stat
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
+
+import config
 from mcheck.metadata.file_header_metadata.header_meta_provider import SAMFileHeaderMetadataProvider
 from mcheck.metadata.file_header_metadata.header_metadata import SAMFileHeaderMetadata
 
@@ -39,3 +47,80 @@ class TestSAMFileHeaderMetadataProvider(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestExtractIrodsHeaderWithTimeout(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.samtools_path = os.path.join(self.tmp_dir.name, 'samtools')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_samtools(self, script):
+        with open(self.samtools_path, 'w') as samtools:
+            samtools.write('#!%s\nimport sys, time\n%s\n' % (sys.executable, script))
+        os.chmod(self.samtools_path, os.stat(self.samtools_path).st_mode | stat.S_IEXEC)
+
+    def test_header_extracted(self):
+        self._write_samtools("sys.stdout.write('@RG\\tID:1\\tSM:' + sys.argv[-1])")
+        with mock.patch.object(config, 'SAMTOOLS_IRODS_PATH', self.samtools_path):
+            header = SAMFileHeaderMetadataProvider._extract_irods_header_with_timeout('/seq/1.cram', 10)
+        self.assertEqual(header, '@RG\tID:1\tSM:irods:/seq/1.cram')
+
+    def test_samtools_killed_after_timeout(self):
+        self._write_samtools("time.sleep(30)")
+        with mock.patch.object(config, 'SAMTOOLS_IRODS_PATH', self.samtools_path):
+            self.assertRaises(subprocess.TimeoutExpired,
+                              SAMFileHeaderMetadataProvider._extract_irods_header_with_timeout, '/seq/1.cram', 0.5)
+
+    def test_samtools_fails(self):
+        self._write_samtools("sys.stderr.write('Failed to open file'); sys.exit(1)")
+        with mock.patch.object(config, 'SAMTOOLS_IRODS_PATH', self.samtools_path):
+            self.assertRaises(IOError, SAMFileHeaderMetadataProvider._extract_irods_header_with_timeout,
+                              '/seq/1.cram', 10)
+
+
+@mock.patch.object(SAMFileHeaderMetadataProvider, '_header_cache', None)
+class TestFetchMetadataThroughHeaderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.samtools_path = os.path.join(self.tmp_dir.name, 'samtools')
+        with open(self.samtools_path, 'w') as samtools:
+            samtools.write("#!%s\nimport os, sys\nwith open(sys.argv[0] + '.calls', 'a') as calls: calls.write('x')\n"
+                           "sys.stdout.write('@RG\\tID:1\\tSM:sam1\\tLB:lib1')\n" % sys.executable)
+        os.chmod(self.samtools_path, os.stat(self.samtools_path).st_mode | stat.S_IEXEC)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _nr_of_samtools_calls(self):
+        calls_path = self.samtools_path + '.calls'
+        if not os.path.exists(calls_path):
+            return 0
+        with open(calls_path) as calls:
+            return len(calls.read())
+
+    def _fetch(self, checksums):
+        with mock.patch.multiple(config, SAMTOOLS_IRODS_PATH=self.samtools_path,
+                                 HEADER_CACHE_PATH=os.path.join(self.tmp_dir.name, 'headers.db')):
+            return SAMFileHeaderMetadataProvider.fetch_metadata('/seq/1.cram', irods=True, timeout=10, checksums=checksums)
+
+    def test_no_samtools_call_on_warm_cache(self):
+        first = self._fetch({'abc'})
+        second = self._fetch({'abc'})
+        self.assertEqual(first, second)
+        self.assertEqual(second.samples['name'], {'sam1'})
+        self.assertEqual(self._nr_of_samtools_calls(), 1)
+        self.assertDictEqual(SAMFileHeaderMetadataProvider.get_header_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_checksum_changed(self):
+        self._fetch({'abc'})
+        self._fetch({'def'})
+        self.assertEqual(self._nr_of_samtools_calls(), 2)
+
+    def test_not_cached_without_checksums(self):
+        self._fetch(None)
+        self._fetch(None)
+        self.assertEqual(self._nr_of_samtools_calls(), 2)
+        self.assertIsNone(SAMFileHeaderMetadataProvider.get_header_cache_stats())
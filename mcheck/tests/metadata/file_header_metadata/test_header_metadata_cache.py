@@ -0,0 +1,65 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import os
+import tempfile
+import unittest
+
+from mcheck.metadata.file_header_metadata.header_metadata import SAMFileHeaderMetadata
+from mcheck.metadata.file_header_metadata.header_metadata_cache import HeaderMetadataCache
+
+
+class TestHeaderMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = HeaderMetadataCache(os.path.join(self.tmp_dir.name, 'headers.db'), 2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def _header(fpath):
+        return SAMFileHeaderMetadata(fpath, samples={'name': {'sam1'}}, libraries={'name': {'lib1'}})
+
+    def test_hit(self):
+        self.cache.put('/seq/1.cram', {'abc', 'abd'}, self._header('/seq/1.cram'))
+        self.assertEqual(self.cache.get('/seq/1.cram', {'abd', 'abc'}), self._header('/seq/1.cram'))
+        self.assertDictEqual(self.cache.get_stats(), {'hits': 1, 'misses': 0})
+
+    def test_checksum_changed(self):
+        self.cache.put('/seq/1.cram', {'abc'}, self._header('/seq/1.cram'))
+        self.assertIsNone(self.cache.get('/seq/1.cram', {'def'}))
+        self.assertDictEqual(self.cache.get_stats(), {'hits': 0, 'misses': 1})
+
+    def test_single_checksum_as_string(self):
+        self.cache.put('/seq/1.cram', 'abc', self._header('/seq/1.cram'))
+        self.assertIsNotNone(self.cache.get('/seq/1.cram', {'abc'}))
+
+    def test_least_recently_used_evicted(self):
+        for i in range(3):
+            self.cache.put('/seq/%s.cram' % i, {'abc'}, self._header('/seq/%s.cram' % i))
+        self.assertIsNone(self.cache.get('/seq/0.cram', {'abc'}))
+        self.assertIsNotNone(self.cache.get('/seq/2.cram', {'abc'}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import config
+from mcheck.metadata.irods_metadata.attribute_frequency_profiles import AttributeFrequencyProfiles
+
+
+@mock.patch.object(AttributeFrequencyProfiles, '_parsed_profiles', {})
+class TestAttributeFrequencyProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'profile.conf')
+        self._write_profile('sample\t1\nstudy\t1\n', mtime=1000)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_profile(self, content, mtime):
+        with open(self.path, 'w') as profile:
+            profile.write(content)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_config_file_parsed_once(self):
+        with mock.patch.object(AttributeFrequencyProfiles, 'parse_config_file',
+                               wraps=AttributeFrequencyProfiles.parse_config_file) as parse_config_file:
+            for _ in range(5):
+                frequencies = AttributeFrequencyProfiles.get_frequencies(self.path)
+        self.assertDictEqual(frequencies, {'sample': 1, 'study': 1})
+        self.assertEqual(parse_config_file.call_count, 1)
+
+    @mock.patch.object(AttributeFrequencyProfiles, 'MTIME_CHECK_INTERVAL', 0)
+    def test_config_file_reloaded_when_changed(self):
+        AttributeFrequencyProfiles.get_frequencies(self.path)
+        self._write_profile('sample\t2\n', mtime=2000)
+        self.assertDictEqual(AttributeFrequencyProfiles.get_frequencies(self.path), {'sample': 2})
+
+    def test_mtime_not_checked_within_interval(self):
+        AttributeFrequencyProfiles.get_frequencies(self.path)
+        self._write_profile('sample\t2\n', mtime=2000)
+        self.assertDictEqual(AttributeFrequencyProfiles.get_frequencies(self.path), {'sample': 1, 'study': 1})
+
+    def test_wrong_config_file(self):
+        self._write_profile('sample\tone\n', mtime=1000)
+        self.assertRaises(ValueError, AttributeFrequencyProfiles.get_frequencies, self.path)
+
+    def test_profile_chosen_by_target(self):
+        self.assertEqual(AttributeFrequencyProfiles.choose_profile({'target': {'library'}}, '/seq/1/1.cram'),
+                         'library_cram')
+        self.assertEqual(AttributeFrequencyProfiles.choose_profile({'target': {'1'}}, '/seq/1/1.cram'), 'general')
+        self.assertEqual(AttributeFrequencyProfiles.choose_profile({'target': {'1', 'library'}}), 'general')
+
+    def test_library_profile_used_for_library_target(self):
+        library_frequencies = AttributeFrequencyProfiles.get_frequencies_for_file({'target': {'library'}})
+        self.assertIn('library_type', library_frequencies)
+        self.assertNotIn('library_type', AttributeFrequencyProfiles.get_frequencies_for_file({'target': {'1'}}))
+
+    def test_profile_chosen_by_file_type(self):
+        with mock.patch.object(config, 'ATTRIBUTE_FREQUENCY_PROFILE_PATHS', {'bam_profile': self.path}), \
+                mock.patch.object(config, 'ATTRIBUTE_FREQUENCY_PROFILES_BY_FILE_TYPE', {'bam': 'bam_profile'}):
+            self.assertDictEqual(AttributeFrequencyProfiles.get_frequencies_for_file({}, '/seq/1/1.bam'),
+                                 {'sample': 1, 'study': 1})
+            self.assertEqual(AttributeFrequencyProfiles.choose_profile({}, '/seq/1/1.cram'), 'general')
+            self.assertEqual(AttributeFrequencyProfiles.choose_profile({'target': {'library'}}, '/seq/1/1.bam'),
+                             'library_cram')
+
+    def test_unknown_profile(self):
+        self.assertRaises(ValueError, AttributeFrequencyProfiles.get_profile_path, 'no_profile')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import json
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+from mcheck.metadata.irods_metadata.baton_list_session import BatonListSession, _JsonObjectSplitter
+
+
+# A stand-in for baton-list: answers each request with the data object, or with an error if its name starts
+# with "missing", alternating between compact and indented json. It counts the processes started in started.txt.
+FAKE_BATON_LIST = '''#!%s
+import json, os, sys
+with open(os.path.join(os.path.dirname(__file__), 'started.txt'), 'a') as started:
+    started.write('started\\n')
+for i, line in enumerate(sys.stdin):
+    request = json.loads(line)
+    if request['data_object'].startswith('missing'):
+        request['error'] = {'code': -310000, 'message': 'Path does not exist'}
+    else:
+        request['avus'] = [{'attribute': 'sample', 'value': 'sam' + str(i)}]
+    sys.stdout.write(json.dumps(request, indent=(2 if i %% 2 else None)))
+    sys.stdout.flush()
+'''
+
+FAILING_BATON_LIST = '''#!%s
+import sys
+sys.stderr.write('KRB_ERROR_ACQUIRING_CREDS\\n')
+sys.exit(1)
+'''
+
+
+class TestJsonObjectSplitter(unittest.TestCase):
+
+    def setUp(self):
+        self.objects = [{'collection': '/seq/1', 'data_object': '%s.cram' % i,
+                         'avus': [{'attribute': 'sample', 'value': 'sam{%s}[\\"\u00e9' % i}]} for i in range(20)]
+        self.objects.append([{'a': ['"]}', '\\']}])
+
+    def _split(self, text, read_size):
+        splitter = _JsonObjectSplitter()
+        json_objects = []
+        for start in range(0, len(text), read_size):
+            splitter.feed(text[start:start + read_size])
+            json_object = splitter.next_object()
+            while json_object is not None:
+                json_objects.append(json_object)
+                json_object = splitter.next_object()
+        return json_objects
+
+    def test_objects_split_across_reads(self):
+        text = '\n'.join(json.dumps(obj, indent=(2 if i % 2 else None), ensure_ascii=(i % 3 == 0))
+                         for i, obj in enumerate(self.objects))
+        for read_size in (1, 2, 3, 7, 64, len(text)):
+            self.assertListEqual([json.loads(json_object) for json_object in self._split(text, read_size)],
+                                 self.objects)
+
+    def test_not_an_object(self):
+        self.assertRaises(ValueError, self._split, '{"a": 1} 12', 4)
+
+
+class TestBatonListSession(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_baton_list(self, script):
+        baton_list_path = os.path.join(self.tmp_dir.name, 'baton-list')
+        with open(baton_list_path, 'w') as baton_list:
+            baton_list.write(script % sys.executable)
+        os.chmod(baton_list_path, os.stat(baton_list_path).st_mode | stat.S_IEXEC)
+
+    def _nr_of_processes_started(self):
+        with open(os.path.join(self.tmp_dir.name, 'started.txt')) as started:
+            return len(started.readlines())
+
+    def test_list_data_objects_in_order(self):
+        self._write_baton_list(FAKE_BATON_LIST)
+        session = BatonListSession(self.tmp_dir.name)
+        fpaths = ['/seq/1/%s.cram' % i for i in range(50)]
+        results = session.list_data_objects(fpaths)
+        session.close()
+        self.assertListEqual([fpath for fpath, _, _ in results], fpaths)
+        for i, (fpath, data_object_as_json, error_message) in enumerate(results):
+            data_object = json.loads(data_object_as_json)
+            self.assertEqual(os.path.join(data_object['collection'], data_object['data_object']), fpath)
+            self.assertEqual(data_object['avus'][0]['value'], 'sam%s' % i)
+            self.assertIsNone(error_message)
+
+    def test_missing_paths_reported(self):
+        self._write_baton_list(FAKE_BATON_LIST)
+        session = BatonListSession(self.tmp_dir.name)
+        results = session.list_data_objects(['/seq/1/1.cram', '/seq/1/missing.cram', '/seq/1/2.cram'])
+        session.close()
+        self.assertIsNotNone(results[0][1])
+        self.assertEqual(results[1], ('/seq/1/missing.cram', None, 'Path does not exist'))
+        self.assertIsNotNone(results[2][1])
+
+    def test_process_reused(self):
+        self._write_baton_list(FAKE_BATON_LIST)
+        session = BatonListSession(self.tmp_dir.name)
+        for i in range(5):
+            session.list_data_objects(['/seq/1/%s.cram' % i])
+        session.close()
+        self.assertEqual(self._nr_of_processes_started(), 1)
+
+    def test_no_paths(self):
+        self._write_baton_list(FAKE_BATON_LIST)
+        self.assertListEqual(BatonListSession(self.tmp_dir.name).list_data_objects([]), [])
+
+    def test_process_exits(self):
+        self._write_baton_list(FAILING_BATON_LIST)
+        session = BatonListSession(self.tmp_dir.name)
+        with self.assertRaises(RuntimeError) as context:
+            session.list_data_objects(['/seq/1/1.cram'])
+        self.assertIn('KRB_ERROR_ACQUIRING_CREDS', str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import re
+import unittest
+
+from mcheck.metadata.irods_metadata import constants as irods_consts
+from mcheck.metadata.irods_metadata.constants import IrodsPermission, IrodsZones
+from mcheck.metadata.irods_metadata.field_validators import IrodsFieldValidators
+
+
+class TestIrodsFieldValidators(unittest.TestCase):
+
+    def test_patterns_compiled_once(self):
+        self.assertIs(IrodsFieldValidators.PATTERNS['npg_qc'], IrodsFieldValidators.PATTERNS['npg_qc'])
+        self.assertTrue(all(isinstance(pattern, type(re.compile(''))) for pattern in IrodsFieldValidators.PATTERNS.values()))
+
+    def test_npg_qc_same_as_pattern(self):
+        for npg_qc in ('0', '1', 1, '01', '2', 'a', None, 1.0, ['1']):
+            expected = type(npg_qc) in [str, int] and re.match(irods_consts.NPG_QC_REGEX, str(npg_qc)) is not None
+            self.assertEqual(IrodsFieldValidators.is_npg_qc_valid(npg_qc), expected)
+
+    def test_target_same_as_pattern(self):
+        for target in ('0', '1', 'library', 'libraries', 'lib', 1, None):
+            expected = type(target) in [str, int] and re.match(irods_consts.TARGET_REGEX, str(target)) is not None
+            self.assertEqual(IrodsFieldValidators.is_target_valid(target), expected)
+
+    def test_ss_group(self):
+        self.assertTrue(IrodsFieldValidators.is_ss_group('ss_2034'))
+        self.assertFalse(IrodsFieldValidators.is_ss_group('public'))
+
+    def test_checksum(self):
+        self.assertTrue(IrodsFieldValidators.is_checksum_valid('dd6163040f095c571f714169e079f50d'))
+        self.assertTrue(IrodsFieldValidators.is_checksum_valid('AAAA'))
+        self.assertFalse(IrodsFieldValidators.is_checksum_valid('12.24'))
+        self.assertFalse(IrodsFieldValidators.is_checksum_valid('123abc\n'))
+
+    def test_get_permission_by_value_and_member(self):
+        self.assertEqual(IrodsFieldValidators.get_permission('read'), IrodsPermission.READ)
+        self.assertEqual(IrodsFieldValidators.get_permission(IrodsPermission.OWN), IrodsPermission.OWN)
+        self.assertRaises(ValueError, IrodsFieldValidators.get_permission, 'READ')
+        self.assertRaises(ValueError, IrodsFieldValidators.get_permission, ['read'])
+
+    def test_is_permission_valid(self):
+        self.assertTrue(IrodsFieldValidators.is_permission_valid('null'))
+        self.assertFalse(IrodsFieldValidators.is_permission_valid(''))
+        self.assertFalse(IrodsFieldValidators.is_permission_valid({}))
+
+    def test_is_zone_valid(self):
+        self.assertTrue(IrodsFieldValidators.is_zone_valid('Sanger1'))
+        self.assertTrue(IrodsFieldValidators.is_zone_valid(IrodsZones.SEQ))
+        self.assertFalse(IrodsFieldValidators.is_zone_valid('seqseqseq'))
+
+
+if __name__ == "__main__":
+    unittest.main()
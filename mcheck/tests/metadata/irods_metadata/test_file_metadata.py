@@ -534,6 +534,15 @@ class TestIrodsSeqFileMetadata(unittest.TestCase):
         check_result = IrodsSeqFileMetadata.CompleteMetadataChecks.check_attribute_frequencies(avus)
         self.assertEqual(check_result.result, RESULT.SUCCESS)
 
+    def test_check_attribute_frequencies_of_library_checked_against_library_profile(self):
+        avus = {'study_id': {'3257'}, 'sample_id': {'1248216'}, 'sample_accession_number': {'EGA123'}, 'target': {'library'},
+                'study_accession_number': {'EGAS00001000929'}, 'library_id': {'14820960'}, 'study': {'GDAP_XTEN'},
+                'sample': {'APP5201296'}, 'md5': {'123abc'}, 'manual_qc': {'1'}, 'sample_common_name': {'Homo sapiens'},
+                'reference': {'hla/all/bwa0_6/Homo_sapiens.GRCh38_full_analysis_set_plus_decoy_hla.fa'}, 'type': {'cram'}}
+        check_result = IrodsSeqFileMetadata.CompleteMetadataChecks.check_attribute_frequencies(avus)
+        self.assertEqual(check_result.result, RESULT.FAILURE)
+        self.assertIn('Missing attribute library_type', check_result.error_message)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
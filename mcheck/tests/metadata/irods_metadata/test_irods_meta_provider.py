@@ -19,6 +19,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Jul 20, 2016.
 """
 import unittest
+from unittest import mock
 from mcheck.metadata.irods_metadata.irods_meta_provider import iRODSMetadataProvider
 
 class ArgsConvertedToIrodsFieldsTests(unittest.TestCase):
@@ -45,3 +46,18 @@ class ArgsConvertedToIrodsFieldsTests(unittest.TestCase):
         result = set(iRODSMetadataProvider.convert_to_irods_fields(filter_by_file_types='bam'))
         expected = set([('type', 'bam')])
         self.assertSetEqual(result, expected)
+
+
+class FetchRawFilesMetadataByPathsTests(unittest.TestCase):
+
+    @mock.patch.object(iRODSMetadataProvider, '_list_data_objects')
+    def test_missing_paths_skipped(self, list_data_objects):
+        list_data_objects.return_value = [('/seq/1/1.cram', None, 'Path does not exist'),
+                                          ('/seq/1/2.cram', None, 'Path does not exist')]
+        result = iRODSMetadataProvider.fetch_raw_files_metadata_by_paths(['/seq/1/1.cram', '/seq/1/2.cram'])
+        self.assertListEqual(result, [None, None])
+
+    @mock.patch.object(iRODSMetadataProvider, '_list_data_objects')
+    def test_no_kerberos_credentials(self, list_data_objects):
+        list_data_objects.side_effect = RuntimeError("baton-list exited. KRB_ERROR_ACQUIRING_CREDS")
+        self.assertRaises(OSError, iRODSMetadataProvider.fetch_raw_file_metadata_by_path, '/seq/1/1.cram')
@@ -0,0 +1,86 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import unittest
+from unittest import mock
+
+from sequencescape import Sample, Study
+from mcheck.check_names import CHECK_NAMES
+from mcheck.metadata.seqscape_metadata.seqscape_association_checks import SeqscapeAssociationChecks
+from mcheck.metadata.seqscape_metadata.seqscape_metadata import SeqscapeRawMetadata, SeqscapeEntityQueryAndResults
+from mcheck.results.constants import RESULT
+
+
+def build_raw_metadata(sample_names, study_name, samples_of_study):
+    raw_metadata = SeqscapeRawMetadata()
+    samples = [Sample(name=name, accession_number='ega' + name, internal_id=name) for name in sample_names]
+    study = Study(name=study_name, accession_number='ega' + study_name, internal_id=study_name)
+    raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults(samples, query_ids=sample_names, query_id_type='name',
+                                                                    query_entity_type='sample', fetched_entity_type='sample'))
+    raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults(study, query_ids=[study_name], query_id_type='name',
+                                                                    query_entity_type='study', fetched_entity_type='study'))
+    raw_metadata.add_fetched_entities_by_association(
+        SeqscapeEntityQueryAndResults(study, query_ids=sample_names, query_id_type='whole sample',
+                                      query_entity_type='sample', fetched_entity_type='study'))
+    associated_samples = [Sample(name=name, accession_number='ega' + name, internal_id=name) for name in samples_of_study]
+    raw_metadata.add_fetched_entities_by_association(
+        SeqscapeEntityQueryAndResults(associated_samples, query_ids=[study_name], query_id_type='whole study',
+                                      query_entity_type='study', fetched_entity_type='sample'))
+    return raw_metadata
+
+
+class TestSeqscapeAssociationChecks(unittest.TestCase):
+
+    def setUp(self):
+        self.association_checks = SeqscapeAssociationChecks(100)
+
+    def test_same_results_as_without_memo(self):
+        for sample_names, samples_of_study in [(['sam1'], ['sam1', 'sam2']), (['sam3'], ['sam1', 'sam2'])]:
+            raw_metadata = build_raw_metadata(sample_names, 'study1', samples_of_study)
+            self.assertListEqual(raw_metadata.check_metadata(self.association_checks), raw_metadata.check_metadata())
+
+    def test_checks_run_once_per_samples_and_studies(self):
+        with mock.patch.object(SeqscapeRawMetadata, 'check_associations',
+                               side_effect=SeqscapeRawMetadata.check_associations, autospec=True) as check_associations:
+            for _ in range(5):
+                raw_metadata = build_raw_metadata(['sam1'], 'study1', ['sam1', 'sam2'])
+                raw_metadata.check_metadata(self.association_checks)
+            build_raw_metadata(['sam2'], 'study1', ['sam1', 'sam2']).check_metadata(self.association_checks)
+        self.assertEqual(check_associations.call_count, 2)
+
+    def test_failure_reported_to_every_file(self):
+        for _ in range(3):
+            raw_metadata = build_raw_metadata(['sam3'], 'study1', ['sam1', 'sam2'])
+            check_results = {check_result.check_name: check_result
+                             for check_result in raw_metadata.check_metadata(self.association_checks)}
+            check_result = check_results[CHECK_NAMES.check_samples_in_irods_same_as_samples_fetched_by_study_from_seqscape]
+            self.assertEqual(check_result.result, RESULT.FAILURE)
+            self.assertIn('sam3', check_result.error_message)
+
+    def test_check_results_not_shared_between_files(self):
+        first = self.association_checks.check_associations(build_raw_metadata(['sam1'], 'study1', ['sam1']))
+        second = self.association_checks.check_associations(build_raw_metadata(['sam1'], 'study1', ['sam1']))
+        self.assertListEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
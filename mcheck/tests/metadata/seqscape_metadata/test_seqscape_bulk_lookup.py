@@ -0,0 +1,154 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import unittest
+from unittest import mock
+
+from sequencescape import Sample, Study, Library
+
+from mcheck.metadata.seqscape_metadata import seqscape_bulk_lookup
+from mcheck.metadata.seqscape_metadata.seqscape_bulk_lookup import SeqscapeBulkLookup
+from mcheck.metadata.seqscape_metadata.seqscape_meta_provider import SeqscapeRawMetadataProvider
+
+
+class InMemoryEntityConnection:
+    """ Answers the queries for one type of entity from a list of entities, counting the queries by ids."""
+    def __init__(self, entities, associated_entities=None):
+        self.entities = entities
+        self.associated_entities = associated_entities or []
+        self.queries = []
+
+    def _get_by(self, attribute, ids):
+        self.queries.append((attribute, list(ids)))
+        ids = set(str(id) for id in ids)
+        return [entity for entity in self.entities if str(getattr(entity, attribute)) in ids]
+
+    def get_by_name(self, names):
+        return self._get_by('name', names)
+
+    def get_by_id(self, ids):
+        return self._get_by('internal_id', ids)
+
+    def get_by_accession_number(self, accession_numbers):
+        return self._get_by('accession_number', accession_numbers)
+
+    def get_associated_with_study(self, studies):
+        return self.associated_entities
+
+    def get_associated_with_sample(self, samples):
+        return self.associated_entities
+
+
+class CaseInsensitiveEntityConnection(InMemoryEntityConnection):
+    """ Matches the ids regardless of their case, as MySQL does with a case insensitive collation."""
+    def _get_by(self, attribute, ids):
+        self.queries.append((attribute, list(ids)))
+        ids = set(str(id).lower() for id in ids)
+        return [entity for entity in self.entities if str(getattr(entity, attribute)).lower() in ids]
+
+
+class InMemoryConnection:
+    def __init__(self):
+        samples = [Sample(name='sam%s' % i, internal_id=str(i), accession_number='EGAN%s' % i) for i in range(10)]
+        samples.append(Sample(name='sam3', internal_id='103', accession_number='EGAN103'))
+        studies = [Study(name='study1', internal_id='1', accession_number='EGAS1')]
+        self.sample = InMemoryEntityConnection(samples, associated_entities=samples[:5])
+        self.study = InMemoryEntityConnection(studies, associated_entities=studies)
+        self.library = InMemoryEntityConnection([Library(name='lib%s' % i, internal_id=str(i)) for i in range(5)])
+        self.well = InMemoryEntityConnection([Library(name='well%s' % i, internal_id=str(i)) for i in range(5, 8)])
+        self.multiplexed_library = InMemoryEntityConnection([])
+
+    def nr_of_queries_by_ids(self):
+        return sum(len(entity_connection.queries) for entity_connection in
+                   (self.sample, self.study, self.library, self.well, self.multiplexed_library))
+
+
+@mock.patch.object(SeqscapeRawMetadataProvider, '_association_cache', None)
+@mock.patch.object(SeqscapeRawMetadataProvider, '_entity_cache', None)
+@mock.patch.object(SeqscapeRawMetadataProvider, '_connection_pool', None)
+class TestSeqscapeBulkLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.ids_by_fpath = {}
+        for i in range(10):
+            samples = {'name': {'sam%s' % i, 'sam%s' % ((i + 3) % 10)}, 'internal_id': {str(i)},
+                       'accession_number': {'EGAN%s' % i, 'EGAN-missing'}}
+            libraries = {'name': {'lib%s' % (i % 5)}, 'internal_id': {str(i)}}
+            studies = {'name': {'study1'}, 'internal_id': {'1'}, 'accession_number': set()}
+            self.ids_by_fpath['/seq/%s.cram' % i] = (samples, libraries, studies)
+
+    def test_fetch_in_batch_same_as_per_file(self):
+        connection = InMemoryConnection()
+        with mock.patch.object(SeqscapeRawMetadataProvider, '_get_connection', return_value=connection):
+            raw_metadata_by_fpath = SeqscapeRawMetadataProvider.fetch_raw_metadata_in_batch(self.ids_by_fpath)
+        self.assertListEqual(list(raw_metadata_by_fpath.keys()), list(self.ids_by_fpath.keys()))
+        for fpath, (samples, libraries, studies) in self.ids_by_fpath.items():
+            expected = SeqscapeRawMetadataProvider._fetch_raw_metadata(InMemoryConnection(), samples, libraries, studies)
+            self.assertEqual(raw_metadata_by_fpath[fpath], expected)
+            self.assertEqual(str(raw_metadata_by_fpath[fpath].check_metadata()), str(expected.check_metadata()))
+
+    def test_fetch_in_batch_queries_once_per_id_type(self):
+        connection = InMemoryConnection()
+        with mock.patch.object(SeqscapeRawMetadataProvider, '_get_connection', return_value=connection):
+            SeqscapeRawMetadataProvider.fetch_raw_metadata_in_batch(self.ids_by_fpath)
+        # sample: 3 id types, study: 2 id types, library: 2 id types, well and multiplexed library: by internal id
+        self.assertEqual(connection.nr_of_queries_by_ids(), 9)
+
+    def test_bulk_queries_are_chunked(self):
+        connection = InMemoryConnection()
+        bulk_lookup = SeqscapeBulkLookup(connection)
+        bulk_lookup.add_ids({'internal_id': {str(i) for i in range(10)}}, None, None)
+        with mock.patch.object(seqscape_bulk_lookup, 'BULK_QUERY_CHUNK_SIZE', 3):
+            samples = bulk_lookup.sample.get_by_id(['2', '7'])
+        self.assertListEqual([sample.internal_id for sample in samples], ['2', '7'])
+        self.assertEqual(len(connection.sample.queries), 4)
+
+    def test_ids_not_registered_are_queried_directly(self):
+        connection = InMemoryConnection()
+        bulk_lookup = SeqscapeBulkLookup(connection)
+        bulk_lookup.add_ids({'name': {'sam1'}}, None, None)
+        samples = bulk_lookup.sample.get_by_name(['sam1', 'sam2'])
+        self.assertSetEqual({sample.name for sample in samples}, {'sam1', 'sam2'})
+        self.assertEqual(len(connection.sample.queries), 1)
+
+    def test_ids_matched_case_insensitively_same_as_per_file(self):
+        connection = InMemoryConnection()
+        connection.sample = CaseInsensitiveEntityConnection(connection.sample.entities)
+        bulk_lookup = SeqscapeBulkLookup(connection)
+        bulk_lookup.add_ids({'name': {'SAM1', 'sam2', 'sam-missing'}}, None, None)
+        bulk_lookup.add_ids({'name': {'sam4'}}, None, None)
+        self.assertListEqual([sample.name for sample in bulk_lookup.sample.get_by_name(['SAM1'])], ['sam1'])
+        self.assertListEqual([sample.name for sample in bulk_lookup.sample.get_by_name(['sam4'])], ['sam4'])
+        self.assertListEqual(bulk_lookup.sample.get_by_name(['sam-missing']), [])
+        # the bulk query, then the file with an id not matched exactly and the file of the missing id:
+        self.assertEqual(len(connection.sample.queries), 3)
+
+    def test_ids_not_found_answered_from_bulk(self):
+        connection = InMemoryConnection()
+        bulk_lookup = SeqscapeBulkLookup(connection)
+        bulk_lookup.add_ids({'name': {'sam1', 'sam-missing'}}, None, None)
+        self.assertListEqual(bulk_lookup.sample.get_by_name(['sam-missing']), [])
+        self.assertListEqual([sample.name for sample in bulk_lookup.sample.get_by_name(['sam1'])], ['sam1'])
+        self.assertEqual(len(connection.sample.queries), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from mcheck.metadata.seqscape_metadata.seqscape_connection_pool import SeqscapeConnectionPool, NO_CONNECTION_AVAILABLE
+
+
+class FakeConnection:
+    def __init__(self):
+        self.study = mock.Mock()
+        self.broken = False
+        self.closed = False
+
+    def query(self):
+        if self.broken:
+            raise ConnectionError("Lost connection to MySQL server during query")
+        return self
+
+    def close(self):
+        self.closed = True
+
+
+class SeqscapeConnectionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connections = []
+
+    def connect(self):
+        connection = FakeConnection()
+        self.connections.append(connection)
+        return connection
+
+    def test_run_reuses_connection(self):
+        pool = SeqscapeConnectionPool(self.connect, 2)
+        first = pool.run(FakeConnection.query)
+        second = pool.run(FakeConnection.query)
+        self.assertIs(first, second)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_run_passes_arguments(self):
+        pool = SeqscapeConnectionPool(self.connect, 1)
+        result = pool.run(lambda connection, ids, id_type=None: (ids, id_type), ['1', '2'], id_type='name')
+        self.assertEqual(result, (['1', '2'], 'name'))
+
+    def test_no_more_connections_than_size(self):
+        pool = SeqscapeConnectionPool(self.connect, 2)
+        in_use = []
+        max_in_use = []
+        lock = threading.Lock()
+
+        def query(connection):
+            with lock:
+                in_use.append(connection)
+                max_in_use.append(len(in_use))
+            time.sleep(0.01)
+            with lock:
+                in_use.remove(connection)
+
+        with ThreadPoolExecutor(6) as executor:
+            list(executor.map(lambda _: pool.run(query), range(12)))
+        self.assertLessEqual(max(max_in_use), 2)
+        self.assertLessEqual(len(self.connections), 2)
+
+    def test_reconnect_on_failure(self):
+        pool = SeqscapeConnectionPool(self.connect, 1)
+        broken_connection = pool.run(FakeConnection.query)
+        broken_connection.broken = True
+        connection = pool.run(FakeConnection.query)
+        self.assertIsNot(connection, broken_connection)
+        self.assertIs(pool.run(FakeConnection.query), connection)
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(broken_connection.closed)
+        self.assertFalse(connection.closed)
+
+    def test_fails_when_retry_fails(self):
+        pool = SeqscapeConnectionPool(self.connect, 1)
+
+        def query(connection):
+            raise ConnectionError("Can't connect to MySQL server")
+
+        self.assertRaises(ConnectionError, pool.run, query)
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(all(connection.closed for connection in self.connections))
+        # the slot of the failed connection is released:
+        self.assertIsNotNone(pool.run(FakeConnection.query))
+
+    def test_other_errors_not_retried(self):
+        pool = SeqscapeConnectionPool(self.connect, 1)
+        query = mock.Mock(side_effect=ValueError("Sample_names parameter should be a list"))
+        self.assertRaises(ValueError, pool.run, query)
+        self.assertEqual(query.call_count, 1)
+        self.assertEqual(len(self.connections), 1)
+        self.assertFalse(self.connections[0].closed)
+        # the connection is still used:
+        self.assertIs(pool.run(FakeConnection.query), self.connections[0])
+
+    def test_unhealthy_idle_connection_is_dropped(self):
+        pool = SeqscapeConnectionPool(self.connect, 1, health_check_after=0)
+        stale_connection = pool.run(FakeConnection.query)
+        stale_connection.study.get_by_id.side_effect = ConnectionError("MySQL server has gone away")
+        connection = pool.run(FakeConnection.query)
+        self.assertIsNot(connection, stale_connection)
+        self.assertTrue(stale_connection.closed)
+
+    def test_recently_used_connection_not_checked(self):
+        pool = SeqscapeConnectionPool(self.connect, 1, health_check_after=3600)
+        connection = pool.run(FakeConnection.query)
+        self.assertIs(pool.run(FakeConnection.query), connection)
+        connection.study.get_by_id.assert_not_called()
+
+    def test_run_if_available_with_a_free_connection(self):
+        pool = SeqscapeConnectionPool(self.connect, 2)
+        result = pool.run(lambda connection: pool.run_if_available(FakeConnection.query))
+        self.assertIsInstance(result, FakeConnection)
+        self.assertEqual(len(self.connections), 2)
+
+    def test_run_if_available_doesnt_wait_for_a_connection(self):
+        pool = SeqscapeConnectionPool(self.connect, 1)
+        query = mock.Mock()
+        result = pool.run(lambda connection: pool.run_if_available(query))
+        self.assertIs(result, NO_CONNECTION_AVAILABLE)
+        query.assert_not_called()
+        # the slot is released:
+        self.assertIsNotNone(pool.run_if_available(FakeConnection.query))
+
+    def test_wrong_size(self):
+        self.assertRaises(ValueError, SeqscapeConnectionPool, self.connect, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
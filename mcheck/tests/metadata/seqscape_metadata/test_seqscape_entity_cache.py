@@ -0,0 +1,132 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import unittest
+from unittest import mock
+
+from mcheck.com.cache import LRUCache, TieredCache
+from mcheck.metadata.seqscape_metadata.seqscape_entity_cache import SeqscapeCachingLookup
+from mcheck.metadata.seqscape_metadata.seqscape_meta_provider import SeqscapeRawMetadataProvider
+from mcheck.tests.metadata.seqscape_metadata.test_seqscape_bulk_lookup import InMemoryConnection, \
+    CaseInsensitiveEntityConnection
+
+
+class TestSeqscapeCachingLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = InMemoryConnection()
+        self.cache = TieredCache(LRUCache(100))
+        self.caching_lookup = SeqscapeCachingLookup(self.connection, self.cache)
+
+    def test_only_ids_not_cached_are_queried(self):
+        self.caching_lookup.sample.get_by_name(['sam1', 'sam2'])
+        samples = self.caching_lookup.sample.get_by_name(['sam2', 'sam4'])
+        self.assertListEqual([sample.name for sample in samples], ['sam2', 'sam4'])
+        self.assertListEqual(self.connection.sample.queries, [('name', ['sam1', 'sam2']), ('name', ['sam4'])])
+
+    def test_ids_not_found_are_cached(self):
+        self.assertListEqual(self.caching_lookup.study.get_by_accession_number(['EGAS-missing']), [])
+        self.assertListEqual(self.caching_lookup.study.get_by_accession_number(['EGAS-missing']), [])
+        self.assertEqual(len(self.connection.study.queries), 1)
+
+    def test_ids_matched_case_insensitively_not_cached_as_not_found(self):
+        self.connection.sample = CaseInsensitiveEntityConnection(self.connection.sample.entities)
+        self.caching_lookup = SeqscapeCachingLookup(self.connection, self.cache)
+        for _ in range(2):
+            samples = self.caching_lookup.sample.get_by_name(['SAM1', 'sam2', 'sam-missing'])
+            self.assertSetEqual({sample.name for sample in samples}, {'sam1', 'sam2'})
+        self.assertListEqual(self.connection.sample.queries, [('name', ['SAM1', 'sam2', 'sam-missing']),
+                                                              ('name', ['SAM1', 'sam-missing'])])
+
+    def test_duplicated_ids_cached(self):
+        self.caching_lookup.sample.get_by_name(['sam3'])
+        samples = self.caching_lookup.sample.get_by_name(['sam3'])
+        self.assertSetEqual({sample.internal_id for sample in samples}, {'3', '103'})
+
+    def test_keys_by_entity_and_id_type(self):
+        self.caching_lookup.sample.get_by_id(['1'])
+        self.caching_lookup.library.get_by_id(['1'])
+        self.caching_lookup.sample.get_by_name(['1'])
+        self.assertDictEqual(self.cache.get_stats(), {'memory_hits': 0, 'disk_hits': 0, 'misses': 3})
+
+    def test_other_queries_passed_to_connection(self):
+        self.assertEqual(len(self.caching_lookup.sample.get_associated_with_study([])), 5)
+
+
+@mock.patch.object(SeqscapeRawMetadataProvider, '_association_cache', None)
+@mock.patch.object(SeqscapeRawMetadataProvider, '_entity_cache', None)
+@mock.patch.object(SeqscapeRawMetadataProvider, '_connection_pool', None)
+class TestFetchRawMetadataThroughCache(unittest.TestCase):
+
+    def test_second_fetch_served_from_cache(self):
+        connection = InMemoryConnection()
+        samples = {'name': {'sam1'}, 'internal_id': {'1'}, 'accession_number': {'EGAN1'}}
+        with mock.patch.object(SeqscapeRawMetadataProvider, '_get_connection', return_value=connection):
+            first = SeqscapeRawMetadataProvider.fetch_raw_metadata(samples, None, None)
+            nr_queries = connection.nr_of_queries_by_ids()
+            second = SeqscapeRawMetadataProvider.fetch_raw_metadata(samples, None, None)
+        self.assertEqual(first, second)
+        self.assertEqual(nr_queries, 3)
+        self.assertEqual(connection.nr_of_queries_by_ids(), nr_queries)
+        self.assertDictEqual(SeqscapeRawMetadataProvider.get_entity_cache_stats(),
+                             {'memory_hits': 3, 'disk_hits': 0, 'misses': 3})
+
+
+@mock.patch.object(SeqscapeRawMetadataProvider, '_association_cache', None)
+class TestAssociationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = InMemoryConnection()
+        self.studies = self.connection.study.get_by_name(['study1'])
+        self.samples = self.connection.sample.get_by_name(['sam1', 'sam2'])
+
+    def test_samples_of_studies_fetched_once(self):
+        with mock.patch.object(self.connection.sample, 'get_associated_with_study',
+                               wraps=self.connection.sample.get_associated_with_study) as get_associated_with_study:
+            first = SeqscapeRawMetadataProvider._fetch_samples_for_studies(self.connection, set(self.studies))
+            second = SeqscapeRawMetadataProvider._fetch_samples_for_studies(InMemoryConnection(), set(self.studies))
+        self.assertEqual(get_associated_with_study.call_count, 1)
+        self.assertIs(first, second)
+        self.assertEqual(len(first.entities_fetched), 5)
+
+    def test_keyed_by_the_set_of_entities(self):
+        with mock.patch.object(self.connection.study, 'get_associated_with_sample',
+                               wraps=self.connection.study.get_associated_with_sample) as get_associated_with_sample:
+            SeqscapeRawMetadataProvider._fetch_studies_for_samples(self.connection, set(self.samples))
+            SeqscapeRawMetadataProvider._fetch_studies_for_samples(self.connection, set(reversed(self.samples)))
+            SeqscapeRawMetadataProvider._fetch_studies_for_samples(self.connection, set(self.samples[:1]))
+        self.assertEqual(get_associated_with_sample.call_count, 2)
+
+    def test_nothing_found_is_cached(self):
+        self.connection.study.associated_entities = []
+        self.assertIsNone(SeqscapeRawMetadataProvider._fetch_studies_for_samples(self.connection, set(self.samples)))
+        self.connection.study.associated_entities = self.studies
+        self.assertIsNone(SeqscapeRawMetadataProvider._fetch_studies_for_samples(self.connection, set(self.samples)))
+
+    def test_no_caching(self):
+        with mock.patch('config.SEQSC_ASSOCIATION_CACHE_SIZE', 0):
+            SeqscapeRawMetadataProvider._fetch_samples_for_studies(self.connection, set(self.studies))
+            self.connection.sample.associated_entities = []
+            self.assertIsNone(SeqscapeRawMetadataProvider._fetch_samples_for_studies(self.connection, set(self.studies)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -19,10 +19,14 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 This file has been created on Mar 02, 2016.
 """
 
+import threading
 from unittest import TestCase, mock, skip
 
 import config
+from sequencescape import Library
+from mcheck.metadata.seqscape_metadata.seqscape_connection_pool import SeqscapeConnectionPool
 from mcheck.metadata.seqscape_metadata.seqscape_meta_provider import SeqscapeRawMetadataProvider
+from mcheck.tests.metadata.seqscape_metadata.test_seqscape_bulk_lookup import InMemoryConnection, InMemoryEntityConnection
 
 @skip
 class TestFetchSamplesFromSeqscapeRawMetadataProvider(TestCase):
@@ -123,6 +127,77 @@ class TestFetchLibrariesFromSeqscapeRawMetadataProvider(TestCase):
         self.assertIsNone(libraries_fetched_by_name)
 
 
+class TestFetchLibrariesByIdFromDifferentTables(TestCase):
+
+    def setUp(self):
+        # libraries: ids 0-4, wells: ids 5-7
+        self.ss_connection = InMemoryConnection()
+
+    def test_ids_of_libraries_and_wells(self):
+        _, libraries_fetched_by_id = SeqscapeRawMetadataProvider._fetch_libraries(self.ss_connection, set(), {'3', '6'})
+        self.assertSetEqual({library.name for library in libraries_fetched_by_id.entities_fetched}, {'lib3', 'well6'})
+        self.assertListEqual(self.ss_connection.well.queries, [('internal_id', ['6'])])
+        self.assertListEqual(self.ss_connection.multiplexed_library.queries, [])
+
+    def test_ids_not_found_looked_up_in_every_table(self):
+        libraries = SeqscapeRawMetadataProvider._fetch_libraries_by_id(self.ss_connection, ['1', '7', '100'])
+        self.assertListEqual([library.name for library in libraries], ['lib1', 'well7'])
+        self.assertListEqual(self.ss_connection.multiplexed_library.queries, [('internal_id', ['100'])])
+
+    def test_all_ids_found_as_libraries(self):
+        libraries = SeqscapeRawMetadataProvider._fetch_libraries_by_id(self.ss_connection, ['1', '2'])
+        self.assertEqual(len(libraries), 2)
+        self.assertEqual(self.ss_connection.nr_of_queries_by_ids(), 1)
+
+
+class SimultaneousEntityConnection(InMemoryEntityConnection):
+    """ Answers a query only once all the entity connections sharing the barrier are queried at the same time."""
+    def __init__(self, entities, barrier):
+        super().__init__(entities)
+        self.barrier = barrier
+
+    def get_by_id(self, ids):
+        self.barrier.wait()
+        return super().get_by_id(ids)
+
+
+@mock.patch.object(config, 'SEQSC_CACHE_MEMORY_SIZE', 0)
+@mock.patch.object(SeqscapeRawMetadataProvider, '_lookup_executor', None)
+class TestFetchLibrariesByIdConcurrently(TestCase):
+
+    def setUp(self):
+        # libraries: ids 0-4, wells: ids 5-7
+        self.ss_connection = InMemoryConnection()
+        self.connection_pool = SeqscapeConnectionPool(lambda: self.ss_connection, 3)
+
+    def test_tables_looked_up_at_the_same_time(self):
+        barrier = threading.Barrier(3, timeout=5)
+        for entity_type in ('library', 'well', 'multiplexed_library'):
+            entity_connection = getattr(self.ss_connection, entity_type)
+            setattr(self.ss_connection, entity_type, SimultaneousEntityConnection(entity_connection.entities, barrier))
+        libraries = SeqscapeRawMetadataProvider._fetch_libraries_by_id(self.ss_connection, ['1', '7', '100'],
+                                                                      self.connection_pool)
+        self.assertListEqual([library.name for library in libraries], ['lib1', 'well7'])
+        for entity_type in ('library', 'well', 'multiplexed_library'):
+            self.assertListEqual(getattr(self.ss_connection, entity_type).queries, [('internal_id', ['1', '7', '100'])])
+
+    def test_library_then_well_then_multiplexed_library(self):
+        self.ss_connection.well.entities.append(Library(name='well1', internal_id='1'))
+        self.ss_connection.multiplexed_library.entities.extend([Library(name='mx1', internal_id='1'),
+                                                                Library(name='mx7', internal_id='7'),
+                                                                Library(name='mx8', internal_id='8')])
+        libraries = SeqscapeRawMetadataProvider._fetch_libraries_by_id(self.ss_connection, ['1', '7', '8'],
+                                                                      self.connection_pool)
+        self.assertListEqual([library.name for library in libraries], ['lib1', 'well7', 'mx8'])
+
+    def test_one_table_at_a_time_when_no_connection_is_free(self):
+        connection_pool = SeqscapeConnectionPool(lambda: self.ss_connection, 1)
+        libraries = connection_pool.run(SeqscapeRawMetadataProvider._fetch_libraries_by_id, ['3', '6'], connection_pool)
+        self.assertListEqual([library.name for library in libraries], ['lib3', 'well6'])
+        self.assertListEqual(self.ss_connection.well.queries, [('internal_id', ['6'])])
+        self.assertListEqual(self.ss_connection.multiplexed_library.queries, [])
+
+
 @skip
 class TestFetchRawMetadata(TestCase):
 
@@ -103,6 +103,34 @@ class TestSeqscapeEntitiesFetched(unittest.TestCase):
         result = test_obj._find_duplicated_ids()
         self.assertEqual(len(result), 1)
 
+    def test_check_no_duplicates_found_lists_the_duplicated_entities(self):
+        entities_fetched = [Sample(name='sam1', internal_id=123, accession_number='ega1'),
+                            Sample(name='sam2', internal_id=5, accession_number='ega2'),
+                            Sample(name='sam3', internal_id=123, accession_number='ega3')]
+        test_obj = SeqscapeEntityQueryAndResults(entities_fetched, ['123', '5'], query_id_type='internal_id',
+                                                 query_entity_type='sample', fetched_entity_type='sample')
+        result = test_obj.check_no_duplicates_found()
+        self.assertEqual(result.result, RESULT.FAILURE)
+        self.assertIn('sam1', result.error_message)
+        self.assertIn('sam3', result.error_message)
+        self.assertNotIn('sam2', result.error_message)
+
+    def test_find_missing_ids_in_the_order_queried(self):
+        entities_fetched = [Sample(name='sam2', internal_id='2', accession_number='ega2')]
+        test_obj = SeqscapeEntityQueryAndResults(entities_fetched, ['4', '2', '3', '4', '1'], query_id_type='internal_id',
+                                                 query_entity_type='sample', fetched_entity_type='sample')
+        self.assertListEqual(test_obj._find_missing_ids(), ['4', '3', '1'])
+
+    def test_find_ids_of_many_entities(self):
+        entities_fetched = [Sample(name='sam%s' % (i % 5000), internal_id=str(i), accession_number='ega%s' % i)
+                            for i in range(10000)]
+        query_ids = ['sam%s' % i for i in range(5001)]
+        test_obj = SeqscapeEntityQueryAndResults(entities_fetched, query_ids, query_id_type='name',
+                                                 query_entity_type='sample', fetched_entity_type='sample')
+        self.assertListEqual(test_obj._find_missing_ids(), ['sam5000'])
+        self.assertEqual(len(test_obj._find_duplicated_ids()), 5000)
+        self.assertEqual(test_obj.check_no_duplicates_found().result, RESULT.FAILURE)
+
 
     def test_add_fetched_entities_ok(self):
         samples_fetched = Sample(name='sam12', accession_number='ega12', internal_id='12')
@@ -390,6 +418,89 @@ class TestSamplesAndStudiesFetched(unittest.TestCase):
         self.assertEqual(result.result, RESULT.FAILURE)
 
 
+class TestRawMetadataIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.sam1 = Sample(name='sam1', accession_number='ega1', internal_id='1')
+        self.sam2 = Sample(name='sam2', accession_number='ega2', internal_id='2')
+        self.raw_metadata = SeqscapeRawMetadata()
+        self.raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([self.sam1, self.sam2], query_ids=['sam1', 'sam2'],
+                                                                             query_id_type='name', query_entity_type='sample',
+                                                                             fetched_entity_type='sample'))
+        self.raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([self.sam1], query_ids=[1],
+                                                                             query_id_type='internal_id', query_entity_type='sample',
+                                                                             fetched_entity_type='sample'))
+
+    def test_entities_without_duplicates_in_the_order_fetched(self):
+        self.assertListEqual(self.raw_metadata.get_entities_by_type('sample'), [self.sam1, self.sam2])
+        self.assertSetEqual(self.raw_metadata.get_entities_without_duplicates_by_entity_type('sample'), {self.sam1, self.sam2})
+
+    def test_get_entities_by_id(self):
+        self.assertListEqual(self.raw_metadata.get_entities_by_id('sample', 'internal_id', 2), [self.sam2])
+        self.assertListEqual(self.raw_metadata.get_entities_by_id('sample', 'accession_number', 'ega1'), [self.sam1])
+        self.assertListEqual(self.raw_metadata.get_entities_by_id('study', 'name', 'sam1'), [])
+
+    def test_entities_by_id_updated_when_added(self):
+        sam3 = Sample(name='sam1', accession_number='ega3', internal_id='3')
+        self.raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([sam3], query_ids=['ega3'],
+                                                                             query_id_type='accession_number', query_entity_type='sample',
+                                                                             fetched_entity_type='sample'))
+        self.assertListEqual(self.raw_metadata.get_entities_by_id('sample', 'name', 'sam1'), [self.sam1, sam3])
+
+    def test_checks_use_the_entities_by_id(self):
+        sam3 = Sample(name='sam1', accession_number='ega3', internal_id='3')
+        self.raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([sam3], query_ids=['ega3', 'ega4'],
+                                                                             query_id_type='accession_number', query_entity_type='sample',
+                                                                             fetched_entity_type='sample'))
+        check_results = {(check_result.check_name, check_result.error_message): check_result.result
+                         for check_result in self.raw_metadata.check_metadata()}
+        failures = [key for key, result in check_results.items() if result == RESULT.FAILURE]
+        self.assertTrue(any(name == CHECK_NAMES.check_all_irods_ids_found_in_seqscape and "['ega4']" in message
+                            for name, message in failures))
+        self.assertTrue(any(name == CHECK_NAMES.check_for_duplicated_ids_within_seqscape and "['sam1']" in message
+                            for name, message in failures))
+
+    def test_associations_key_by_internal_id(self):
+        other_raw_metadata = SeqscapeRawMetadata()
+        other_raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([self.sam2, self.sam1], query_ids=['2', '1'],
+                                                                              query_id_type='internal_id', query_entity_type='sample',
+                                                                              fetched_entity_type='sample'))
+        self.assertEqual(self.raw_metadata.get_associations_key(), other_raw_metadata.get_associations_key())
+        self.assertNotEqual(self.raw_metadata.get_associations_key(), SeqscapeRawMetadata().get_associations_key())
+
+    def test_query_results_without_duplicates(self):
+        self.raw_metadata.add_fetched_entities(SeqscapeEntityQueryAndResults([self.sam1], query_ids=['1'],
+                                                                             query_id_type='internal_id', query_entity_type='sample',
+                                                                             fetched_entity_type='sample'))
+        self.assertEqual(len(self.raw_metadata.get_fetched_entities_by_type('sample')), 2)
+        self.assertEqual(len(self.raw_metadata.get_all_entities_from_query_results()), 3)
+
+    def test_entities_by_association_updated_when_added(self):
+        study1 = Study(name='study1', accession_number='egas1', internal_id='1')
+        study2 = Study(name='study2', accession_number='egas2', internal_id='2')
+        self.raw_metadata.add_fetched_entities_by_association(
+            SeqscapeEntityQueryAndResults([study1], query_ids=['sam1'], query_id_type='whole sample',
+                                          query_entity_type='sample', fetched_entity_type='study'))
+        self.assertListEqual(self.raw_metadata.get_all_entities_by_association_by_type('sample', 'study'), [study1])
+        self.raw_metadata.add_fetched_entities_by_association(
+            SeqscapeEntityQueryAndResults([study1, study2], query_ids=['sam2'], query_id_type='whole sample',
+                                          query_entity_type='sample', fetched_entity_type='study'))
+        self.assertSetEqual(set(self.raw_metadata.get_all_entities_by_association_by_type('sample', 'study')),
+                            {study1, study2})
+
+    def test_getters_dont_register_entity_types(self):
+        self.assertListEqual(self.raw_metadata.get_entities_by_type('study'), [])
+        self.assertListEqual(self.raw_metadata.get_fetched_entities_by_type('study'), [])
+        self.assertSetEqual(self.raw_metadata.get_entities_without_duplicates_by_entity_type('study'), set())
+        self.assertListEqual(self.raw_metadata.get_all_fetched_entity_types(), ['sample'])
+
+    def test_registered_entity_types_are_checked(self):
+        self.raw_metadata.register_entity_type('study')
+        self.raw_metadata.register_entity_type('sample')
+        self.assertListEqual(self.raw_metadata.get_all_fetched_entity_types(), ['sample', 'study'])
+        self.assertEqual(len(self.raw_metadata.get_fetched_entities_by_type('sample')), 2)
+
+
 class TestCheckEntitiesFetched(unittest.TestCase):
 
     def test_check_entities_fetched_ok(self):
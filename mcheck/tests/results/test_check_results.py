@@ -1,4 +1,5 @@
 import json
+import pickle
 import unittest
 
 from mcheck.results.checks_results import CheckResult
@@ -81,5 +82,33 @@ class TestCheckResultJSONDecoder(unittest.TestCase):
             self.assertIsInstance(check_result, CheckResult)
 
 
+
+class TestCheckResult(unittest.TestCase):
+    """
+    Tests for the memory-compact `CheckResult`.
+    """
+    def test_no_instance_dict(self):
+        check_result = CheckResult(_NAME)
+        self.assertFalse(hasattr(check_result, '__dict__'))
+        self.assertRaises(AttributeError, setattr, check_result, 'other', 1)
+
+    def test_equal_check_results_same_hash(self):
+        check_result = CheckResult(_NAME, result=RESULT.FAILURE, error_message=['err1', 'err2'])
+        other = CheckResult(''.join(['my_', 'name']), result=RESULT.FAILURE, error_message=['err1', 'err2'])
+        self.assertEqual(check_result, other)
+        self.assertEqual(hash(check_result), hash(other))
+        self.assertEqual(len({check_result, other, CheckResult(_NAME)}), 2)
+
+    def test_hash_with_unhashable_error_message(self):
+        check_result = CheckResult(_NAME, error_message={'a': [1]})
+        self.assertEqual(hash(check_result), hash(CheckResult(_NAME, error_message={'a': [1]})))
+
+    def test_pickled(self):
+        check_result = CheckResult(_NAME, executed=False, result=None, severity=SEVERITY.WARNING, error_message=['err'])
+        unpickled = pickle.loads(pickle.dumps(check_result))
+        self.assertEqual(unpickled, check_result)
+        self.assertIs(unpickled.check_name, check_result.check_name)
+        self.assertIs(unpickled.severity, SEVERITY.WARNING)
+
 if __name__ == "__main__":
     unittest.main()
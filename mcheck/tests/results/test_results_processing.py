@@ -20,7 +20,7 @@ This file has been created on Jun 08, 2016.
 """
 import unittest
 
-from mcheck.results.results_processing import CheckResultsProcessing
+from mcheck.results.results_processing import CheckResultsProcessing, CheckResultsSummary
 from mcheck.results.checks_results import CheckResult
 from mcheck.results.constants import SEVERITY, RESULT
 
@@ -135,3 +135,65 @@ class CheckResultsProcessingCounterTest(unittest.TestCase):
         self.assertDictEqual(result, expected)
 
 
+class CheckResultsProcessingNotExecutedTest(unittest.TestCase):
+
+    def test_not_executed_check_results_stats(self):
+        check_results_dict = {'/seq/1/1.cram': [CheckResult(check_name='check1', executed=False, result=None),
+                                                CheckResult(check_name='check1', executed=False, result=None),
+                                                CheckResult(check_name='check2')],
+                              '/seq/2/2.cram': [CheckResult(check_name='check1', executed=False, result=None),
+                                                CheckResult(check_name='check2', executed=False, result=None)],
+                              '/seq/3/3.cram': [CheckResult(check_name='check1')]}
+        result = CheckResultsProcessing.not_executed_check_results_stats(check_results_dict)
+        self.assertDictEqual(result, {'check1': 2, 'check2': 1})
+
+    def test_not_executed_check_results_when_all_executed(self):
+        check_results_dict = {'/seq/1/1.cram': [CheckResult(check_name='check1', result=RESULT.FAILURE)]}
+        self.assertDictEqual(CheckResultsProcessing.not_executed_check_results_stats(check_results_dict), {})
+
+
+class CheckResultsSummaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.check_results_dict = {
+            '/seq/1/1.cram': [CheckResult(check_name='check1', result=RESULT.FAILURE, severity=SEVERITY.WARNING),
+                              CheckResult(check_name='check1', result=RESULT.FAILURE, severity=SEVERITY.CRITICAL),
+                              CheckResult(check_name='check2', severity=SEVERITY.WARNING)],
+            '/seq/2/2.cram': [CheckResult(check_name='check1', result=RESULT.FAILURE, severity=SEVERITY.WARNING),
+                              CheckResult(check_name='check2', executed=False, result=None)]
+        }
+        self.all_check_results = [check_result for check_results in self.check_results_dict.values()
+                                  for check_result in check_results]
+
+    def test_summary_same_as_separate_stats(self):
+        summary = CheckResultsProcessing.summarize(self.check_results_dict)
+        self.assertEqual(summary.nr_files, 2)
+        self.assertEqual(summary.nr_check_results, 5)
+        for counts, group_by in ((summary.nr_check_results_by_executed, CheckResultsProcessing.group_by_executed),
+                                 (summary.nr_check_results_by_severity, CheckResultsProcessing.group_by_severity),
+                                 (summary.nr_check_results_by_result, CheckResultsProcessing.group_by_result)):
+            self.assertDictEqual(counts, {value: len(check_results)
+                                          for value, check_results in group_by(self.all_check_results).items()})
+        self.assertDictEqual(summary.nr_files_per_failed_check,
+                             CheckResultsProcessing.failed_check_results_stats(self.check_results_dict))
+        self.assertDictEqual(summary.nr_files_per_not_executed_check, {'check2': 1})
+
+    def test_failures_per_check_and_severity(self):
+        summary = CheckResultsProcessing.summarize(self.check_results_dict)
+        self.assertDictEqual(summary.nr_failures_per_check_and_severity,
+                             {('check1', SEVERITY.WARNING): 2, ('check1', SEVERITY.CRITICAL): 1})
+
+    def test_summary_added_file_by_file(self):
+        summary = CheckResultsSummary()
+        for fpath, check_results in self.check_results_dict.items():
+            summary.add_file_check_results(fpath, check_results)
+        self.assertEqual(summary.format_summary(), CheckResultsProcessing.summarize(self.check_results_dict).format_summary())
+
+    def test_format_summary(self):
+        formatted = CheckResultsProcessing.summarize(self.check_results_dict).format_summary()
+        self.assertIn("Summary of 5 check results on 2 files:", formatted)
+        self.assertIn("\tcheck1: 2 files (failures by severity: WARNING: 2, CRITICAL: 1)", formatted)
+        self.assertIn("Checks not executed:\n\tcheck2: 1 files", formatted)
+
+    def test_format_empty_summary(self):
+        self.assertEqual(CheckResultsSummary().format_summary().splitlines()[0], "Summary of 0 check results on 0 files:")
@@ -0,0 +1,102 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from mcheck.check_names import CHECK_NAMES
+from mcheck.metadata.irods_metadata.acl import IrodsACL
+from mcheck.metadata.irods_metadata.file_metadata import IrodsRawFileMetadata
+from mcheck.metadata.irods_metadata.file_replica import IrodsFileReplica
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT
+from mcheck.results.results_store import CheckResultsStore
+
+
+class TestComputeFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.metadata = IrodsRawFileMetadata('/seq/1.cram',
+                                             file_replicas=[IrodsFileReplica('abc', 1), IrodsFileReplica('abc', 2)],
+                                             acls=[IrodsACL('ss_1', 'seq', 'READ')],
+                                             avus={'sample': {'sam1', 'sam2'}, 'study_id': {'1'}})
+        self.fingerprint = CheckResultsStore.compute_fingerprint(self.metadata, 'hs37d5')
+
+    def test_same_metadata_in_other_order(self):
+        metadata = IrodsRawFileMetadata('/seq/1.cram',
+                                        file_replicas=[IrodsFileReplica('abc', 2), IrodsFileReplica('abc', 1)],
+                                        acls=[IrodsACL('ss_1', 'seq', 'READ')],
+                                        avus={'study_id': {'1'}, 'sample': {'sam2', 'sam1'}})
+        self.assertEqual(CheckResultsStore.compute_fingerprint(metadata, 'hs37d5'), self.fingerprint)
+
+    def test_avus_changed(self):
+        self.metadata.avus['sample'] = {'sam1'}
+        self.assertNotEqual(CheckResultsStore.compute_fingerprint(self.metadata, 'hs37d5'), self.fingerprint)
+
+    def test_acls_changed(self):
+        self.metadata.acls.append(IrodsACL('public', 'seq', 'READ'))
+        self.assertNotEqual(CheckResultsStore.compute_fingerprint(self.metadata, 'hs37d5'), self.fingerprint)
+
+    def test_replica_checksum_changed(self):
+        self.metadata.file_replicas[1] = IrodsFileReplica('abd', 2)
+        self.assertNotEqual(CheckResultsStore.compute_fingerprint(self.metadata, 'hs37d5'), self.fingerprint)
+
+    def test_reference_changed(self):
+        self.assertNotEqual(CheckResultsStore.compute_fingerprint(self.metadata, 'GRCh38'), self.fingerprint)
+
+
+class TestCheckResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'results.db')
+        self.check_results = [CheckResult(check_name=CHECK_NAMES.check_valid_ids, result=RESULT.FAILURE,
+                                          error_message=['Invalid id'])]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_results_reused_by_next_run(self):
+        results_store = CheckResultsStore(self.path, 10)
+        results_store.put('/seq/1.cram', 'fingerprint1', self.check_results)
+        results_store.close()
+        results_store = CheckResultsStore(self.path, 10)
+        self.assertListEqual(results_store.get('/seq/1.cram', 'fingerprint1'), self.check_results)
+        self.assertDictEqual(results_store.get_stats(), {'reused': 1, 'checked': 0})
+
+    def test_fingerprint_changed(self):
+        results_store = CheckResultsStore(self.path, 10)
+        results_store.put('/seq/1.cram', 'fingerprint1', self.check_results)
+        self.assertIsNone(results_store.get('/seq/1.cram', 'fingerprint2'))
+        self.assertIsNone(results_store.get('/seq/2.cram', 'fingerprint1'))
+        self.assertDictEqual(results_store.get_stats(), {'reused': 0, 'checked': 2})
+
+    def test_results_expire(self):
+        results_store = CheckResultsStore(self.path, 10, ttl=0.1)
+        results_store.put('/seq/1.cram', 'fingerprint1', self.check_results)
+        time.sleep(0.2)
+        self.assertIsNone(results_store.get('/seq/1.cram', 'fingerprint1'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Copyright (C) 2016  Genome Research Ltd.
+
+Author: Irina Colgiu <ic4@sanger.ac.uk>
+
+This program is part of meta-check
+
+meta-check is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as
+published by the Free Software Foundation, either version 3 of the
+License, or (at your option) any later version.
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU Affero General Public License for more details.
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+This file has been created on Oct 18, 2026.
+"""
+
+import unittest
+
+from mcheck.results.checks_results import CheckResult
+from mcheck.results.constants import RESULT, SEVERITY
+from mcheck.results.results_processing import CheckResultsProcessing
+from mcheck.results.results_table import CheckResultsTable
+
+
+class TestCheckResultsTable(unittest.TestCase):
+
+    def setUp(self):
+        self.check_results_by_path = {
+            '/seq/1/1.cram': [CheckResult(check_name='check1', result=RESULT.FAILURE, severity=SEVERITY.WARNING,
+                                          error_message=['Sample 1 not found']),
+                              CheckResult(check_name='check1', result=RESULT.FAILURE, severity=SEVERITY.WARNING),
+                              CheckResult(check_name='check2')],
+            '/seq/2/2.cram': [CheckResult(check_name='check1', result=RESULT.SUCCESS),
+                              CheckResult(check_name='check2', executed=False, result=None,
+                                          error_message=['Header timed out'])],
+            '/seq/3/3.cram': [CheckResult(check_name='check2', result=RESULT.FAILURE, severity=SEVERITY.CRITICAL)]
+        }
+        self.table = CheckResultsTable.from_check_results_by_path(self.check_results_by_path)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.table), 6)
+        self.assertDictEqual(dict(self.table.to_check_results_by_path()), self.check_results_by_path)
+
+    def test_error_messages_in_side_table(self):
+        self.assertDictEqual(self.table.error_messages, {0: ['Sample 1 not found'], 4: ['Header timed out']})
+        self.assertEqual(self.table.get_check_result(4).error_message, ['Header timed out'])
+        self.assertIsNone(self.table.get_check_result(3).error_message)
+
+    def test_count_by(self):
+        self.assertDictEqual(self.table.count_by('result'), {RESULT.FAILURE: 3, RESULT.SUCCESS: 2, None: 1})
+        self.assertDictEqual(self.table.count_by('executed'), {True: 5, False: 1})
+        self.assertDictEqual(self.table.count_by('fpath'), {'/seq/1/1.cram': 3, '/seq/2/2.cram': 2, '/seq/3/3.cram': 1})
+
+    def test_group_by_same_as_results_processing(self):
+        all_check_results = [check_result for check_results in self.check_results_by_path.values()
+                             for check_result in check_results]
+        for column, group_by in (('result', CheckResultsProcessing.group_by_result),
+                                 ('severity', CheckResultsProcessing.group_by_severity),
+                                 ('executed', CheckResultsProcessing.group_by_executed)):
+            groups = {value: [self.table.get_check_result(row) for row in rows]
+                      for value, rows in self.table.group_by(column).items()}
+            self.assertDictEqual(groups, dict(group_by(all_check_results)))
+
+    def test_select_rows(self):
+        self.assertListEqual(list(self.table.select_rows('check_name', 'check2')), [2, 4, 5])
+        self.assertListEqual(list(self.table.select_rows('check_name', 'check3')), [])
+
+    def test_failed_check_results_stats(self):
+        expected = CheckResultsProcessing.failed_check_results_stats(self.check_results_by_path)
+        self.assertDictEqual(self.table.failed_check_results_stats(), expected)
+        self.assertDictEqual(CheckResultsProcessing.failed_check_results_stats(self.table), {'check1': 1, 'check2': 1})
+
+    def test_file_added_twice_counted_once(self):
+        self.table.add_file_check_results('/seq/3/3.cram', self.check_results_by_path['/seq/3/3.cram'])
+        self.assertDictEqual(self.table.failed_check_results_stats(), {'check1': 1, 'check2': 1})
+
+    def test_more_values_than_fit_in_a_byte(self):
+        check_results_by_path = {'/seq/%s.cram' % i: [CheckResult(check_name='check%s' % i)] for i in range(300)}
+        table = CheckResultsTable.from_check_results_by_path(check_results_by_path)
+        self.assertEqual(table.count_by('check_name')['check299'], 1)
+        self.assertListEqual(list(table.select_rows('check_name', 'check280')), [280])
+        self.assertDictEqual(dict(table.to_check_results_by_path()), check_results_by_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
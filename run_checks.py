@@ -20,12 +20,21 @@ This file has been created on May 05, 2016.
 """
 
 
+import sys
 from sys import exit
-from mcheck.main.api import check_metadata_fetched_by_metadata, check_metadata_fetched_by_path, check_metadata_given_as_json_stream
+
+import config
+from mcheck.main.api import iter_check_metadata_fetched_by_metadata, iter_check_metadata_fetched_by_path, \
+    iter_check_metadata_given_as_json_stream, check_metadata_fetched_by_metadata, check_metadata_fetched_by_path, \
+    check_metadata_given_as_json_stream
 from mcheck.check_names import CHECK_NAMES
 from mcheck.results.checks_results import RESULT
 from mcheck.main import arg_parser
-from mcheck.main.output_formatter import format_output_as_json, format_output_as_tsv
+from mcheck.metadata.seqscape_metadata.seqscape_meta_provider import SeqscapeRawMetadataProvider
+from mcheck.metadata.file_header_metadata.header_meta_provider import SAMFileHeaderMetadataProvider
+from mcheck.results.results_store import CheckResultsStore
+from mcheck.results.results_processing import CheckResultsSummary
+from mcheck.main.output_formatter import TSVCheckResultsWriter, JSONCheckResultsWriter, JSONLinesCheckResultsWriter
 
 # import logging
 # my_logger = logging.getLogger('MyLogger')
@@ -42,6 +51,64 @@ def decide_exit_status(check_results_by_path):
     return exit_status
 
 
+def print_check_results(check_results_iterator, json_output=False, output=None, jsonl_output=False, summary=None):
+    """
+    This function prints the CheckResults of each file as soon as they are yielded by the iterator given as parameter.
+    The whole output is the same as the one of format_output_as_json or format_output_as_tsv for all the files.
+    :param check_results_iterator: iterator of tuples (fpath, list[CheckResult])
+    :param json_output: True if the output should be json formatted, False for tab delimited values
+    :param output: the file to print to, by default stdout
+    :param jsonl_output: True if the output should be JSON Lines - one json object per file
+    :param summary: a CheckResultsSummary to add the CheckResults of each file to as they are printed, or None
+    :return: the exit status, as given by decide_exit_status for all the results
+    """
+    output = output if output else sys.stdout
+    if jsonl_output:
+        writer = JSONLinesCheckResultsWriter(output)
+    elif json_output:
+        writer = JSONCheckResultsWriter(output)
+    else:
+        writer = TSVCheckResultsWriter(output)
+    exit_status = 0
+    # The writer is closed also if the iterator raises an exception, so that the output printed so far stays valid:
+    try:
+        for fpath, check_results in check_results_iterator:
+            writer.write_file_check_results(fpath, check_results)
+            if summary is not None:
+                summary.add_file_check_results(fpath, check_results)
+            exit_status = max(exit_status, decide_exit_status({fpath: check_results}))
+    finally:
+        writer.close()
+    return exit_status
+
+
+def print_cache_stats(results_store=None):
+    """
+    Reports on stderr how many of the Seqscape lookups and of the headers were answered from the caches,
+    and how many files reused their stored results, so that the output stays valid.
+    :param results_store: the CheckResultsStore used by an incremental run, or None
+    """
+    cache_stats = SeqscapeRawMetadataProvider.get_entity_cache_stats()
+    if cache_stats:
+        print("Seqscape cache: %(memory_hits)s memory hits, %(disk_hits)s disk hits, %(misses)s misses" % cache_stats,
+              file=sys.stderr)
+    header_cache_stats = SAMFileHeaderMetadataProvider.get_header_cache_stats()
+    if header_cache_stats:
+        print("Header cache: %(hits)s hits, %(misses)s misses" % header_cache_stats, file=sys.stderr)
+    if results_store is not None:
+        print("Incremental run: %(reused)s files unchanged since the last run, %(checked)s files checked" %
+              results_store.get_stats(), file=sys.stderr)
+
+
+def print_summary(summary):
+    """
+    Reports the summary of the check results on stderr, so that the output stays valid.
+    :param summary: the CheckResultsSummary of the run, or None if no summary was asked for
+    """
+    if summary is not None:
+        sys.stderr.write(summary.format_summary())
+
+
 def main():
     args = arg_parser.parse_args()
     try:
@@ -88,6 +155,38 @@ def main():
     except AttributeError:
         reference = None
 
+    try:
+        nr_workers = args.nr_workers
+    except AttributeError:
+        nr_workers = None
+
+    try:
+        batch_seqscape_queries = args.batch_seqscape_queries
+    except AttributeError:
+        batch_seqscape_queries = False
+
+    try:
+        nr_header_workers = args.nr_header_workers
+    except AttributeError:
+        nr_header_workers = None
+
+    try:
+        header_timeout = args.header_timeout
+    except AttributeError:
+        header_timeout = None
+
+    try:
+        incremental = args.incremental
+    except AttributeError:
+        incremental = False
+    results_store = CheckResultsStore(config.RESULTS_STORE_PATH, config.RESULTS_STORE_SIZE,
+                                      config.RESULTS_STORE_TTL) if incremental else None
+
+    try:
+        summary = CheckResultsSummary() if args.summary else None
+    except AttributeError:
+        summary = None
+
     if args.metadata_fetching_strategy == 'fetch_by_metadata':
         if not file_types:
             print(
@@ -101,25 +200,62 @@ def main():
                 "WARNING! You haven't filtered on manual_qc field. You will get the report from checking all the data, "
                 "no matter if qc pass of fail.")
 
+    if batch_seqscape_queries:
+        if args.metadata_fetching_strategy == 'fetch_by_metadata':
+            check_results = check_metadata_fetched_by_metadata(filter_npg_qc, filter_target, file_types,
+                                                               study_name, study_acc_nr, study_internal_id,
+                                                               irods_zone, reference, batch_seqscape_queries=True,
+                                                               nr_header_workers=nr_header_workers,
+                                                               header_timeout=header_timeout,
+                                                               results_store=results_store)
+        elif args.metadata_fetching_strategy == 'fetch_by_path':
+            check_results = check_metadata_fetched_by_path(irods_fpaths, reference, batch_seqscape_queries=True,
+                                                           nr_header_workers=nr_header_workers,
+                                                           header_timeout=header_timeout,
+                                                           results_store=results_store)
+        elif args.metadata_fetching_strategy == 'given_at_stdin':
+            check_results = check_metadata_given_as_json_stream(reference, batch_seqscape_queries=True,
+                                                                nr_header_workers=nr_header_workers,
+                                                                header_timeout=header_timeout,
+                                                                results_store=results_store)
+        else:
+            raise ValueError("Fetching strategy not supported")
+        exit_status = print_check_results(iter(check_results.items()), args.json_output, jsonl_output=args.jsonl_output,
+                                          summary=summary)
+        print_cache_stats(results_store)
+        if results_store is not None:
+            results_store.close()
+        print_summary(summary)
+        exit(exit_status)
+
     if args.metadata_fetching_strategy == 'fetch_by_metadata':
-        check_results_by_fpath = check_metadata_fetched_by_metadata(filter_npg_qc, filter_target, file_types,
-                                                                    study_name, study_acc_nr, study_internal_id,
-                                                                    irods_zone, reference)
+        check_results_iterator = iter_check_metadata_fetched_by_metadata(filter_npg_qc, filter_target, file_types,
+                                                                         study_name, study_acc_nr, study_internal_id,
+                                                                         irods_zone, reference, nr_workers or 1,
+                                                                         nr_header_workers, header_timeout,
+                                                                         results_store)
     elif args.metadata_fetching_strategy == 'fetch_by_path':
-        check_results_by_fpath = check_metadata_fetched_by_path(irods_fpaths, reference)
+        check_results_iterator = iter_check_metadata_fetched_by_path(irods_fpaths, reference, nr_workers or 1,
+                                                                     nr_header_workers, header_timeout,
+                                                                     results_store)
     elif args.metadata_fetching_strategy == 'given_at_stdin':
-        check_results_by_fpath = check_metadata_given_as_json_stream(reference)
+        check_results_iterator = iter_check_metadata_given_as_json_stream(reference, nr_workers or 1,
+                                                                          nr_header_workers, header_timeout,
+                                                                          results_store)
     else:
         raise ValueError("Fetching strategy not supported")
 
-    if args.json_output:
-        check_results_as_json = format_output_as_json(check_results_by_fpath)
-        print(check_results_as_json)
-    else:
-        result_as_tsv_string = format_output_as_tsv(check_results_by_fpath)
-        print(result_as_tsv_string)
-
-    exit(decide_exit_status(check_results_by_fpath))
+    try:
+        exit_status = print_check_results(check_results_iterator, args.json_output, jsonl_output=args.jsonl_output,
+                                          summary=summary)
+    except Exception as e:
+        print("The checks were stopped by an error: %s" % e, file=sys.stderr)
+        exit(1)
+    print_cache_stats(results_store)
+    if results_store is not None:
+        results_store.close()
+    print_summary(summary)
+    exit(exit_status)
 
 if __name__ == '__main__':
     main()